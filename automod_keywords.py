@@ -0,0 +1,192 @@
+"""
+Per-guild automod keyword matching for content the bot stores (tags, aliases).
+
+A guild's keyword rules are fetched once and compiled into an Aho-Corasick
+automaton, so checking content is a single pass over it however many keywords
+the rules hold. Matching follows Discord's keyword semantics: `cat` matches
+the whole word, `cat*` words starting with it, `*cat` words ending with it and
+`*cat*` anywhere, ignoring case, with allow-listed words exempt. Rule create,
+update and delete events patch the cached rules in place, so after the first
+check in a guild no HTTP call is needed again.
+
+Regex and preset rules aren't covered: Discord doesn't expose preset word
+lists, and Rust-flavoured regexes don't map onto Python's `re` safely.
+"""
+import time
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from http_client import SingleFlight
+
+FORBIDDEN_RETRY = 600  # seconds before retrying a guild whose rules we may not read
+
+RuleKeywords = Tuple[Tuple[str, ...], Tuple[str, ...]]  # (keyword_filter, allow_list)
+
+
+def _word_char(char: str) -> bool:
+    return char.isalnum()
+
+
+class KeywordMatcher:
+    def __init__(self, rules: Iterable[RuleKeywords]) -> None:
+        # (keyword as written, core without wildcards, whole word start, whole word end, the rule's allow list)
+        self.patterns: List[Tuple[str, str, bool, bool, FrozenSet[str]]] = []
+        seen = set()
+        for keywords, allow_list in rules:
+            allowed = frozenset(word.strip().lower() for word in allow_list if word.strip())
+            for keyword in keywords:
+                lowered = keyword.strip().lower()
+                core = lowered.strip("*")
+                key = (core, lowered.startswith("*"), lowered.endswith("*"), allowed)
+                if core and key not in seen:
+                    seen.add(key)
+                    self.patterns.append((keyword, core, not key[1], not key[2], allowed))
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        for index, (_, core, _, _, _) in enumerate(self.patterns):
+            node = 0
+            for char in core:
+                child = self._goto[node].get(char)
+                if child is None:
+                    child = self._goto[node][char] = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                node = child
+            self._out[node] += (index,)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._out[child] += self._out[self._fail[child]]
+                queue.append(child)
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def find(self, content: str) -> List[str]:
+        """Keywords (as written in the rules) that `content` would trip, in order of first match"""
+        if not self.patterns:
+            return []
+        text = content.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Dict[int, None] = {}
+        node = 0
+        for end, char in enumerate(text, 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for index in out[node]:
+                if index not in found and self._counts(text, index, end):
+                    found[index] = None
+        return [self.patterns[index][0] for index in found]
+
+    def _counts(self, text: str, index: int, end: int) -> bool:
+        _, core, whole_start, whole_end, allowed = self.patterns[index]
+        start = end - len(core)
+        if whole_start and start > 0 and _word_char(text[start - 1]):
+            return False
+        if whole_end and end < len(text) and _word_char(text[end]):
+            return False
+        if allowed:
+            word_start, word_end = start, end
+            while word_start > 0 and _word_char(text[word_start - 1]):
+                word_start -= 1
+            while word_end < len(text) and _word_char(text[word_end]):
+                word_end += 1
+            if text[word_start:word_end] in allowed:
+                return False
+        return True
+
+
+EMPTY = KeywordMatcher(())
+
+
+def rule_keywords(rule) -> Optional[RuleKeywords]:
+    """The keyword and allow lists of an enabled keyword rule, else None"""
+    keywords = getattr(rule.trigger, "keyword_filter", None)
+    if not rule.enabled or not keywords:
+        return None
+    return tuple(keywords), tuple(getattr(rule.trigger, "allow_list", None) or ())
+
+
+class AutomodKeywords:
+    """Compiled keyword matchers per guild, loaded on first use and kept current from rule events"""
+
+    def __init__(self) -> None:
+        self.rules: Dict[int, Dict[int, RuleKeywords]] = {}
+        self.matchers: Dict[int, KeywordMatcher] = {}
+        self._forbidden: Dict[int, float] = {}
+        self._stale: Set[int] = set()
+        self._loads = SingleFlight()
+
+    async def matcher(self, guild) -> KeywordMatcher:
+        matcher = self.matchers.get(guild.id)
+        if matcher is not None:
+            return matcher
+        if self._forbidden.get(guild.id, 0) > time.monotonic():
+            return EMPTY
+        return await self._loads.do(guild.id, lambda: self._load(guild))
+
+    async def _load(self, guild) -> KeywordMatcher:
+        self._stale.discard(guild.id)
+        try:
+            fetched = await guild.fetch_automod_rules()
+        except Exception as e:
+            # Missing Manage Server, most likely; the check is best-effort, as before
+            print(f"Couldn't fetch automod rules for guild {guild.id}: {e}")
+            self._forbidden[guild.id] = time.monotonic() + FORBIDDEN_RETRY
+            return EMPTY
+
+        rules = {}
+        for rule in fetched:
+            keywords = rule_keywords(rule)
+            if keywords is not None:
+                rules[rule.id] = keywords
+        matcher = self._compile(rules)
+        if guild.id in self._stale:
+            # A rule changed while we were fetching; use this result once, refetch next time
+            return matcher
+        self.rules[guild.id] = rules
+        self.matchers[guild.id] = matcher
+        return matcher
+
+    @staticmethod
+    def _compile(rules: Dict[int, RuleKeywords]) -> KeywordMatcher:
+        return KeywordMatcher(rules.values()) if rules else EMPTY
+
+    async def find(self, guild, content: str) -> List[str]:
+        return (await self.matcher(guild)).find(content)
+
+    def update_rule(self, rule) -> None:
+        """Apply a created or updated rule to the guild's cached matcher"""
+        self._patch(rule.guild.id, rule.id, rule_keywords(rule))
+
+    def remove_rule(self, rule) -> None:
+        self._patch(rule.guild.id, rule.id, None)
+
+    def _patch(self, guild_id: int, rule_id: int, keywords: Optional[RuleKeywords]) -> None:
+        self._forbidden.pop(guild_id, None)  # whoever set up rules may have granted us access too
+        if guild_id in self._loads:
+            self._stale.add(guild_id)
+        rules = self.rules.get(guild_id)
+        if rules is None:
+            return
+        if keywords is None:
+            if rules.pop(rule_id, None) is None:
+                return
+        else:
+            rules[rule_id] = keywords
+        self.matchers[guild_id] = self._compile(rules)
+
+    def forget(self, guild_id: int) -> None:
+        self.rules.pop(guild_id, None)
+        self.matchers.pop(guild_id, None)
+        self._forbidden.pop(guild_id, None)
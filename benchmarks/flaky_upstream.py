@@ -0,0 +1,183 @@
+"""
+Drive the shared HTTP client against a local stand-in upstream that flaps.
+
+Starts an aiohttp server on 127.0.0.1 whose `/flap` route alternates between
+healthy periods and outages (500s or hangs), and whose `/limited` route
+answers 429 with a Retry-After once callers exceed its quota. The routes are
+reached as 127.0.0.1 and localhost so each gets its own bucket and breaker,
+like two real upstream hosts would. A pool of workers hammers both routes
+through `HTTPClient` and the report shows how often the breaker tripped, how
+many calls failed fast instead of hanging, and how long requests queued in
+the token bucket.
+
+Run from the repository root:
+    python -m benchmarks.flaky_upstream --duration 20
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from aiohttp import web
+
+from http_client import HTTPClient, HostLimit, UpstreamUnavailable
+
+ROUTE_HOSTS = {"flap": "127.0.0.1", "limited": "localhost"}
+
+
+class FlakyUpstream:
+    """Stand-in API: `up_for` seconds healthy, then `down_for` seconds failing"""
+
+    def __init__(self, up_for: float, down_for: float, hang: bool, quota: int) -> None:
+        self.up_for = up_for
+        self.down_for = down_for
+        self.hang = hang
+        self.quota = quota
+        self.started = time.monotonic()
+        self.served = Counter()
+        self.window_start = time.monotonic()
+        self.window_count = 0
+
+    def healthy(self) -> bool:
+        phase = (time.monotonic() - self.started) % (self.up_for + self.down_for)
+        return phase < self.up_for
+
+    async def flap(self, request: web.Request) -> web.Response:
+        if self.healthy():
+            self.served["ok"] += 1
+            return web.json_response({"ok": True})
+        if self.hang:
+            self.served["hang"] += 1
+            await asyncio.sleep(60)
+        self.served["error"] += 1
+        return web.json_response({"ok": False}, status=500)
+
+    async def limited(self, request: web.Request) -> web.Response:
+        now = time.monotonic()
+        if now - self.window_start >= 1:
+            self.window_start, self.window_count = now, 0
+        self.window_count += 1
+        if self.window_count > self.quota:
+            self.served["429"] += 1
+            return web.json_response({"error": "slow down"}, status=429, headers={"Retry-After": "1"})
+        self.served["ok"] += 1
+        return web.json_response({"ok": True})
+
+
+async def start_server(upstream: FlakyUpstream) -> Tuple[web.AppRunner, int]:
+    app = web.Application()
+    app.router.add_get("/flap", upstream.flap)
+    app.router.add_get("/limited", upstream.limited)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, port
+
+
+async def worker(client: HTTPClient, url: str, deadline: float, outcomes: Counter, latencies: List[float]) -> None:
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            async with client.get(url) as response:
+                outcomes[str(response.status)] += 1
+        except UpstreamUnavailable as e:
+            outcomes[e.reason] += 1
+        except asyncio.TimeoutError:
+            outcomes["timeout"] += 1
+        except Exception as e:
+            outcomes[type(e).__name__] += 1
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(0.01)
+
+
+async def watch_breaker(client: HTTPClient, host: str, deadline: float, timeline: List[Tuple[float, str]]) -> None:
+    started = time.monotonic()
+    last = None
+    while time.monotonic() < deadline:
+        breaker = client.breakers.get(host)
+        state = breaker.state if breaker else "closed"
+        if state != last:
+            timeline.append((time.monotonic() - started, state))
+            last = state
+        await asyncio.sleep(0.05)
+
+
+def summarize(latencies: List[float]) -> str:
+    if not latencies:
+        return "n/a"
+    ordered = sorted(latencies)
+    p50 = ordered[len(ordered) // 2] * 1000
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000
+    return f"p50 {p50:.1f}ms, p99 {p99:.1f}ms, max {ordered[-1] * 1000:.1f}ms"
+
+
+async def run(args: argparse.Namespace) -> None:
+    upstream = FlakyUpstream(args.up, args.down, args.hang, args.quota)
+    runner, port = await start_server(upstream)
+    client = HTTPClient(
+        timeout=args.timeout,
+        failure_threshold=args.threshold,
+        reset_timeout=args.reset,
+        host_limits={
+            host: HostLimit(rate=args.rate, burst=args.burst, max_wait=args.max_wait)
+            for host in ROUTE_HOSTS.values()
+        },
+    )
+    deadline = time.monotonic() + args.duration
+    timeline: List[Tuple[float, str]] = []
+    results: Dict[str, Tuple[Counter, List[float]]] = {}
+
+    try:
+        tasks = [asyncio.create_task(watch_breaker(client, "127.0.0.1", deadline, timeline))]
+        for route, host in ROUTE_HOSTS.items():
+            outcomes, latencies = Counter(), []
+            results[route] = (outcomes, latencies)
+            url = f"http://{host}:{port}/{route}"
+            tasks += [
+                asyncio.create_task(worker(client, url, deadline, outcomes, latencies))
+                for _ in range(args.workers)
+            ]
+        await asyncio.gather(*tasks)
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+    print(f"Upstream: {args.up}s up / {args.down}s {'hanging' if args.hang else 'erroring'}, "
+          f"/limited quota {args.quota}/s, {args.workers} workers per route for {args.duration}s\n")
+    for route, (outcomes, latencies) in results.items():
+        stats = client.hosts[ROUTE_HOSTS[route]]
+        breaker = client.breakers[ROUTE_HOSTS[route]]
+        print(f"/{route}: {sum(outcomes.values())} calls, {summarize(latencies)}")
+        for outcome, count in outcomes.most_common():
+            print(f"  {outcome:<14}{count:>8}")
+        print(f"  breaker trips {breaker.trips}, fast-failed {stats.rejected}, "
+              f"queue wait avg {stats.mean_wait * 1000:.1f}ms / max {stats.max_wait * 1000:.1f}ms")
+    print(f"\nServer saw: {dict(upstream.served)}")
+
+    print("\n/flap breaker timeline:")
+    for at, state in timeline:
+        print(f"  {at:6.2f}s  {state}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Exercise the HTTP client against a flapping local upstream")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to run")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent callers per route")
+    parser.add_argument("--up", type=float, default=3.0, help="Seconds the upstream stays healthy per cycle")
+    parser.add_argument("--down", type=float, default=4.0, help="Seconds the upstream fails per cycle")
+    parser.add_argument("--hang", action="store_true", help="Hang during outages instead of returning 500")
+    parser.add_argument("--quota", type=int, default=20, help="Requests per second /limited accepts before 429")
+    parser.add_argument("--rate", type=float, default=50.0, help="Client token bucket rate for the stand-in host")
+    parser.add_argument("--burst", type=int, default=20, help="Client token bucket burst for the stand-in host")
+    parser.add_argument("--max-wait", type=float, default=2.0, help="Longest a request may queue in the bucket")
+    parser.add_argument("--threshold", type=int, default=5, help="Consecutive failures before the breaker opens")
+    parser.add_argument("--reset", type=float, default=1.0, help="Seconds the breaker stays open before probing")
+    parser.add_argument("--timeout", type=float, default=1.0, help="Client request timeout in seconds")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
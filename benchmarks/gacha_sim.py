@@ -0,0 +1,179 @@
+"""
+Offline gacha simulator for the waifu card system.
+
+Draws millions of rolls against the same rarity table (`ROLL_THRESHOLDS`) and
+catalog index (`build_rarity_index`) the Waifu cog uses, then reports observed
+vs. documented tier odds, per-waifu spread inside each tier, the expected
+payout per roll and the throughput of the roll path.
+
+Run from the repository root:
+    python -m benchmarks.gacha_sim --rolls 5000000
+"""
+import argparse
+import random
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from plugins.waifu import (
+    ROLL_THRESHOLDS,
+    build_rarity_index,
+    calculate_card_value,
+    calculate_resale_value,
+    load_waifu_data,
+    roll_rarity,
+)
+
+TIERS = [rarity for rarity, _ in ROLL_THRESHOLDS]
+
+# Odds as advertised in the Waifu cog docstring, in percent
+DOCUMENTED_ODDS = {
+    None: {'SS': 0.01, 'S': 0.1, 'A': 1, 'B': 10, 'C': 30, 'D': 58.89},
+    'C': {'SS': 0.04, 'S': 0.4, 'A': 4, 'B': 40, 'C': 55.56},
+    'B': {'SS': 0.1, 'S': 1, 'A': 10, 'B': 88.9},
+    'A': {'SS': 1, 'S': 10, 'A': 89},
+}
+
+ROLL_COSTS = {None: 3, 'C': 10, 'B': 30, 'A': 100}
+
+
+def sample_tiers(rng: np.random.Generator, rolls: int, cost_type: Optional[str]) -> np.ndarray:
+    """Vectorised equivalent of `roll_rarity`, returned as indices into TIERS"""
+    if cost_type:
+        return np.full(rolls, TIERS.index(cost_type), dtype=np.int8)
+    bounds = np.array([threshold for _, threshold in ROLL_THRESHOLDS], dtype=np.float64)
+    draws = rng.random(rolls) * 100
+    return np.searchsorted(bounds, draws, side='right').astype(np.int8)
+
+
+def sample_waifus(
+    rng: np.random.Generator,
+    tiers: np.ndarray,
+    pools: List[np.ndarray]
+) -> np.ndarray:
+    """Pick a catalog position uniformly inside each rolled tier, like `random.choice`"""
+    picks = np.empty(len(tiers), dtype=np.int32)
+    for tier_idx, pool in enumerate(pools):
+        mask = tiers == tier_idx
+        count = int(mask.sum())
+        if count and len(pool):
+            picks[mask] = pool[rng.integers(0, len(pool), size=count)]
+        elif count:
+            picks[mask] = -1
+    return picks
+
+
+def simulate(rolls: int, cost_type: Optional[str], seed: Optional[int]) -> Dict:
+    waifu_data = load_waifu_data()
+    index = build_rarity_index(waifu_data)
+    ids = list(waifu_data.keys())
+    position = {wid: i for i, wid in enumerate(ids)}
+    pools = [np.array([position[wid] for wid, _ in index.get(tier, [])], dtype=np.int32) for tier in TIERS]
+
+    ranks = [waifu_data[wid].get('popularity_rank') for wid in ids]
+    catalog_tiers = [waifu_data[wid].get('rarity_tier') for wid in ids]
+    card_values = np.array([calculate_card_value(t, r) for t, r in zip(catalog_tiers, ranks)], dtype=np.float64)
+    resale_values = np.array([calculate_resale_value(t, r) for t, r in zip(catalog_tiers, ranks)], dtype=np.float64)
+
+    rng = np.random.default_rng(seed)
+    started = time.perf_counter()
+    tiers = sample_tiers(rng, rolls, cost_type)
+    picks = sample_waifus(rng, tiers, pools)
+    elapsed = time.perf_counter() - started
+
+    valid = picks >= 0
+    tier_counts = np.bincount(tiers, minlength=len(TIERS))
+    waifu_counts = np.bincount(picks[valid], minlength=len(ids))
+
+    per_tier_spread = {}
+    for tier_idx, tier in enumerate(TIERS):
+        pool = pools[tier_idx]
+        if not len(pool) or not tier_counts[tier_idx]:
+            continue
+        counts = waifu_counts[pool]
+        expected = tier_counts[tier_idx] / len(pool)
+        per_tier_spread[tier] = {
+            'pool_size': len(pool),
+            'expected_per_waifu': expected,
+            'min': int(counts.min()),
+            'max': int(counts.max()),
+            'chi2': float(((counts - expected) ** 2 / expected).sum()),
+        }
+
+    return {
+        'rolls': rolls,
+        'cost_type': cost_type,
+        'tier_counts': {tier: int(tier_counts[i]) for i, tier in enumerate(TIERS)},
+        'per_tier_spread': per_tier_spread,
+        'mean_card_value': float(card_values[picks[valid]].mean()) if valid.any() else 0.0,
+        'mean_resale_value': float(resale_values[picks[valid]].mean()) if valid.any() else 0.0,
+        'vectorised_rolls_per_sec': rolls / elapsed if elapsed else float('inf'),
+    }
+
+
+def bench_roll_path(rolls: int, cost_type: Optional[str]) -> float:
+    """Throughput of the cog's own scalar roll path (rarity + waifu pick), in rolls/sec"""
+    rarity_index = build_rarity_index(load_waifu_data())
+    started = time.perf_counter()
+    for _ in range(rolls):
+        rarity = roll_rarity(cost_type)
+        pool = rarity_index.get(rarity)
+        if pool:
+            random.choice(pool)
+    elapsed = time.perf_counter() - started
+    return rolls / elapsed if elapsed else float('inf')
+
+
+def print_report(result: Dict, scalar_rate: float) -> None:
+    cost_type = result['cost_type']
+    rolls = result['rolls']
+    label = f"{cost_type}-tier roll" if cost_type else "Normal roll"
+    cost = ROLL_COSTS[cost_type]
+    documented = DOCUMENTED_ODDS[cost_type]
+
+    print(f"{label} (${cost}), {rolls:,} rolls")
+    print(f"{'Tier':<6}{'Observed %':>12}{'Documented %':>15}{'Delta':>10}")
+    for tier in TIERS:
+        observed = result['tier_counts'][tier] / rolls * 100
+        expected = documented.get(tier, 0.0)
+        flag = "  <-- mismatch" if abs(observed - expected) > max(0.01, expected * 0.05) else ""
+        print(f"{tier:<6}{observed:>12.4f}{expected:>15.4f}{observed - expected:>+10.4f}{flag}")
+
+    print("\nPer-waifu spread within tier")
+    print(f"{'Tier':<6}{'Pool':>6}{'Expected':>12}{'Min':>8}{'Max':>8}{'Chi2':>12}")
+    for tier, spread in result['per_tier_spread'].items():
+        print(
+            f"{tier:<6}{spread['pool_size']:>6}{spread['expected_per_waifu']:>12.1f}"
+            f"{spread['min']:>8}{spread['max']:>8}{spread['chi2']:>12.1f}"
+        )
+
+    mean_value = result['mean_card_value']
+    mean_resale = result['mean_resale_value']
+    print("\nEconomy")
+    print(f"  Mean card value:   ${mean_value:,.2f} ({mean_value / cost * 100:.1f}% of cost)")
+    print(f"  Mean resale value: ${mean_resale:,.2f} ({mean_resale / cost * 100:.1f}% of cost)")
+    print(f"  Net per roll if sold: ${mean_resale - cost:+,.2f}")
+
+    print("\nThroughput")
+    print(f"  Vectorised simulator: {result['vectorised_rolls_per_sec']:,.0f} rolls/s")
+    print(f"  Cog roll path:        {scalar_rate:,.0f} rolls/s")
+    print()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulate waifu gacha rolls")
+    parser.add_argument("--rolls", type=int, default=5_000_000, help="Rolls to simulate per roll type")
+    parser.add_argument("--bench-rolls", type=int, default=200_000, help="Rolls to time through the cog's roll path")
+    parser.add_argument("--type", choices=["normal", "C", "B", "A", "all"], default="all", help="Roll type to simulate")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible runs")
+    args = parser.parse_args()
+
+    cost_types = [None, 'C', 'B', 'A'] if args.type == "all" else [None if args.type == "normal" else args.type]
+    for cost_type in cost_types:
+        result = simulate(args.rolls, cost_type, args.seed)
+        print_report(result, bench_roll_path(args.bench_rolls, cost_type))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Compare local meme rendering with the popcat.xyz remote path.
+
+Renders biden/oogway/pikachu through `MemeRenderer` and reports cold-render
+latency, cache-hit latency and throughput with concurrent requests on the
+render pool. If the real templates aren't in assets/memes/, blank templates of
+a similar size are generated so the render cost is still representative.
+With `--upstream`, the same texts are also fetched from api.popcat.xyz through
+the shared HTTP client, which is what every view cost before. With
+`--preview DIR`, one render per template is saved to DIR with its text box
+outlined, for checking the LAYOUTS fractions against the real templates.
+
+Run from the repository root:
+    python -m benchmarks.meme_render --renders 200 --upstream
+"""
+import argparse
+import asyncio
+import os
+import random
+import string
+import tempfile
+import time
+from typing import List
+from urllib.parse import quote_plus
+
+from io import BytesIO
+
+from PIL import Image, ImageDraw
+
+from http_client import HTTPClient
+from meme_renderer import LAYOUTS, TEMPLATE_DIR, MemeRenderer
+
+# Roughly the size of the templates popcat serves
+STAND_IN_SIZES = {"biden": (1200, 680), "oogway": (1000, 700), "pikachu": (800, 820)}
+
+
+def summarize(latencies: List[float]) -> str:
+    if not latencies:
+        return "n/a"
+    ordered = sorted(latencies)
+    p50 = ordered[len(ordered) // 2] * 1000
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000
+    return f"p50 {p50:.1f}ms, p99 {p99:.1f}ms, max {ordered[-1] * 1000:.1f}ms"
+
+
+def random_text(rng: random.Random) -> str:
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9))) for _ in range(rng.randint(3, 30))]
+    return " ".join(words)
+
+
+def template_dir(scratch: str) -> str:
+    if all(os.path.exists(os.path.join(TEMPLATE_DIR, layout.filename)) for layout in LAYOUTS.values()):
+        return TEMPLATE_DIR
+    for name, layout in LAYOUTS.items():
+        Image.new("RGB", STAND_IN_SIZES[name], (235, 235, 235)).save(os.path.join(scratch, layout.filename))
+    print(f"Templates missing from {TEMPLATE_DIR}; using generated stand-ins\n")
+    return scratch
+
+
+def save_previews(renderer: MemeRenderer, directory: str) -> None:
+    """One render per template with its text box outlined in red"""
+    os.makedirs(directory, exist_ok=True)
+    text = "When the meme renders locally and the text still lands inside the box it was meant for"
+    for name, layout in LAYOUTS.items():
+        with Image.open(BytesIO(renderer.render_sync(name, text))) as image:
+            box = layout.box
+            left, top = box.left * image.width, box.top * image.height
+            right, bottom = left + box.width * image.width, top + box.height * image.height
+            ImageDraw.Draw(image).rectangle((left, top, right, bottom), outline=(255, 0, 0), width=3)
+            image.save(os.path.join(directory, layout.filename))
+    print(f"Previews saved to {directory}\n")
+
+
+async def run(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    texts = [random_text(rng) for _ in range(args.renders)]
+
+    with tempfile.TemporaryDirectory() as scratch:
+        renderer = MemeRenderer(template_dir(scratch), workers=args.workers, cache_size=args.renders * len(LAYOUTS))
+        try:
+            if args.preview:
+                save_previews(renderer, args.preview)
+            for name in LAYOUTS:
+                renderer.render_sync(name, "warm up")  # decode the template and load fonts
+                cold, warm = [], []
+                for text in texts:
+                    started = time.perf_counter()
+                    png = await renderer.render(name, text)
+                    cold.append(time.perf_counter() - started)
+                for text in texts:
+                    started = time.perf_counter()
+                    await renderer.render(name, text)
+                    warm.append(time.perf_counter() - started)
+                print(f"{name:<8} cold {summarize(cold)}  ({len(png) // 1024} KiB PNG)")
+                print(f"{'':<8} hit  {summarize(warm)}")
+
+            renderer.cache.clear()
+            started = time.perf_counter()
+            await asyncio.gather(*(
+                renderer.render(name, text) for name in LAYOUTS for text in texts[:args.concurrent]
+            ))
+            elapsed = time.perf_counter() - started
+            total = args.concurrent * len(LAYOUTS)
+            print(f"\n{total} concurrent renders on {args.workers} workers: "
+                  f"{elapsed:.2f}s ({total / elapsed:.1f} renders/s)")
+            print(f"Cache hits {renderer.hits}, misses {renderer.misses}")
+        finally:
+            renderer.close()
+
+    if not args.upstream:
+        return
+
+    client = HTTPClient()
+    try:
+        print("\nUpstream (api.popcat.xyz):")
+        for name in LAYOUTS:
+            latencies, errors = [], 0
+            for text in texts[:args.upstream_requests]:
+                started = time.perf_counter()
+                try:
+                    await client.get_bytes(f"https://api.popcat.xyz/{name}?text={quote_plus(text)}")
+                    latencies.append(time.perf_counter() - started)
+                except Exception:
+                    errors += 1
+            print(f"{name:<8} {summarize(latencies)}, {errors} errors")
+    finally:
+        await client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark local meme rendering against the popcat API")
+    parser.add_argument("--renders", type=int, default=100, help="Distinct texts rendered per template")
+    parser.add_argument("--workers", type=int, default=2, help="Render pool size")
+    parser.add_argument("--concurrent", type=int, default=50, help="Texts per template in the concurrency run")
+    parser.add_argument("--upstream", action="store_true", help="Also time the remote popcat render")
+    parser.add_argument("--upstream-requests", type=int, default=10, help="Remote renders per template")
+    parser.add_argument("--preview", metavar="DIR", help="Save one outlined render per template to DIR")
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
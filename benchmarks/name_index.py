@@ -0,0 +1,155 @@
+"""
+Measure member-name lookups against a synthetic large guild.
+
+Builds a `NameIndex` over N members with usernames, global names and
+nicknames, then times exact, prefix, misspelt and ID-like lookups plus
+join/rename/leave updates. With `--compare`, a few lookups also run through
+the old linear SequenceMatcher scan for reference.
+
+Run from the repository root:
+    python -m benchmarks.name_index --members 100000 --compare
+"""
+import argparse
+import random
+import string
+import time
+from bisect import bisect_left
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+from name_index import NameIndex, normalize
+
+SYLLABLES = [
+    "ka", "ri", "to", "mi", "na", "shi", "ro", "lu", "xe", "an", "el", "or", "dra", "ven", "zy", "qu",
+    "bel", "cor", "dun", "fae", "gil", "hex", "jo", "kev", "lin", "mor", "nyx", "pat", "rex", "sam",
+    "tyr", "ul", "vi", "wen", "yu", "zed", "ash", "bri", "cy", "dex",
+]
+
+
+def random_name(rng: random.Random) -> str:
+    name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+    if rng.random() < 0.4:
+        name += str(rng.randint(0, 9999))
+    if rng.random() < 0.2:
+        name = rng.choice(["the", "xx", "mr", "its"]) + "_" + name
+    return name
+
+
+def misspell(name: str, rng: random.Random) -> str:
+    chars = list(name)
+    position = rng.randrange(len(chars))
+    operation = rng.choice(["swap", "drop", "replace"])
+    if operation == "swap" and position < len(chars) - 1:
+        chars[position], chars[position + 1] = chars[position + 1], chars[position]
+    elif operation == "drop" and len(chars) > 3:
+        del chars[position]
+    else:
+        chars[position] = rng.choice(string.ascii_lowercase)
+    return "".join(chars)
+
+
+def timed(index: NameIndex, queries: List[Tuple[str, int]]) -> Tuple[List[float], int, int]:
+    """Latencies, how often the intended member ranked first, and how often it was in the top 5"""
+    latencies, first, top = [], 0, 0
+    for query, expected in queries:
+        started = time.perf_counter()
+        ranked = [item_id for _, item_id in index.search(query)]
+        latencies.append(time.perf_counter() - started)
+        first += bool(ranked) and ranked[0] == expected
+        top += expected in ranked
+    return latencies, first, top
+
+
+def prefix_matches(index: NameIndex, query: str) -> int:
+    """How many members have a name starting with the query"""
+    query = normalize(query)
+    matched = set()
+    for name, item_id in index.sorted_names[bisect_left(index.sorted_names, (query, 0)):]:
+        if not name.startswith(query):
+            break
+        matched.add(item_id)
+    return len(matched)
+
+
+def summarize(latencies: List[float]) -> str:
+    ordered = sorted(latencies)
+    p50 = ordered[len(ordered) // 2] * 1e6
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1e6
+    return f"p50 {p50:7.1f}us  p99 {p99:7.1f}us  max {ordered[-1] * 1e6:8.1f}us"
+
+
+def linear_scan(members: Dict[int, Tuple[str, Optional[str], Optional[str]]], query: str) -> Optional[int]:
+    """What utils.find_member used to do for every lookup"""
+    best_id, best_score = None, 0.0
+    for member_id, (name, _, nick) in members.items():
+        for candidate in (name, nick):
+            if candidate:
+                score = SequenceMatcher(None, query.lower(), candidate.lower()).ratio()
+                if score > best_score:
+                    best_id, best_score = member_id, score
+    return best_id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the member name index")
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--compare", action="store_true", help="Also time the old linear scan on a few queries")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    members: Dict[int, Tuple[str, Optional[str], Optional[str]]] = {}
+    usernames = set()
+    for i in range(args.members):
+        name = random_name(rng)
+        while name in usernames:  # usernames are unique, like Discord's
+            name = random_name(rng)
+        usernames.add(name)
+        members[10**17 + i] = (
+            name,
+            name.title() if rng.random() < 0.5 else None,
+            random_name(rng) if rng.random() < 0.3 else None,
+        )
+
+    index = NameIndex()
+    started = time.perf_counter()
+    index.add_many(members.items())
+    print(f"Indexed {len(index)} members in {time.perf_counter() - started:.2f}s "
+          f"({len(index.grams)} trigrams)\n")
+
+    sample = rng.sample(list(members.items()), args.queries)
+    cases = {
+        "exact": [(names[0], member_id) for member_id, names in sample],
+        "prefix": [(names[0][:max(2, len(names[0]) // 2)], member_id) for member_id, names in sample],
+        "misspelt": [(misspell(names[0], rng), member_id) for member_id, names in sample],
+        "nickname": [(names[2] or names[0], member_id) for member_id, names in sample],
+    }
+    for label, queries in cases.items():
+        latencies, first, top = timed(index, queries)
+        print(f"{label:<10}{summarize(latencies)}  intended first {first / len(queries):4.0%}, "
+              f"top 5 {top / len(queries):4.0%}")
+    shared = sorted(prefix_matches(index, query) for query, _ in cases["prefix"])
+    print(f"(each prefix query starts the names of a median {shared[len(shared) // 2]} members)")
+
+    joins = [(10**18 + i, (random_name(rng), None, None)) for i in range(args.queries)]
+    started = time.perf_counter()
+    for member_id, names in joins:
+        index.add(member_id, names)
+    for member_id, (name, _, _) in joins:
+        index.add(member_id, (name, None, random_name(rng)))
+    for member_id, _ in joins:
+        index.remove(member_id)
+    per_update = (time.perf_counter() - started) / (3 * len(joins)) * 1e6
+    print(f"\njoin/rename/leave: {per_update:.1f}us per update")
+
+    if args.compare:
+        queries = [query for query, _ in cases["misspelt"][:3]]
+        started = time.perf_counter()
+        for query in queries:
+            linear_scan(members, query)
+        print(f"old linear scan: {(time.perf_counter() - started) / len(queries) * 1000:.0f}ms per lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Measure `tag search` against guilds with a large number of tags.
+
+Creates a scratch database through `DBManager` (base schema and every
+migration, so the FTS table and its triggers are the real ones), fills it with
+N synthetic tags per guild plus some aliases, and times `search_tags` for
+single-word, prefix, two-word and topical queries drawn from a Zipf
+vocabulary, plus the worst case (the most common word). With `--compare`, the
+same queries also run through the old `LIKE '%query%'` join for reference.
+
+Run from the repository root:
+    python -m benchmarks.tag_search --tags 100000 --guilds 2 --compare
+"""
+import argparse
+import itertools
+import os
+import random
+import tempfile
+import time
+from typing import Callable, List
+
+from db_manager import DBManager
+
+SYLLABLES = ["ka", "ri", "to", "mi", "na", "shi", "ro", "lu", "ve", "an", "el", "or", "dra", "zy", "qu", "bel", "cor", "dun"]
+VOCABULARY = 5000
+TOPICS = ["server", "rules", "python", "discord", "music", "anime", "guide", "faq", "welcome", "role",
+          "minecraft", "giveaway", "ticket", "install", "error", "config"]
+
+
+def vocabulary(rng: random.Random) -> List[str]:
+    """Made-up words plus a few topical ones, in Zipf order (the first is the most common)"""
+    words = set()
+    while len(words) < VOCABULARY - len(TOPICS):
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    words = sorted(words)
+    rng.shuffle(words)
+    for rank, topic in zip((3, 10, 30, 100, 300, 1000) * 3, TOPICS):
+        words.insert(rank, topic)
+    return words
+
+
+LEGACY_SEARCH = """
+    SELECT DISTINCT t.*, ta.alias_name
+    FROM tags t
+    LEFT JOIN tag_aliases ta ON t.guild_id = ta.guild_id AND t.name = ta.original_tag_name
+    WHERE t.guild_id = ? AND (t.name LIKE ? OR ta.alias_name LIKE ?)
+    ORDER BY t.name
+    LIMIT 100
+"""
+
+
+class Corpus:
+    def __init__(self, rng: random.Random) -> None:
+        self.rng = rng
+        self.words = vocabulary(rng)
+        self.weights = list(itertools.accumulate(1 / rank for rank in range(1, len(self.words) + 1)))
+
+    def word(self) -> str:
+        return self.rng.choices(self.words, cum_weights=self.weights)[0]
+
+    def sentence(self, length: int) -> str:
+        return " ".join(self.rng.choices(self.words, cum_weights=self.weights, k=length))
+
+
+def summarize(latencies: List[float]) -> str:
+    ordered = sorted(latencies)
+    p50 = ordered[len(ordered) // 2] * 1000
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000
+    return f"p50 {p50:7.2f}ms  p99 {p99:7.2f}ms"
+
+
+def timed(search: Callable[[str], list], queries: List[str]) -> str:
+    latencies, hits = [], 0
+    for query in queries:
+        started = time.perf_counter()
+        hits += len(search(query))
+        latencies.append(time.perf_counter() - started)
+    return f"{summarize(latencies)}  avg {hits / len(queries):5.1f} results"
+
+
+def populate(db: DBManager, guilds: int, tags: int, corpus: Corpus) -> None:
+    rng = corpus.rng
+    for guild_id in range(1, guilds + 1):
+        rows = [
+            (guild_id, f"{corpus.sentence(rng.randint(1, 3)).replace(' ', '-')}-{i}", corpus.sentence(rng.randint(5, 60)), rng.randint(1, 500))
+            for i in range(tags)
+        ]
+        db._cursor.executemany("INSERT INTO tags (guild_id, name, content, owner_id) VALUES (?, ?, ?, ?)", rows)
+        aliases = [(guild_id, f"{corpus.word()}-{i}", rows[i][1]) for i in rng.sample(range(tags), tags // 10)]
+        db._cursor.executemany("INSERT INTO tag_aliases (guild_id, alias_name, original_tag_name) VALUES (?, ?, ?)", aliases)
+        db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark FTS5 tag search")
+    parser.add_argument("--tags", type=int, default=100_000, help="Tags per guild")
+    parser.add_argument("--guilds", type=int, default=2)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--compare", action="store_true", help="Also time the old LIKE search")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+    corpus = Corpus(random.Random(args.seed))
+    rng = corpus.rng
+
+    root = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        os.symlink(os.path.join(root, "schema.sql"), os.path.join(scratch, "schema.sql"))
+        os.symlink(os.path.join(root, "migrations"), os.path.join(scratch, "migrations"))
+        os.chdir(scratch)
+        try:
+            db = DBManager()
+            started = time.perf_counter()
+            populate(db, args.guilds, args.tags, corpus)
+            print(f"\nInserted {args.guilds} x {args.tags} tags (FTS kept in sync by triggers) "
+                  f"in {time.perf_counter() - started:.1f}s\n")
+
+            cases = {
+                "word": [corpus.word() for _ in range(args.queries)],
+                "prefix": [corpus.word()[:3] for _ in range(args.queries)],
+                "two words": [corpus.sentence(2) for _ in range(args.queries)],
+                "topical": [rng.choice(TOPICS) for _ in range(args.queries)],
+                "most common": [corpus.words[0]] * 10,
+            }
+            for label, queries in cases.items():
+                print(f"{label:<12} fts  {timed(lambda q: db.search_tags(1, q), queries)}")
+                if args.compare:
+                    sample = queries[:1]  # tens of seconds at 100k tags
+                    legacy = lambda q: db.execute_query(LEGACY_SEARCH, (1, f"%{q}%", f"%{q}%"), fetch_all=True)
+                    print(f"{'':<12} like {timed(legacy, sample)}  (names and aliases only)")
+
+            edits = rng.sample(range(1, args.tags + 1), min(500, args.tags))
+            started = time.perf_counter()
+            for tag_id in edits:
+                db.execute_and_commit("UPDATE tags SET content = ? WHERE tag_id = ?", (corpus.sentence(20), tag_id))
+            print(f"\nContent edit incl. FTS trigger: {(time.perf_counter() - started) / len(edits) * 1e6:.0f}us each")
+            db.close()
+        finally:
+            os.chdir(root)
+
+
+if __name__ == "__main__":
+    main()
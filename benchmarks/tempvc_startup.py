@@ -0,0 +1,207 @@
+"""
+Time temp VC reconciliation on startup with hundreds of live temp VCs.
+
+Fills a scratch database through `DBManager` with N temp channels spread over
+G guilds, then runs `Vccontrol.reconcile_temp_channels` against stand-in
+guilds and channels whose API calls (delete, send, fetch, edit) sleep for a
+fixed latency. Most VCs are live with their owner inside; a few emptied, lost
+their owner or were deleted while the bot was offline. `--old-panels` marks a
+share of the panels as predating the persistent custom_ids, so they get
+re-attached as on the first start after upgrading. With `--compare`, the
+old startup path (every guild in turn, fetch and edit every panel) runs too.
+
+Run from the repository root:
+    python -m benchmarks.tempvc_startup --channels 500 --guilds 50 --compare
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+from db_manager import DBManager
+from plugins.vccontrol import PANEL_VERSION, Vccontrol
+
+
+class StandInMember:
+    def __init__(self, member_id: int) -> None:
+        self.id = member_id
+        self.mention = f"<@{member_id}>"
+
+
+class StandInMessage:
+    def __init__(self, channel: "StandInChannel", message_id: int) -> None:
+        self.channel = channel
+        self.id = message_id
+
+    async def edit(self, **kwargs) -> None:
+        await self.channel.call("edit")
+
+
+class StandInChannel:
+    def __init__(self, guild: "StandInGuild", channel_id: int, members: List[StandInMember]) -> None:
+        self.guild = guild
+        self.id = channel_id
+        self.members = members
+
+    async def call(self, name: str) -> None:
+        self.guild.calls[name] += 1
+        await asyncio.sleep(self.guild.latency)
+
+    async def delete(self) -> None:
+        await self.call("delete")
+
+    async def send(self, *args, **kwargs) -> StandInMessage:
+        await self.call("send")
+        return StandInMessage(self, random.getrandbits(60))
+
+    async def fetch_message(self, message_id: int) -> StandInMessage:
+        await self.call("fetch")
+        return StandInMessage(self, message_id)
+
+    def get_partial_message(self, message_id: int) -> StandInMessage:
+        return StandInMessage(self, message_id)
+
+    def overwrites_for(self, target) -> SimpleNamespace:
+        return SimpleNamespace(view_channel=None, connect=None)
+
+
+class StandInGuild:
+    def __init__(self, guild_id: int, latency: float, calls: Counter) -> None:
+        self.id = guild_id
+        self.latency = latency
+        self.calls = calls
+        self.default_role = None
+        self.channels: Dict[int, StandInChannel] = {}
+        self.members: Dict[int, StandInMember] = {}
+
+    def get_channel(self, channel_id: int) -> Optional[StandInChannel]:
+        return self.channels.get(channel_id)
+
+    def get_member(self, member_id: int) -> Optional[StandInMember]:
+        return self.members.get(member_id)
+
+
+class StandInBot:
+    def __init__(self, db: DBManager, guilds: List[StandInGuild]) -> None:
+        self.db = db
+        self.guilds = guilds
+        self._guilds = {guild.id: guild for guild in guilds}
+
+    def get_guild(self, guild_id: int) -> Optional[StandInGuild]:
+        return self._guilds.get(guild_id)
+
+    def add_listener(self, *args) -> None:
+        pass
+
+    def add_view(self, *args) -> None:
+        pass
+
+    async def wait_until_ready(self) -> None:
+        pass
+
+
+def populate(
+    db: DBManager,
+    channels: int,
+    guild_count: int,
+    latency: float,
+    old_panels: float,
+    rng: random.Random
+) -> StandInBot:
+    calls = Counter()
+    guilds = [StandInGuild(guild_id, latency, calls) for guild_id in range(1, guild_count + 1)]
+    rows, panels = [], []
+    for channel_id in range(1000, 1000 + channels):
+        guild = rng.choice(guilds)
+        owner = StandInMember(channel_id * 10)
+        others = [StandInMember(channel_id * 10 + i) for i in range(1, rng.randint(1, 5))]
+        fate = rng.random()
+        if fate < 0.05:
+            pass  # deleted while offline
+        elif fate < 0.10:
+            guild.channels[channel_id] = StandInChannel(guild, channel_id, [])
+        elif fate < 0.15:
+            guild.channels[channel_id] = StandInChannel(guild, channel_id, others)
+            guild.members[owner.id] = owner
+        else:
+            guild.channels[channel_id] = StandInChannel(guild, channel_id, [owner] + others)
+            guild.members[owner.id] = owner
+        rows.append((channel_id, guild.id, owner.id, channel_id * 7, channel_id, f"VC {channel_id}"))
+        if rng.random() >= old_panels:
+            panels.append((channel_id, PANEL_VERSION))
+    db._cursor.executemany("""
+        INSERT INTO temp_channels (channel_id, guild_id, owner_id, control_message_id, text_channel_id, name)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, rows)
+    db._cursor.executemany("INSERT INTO temp_channel_panels (channel_id, panel_version) VALUES (?, ?)", panels)
+    db.commit()
+    return StandInBot(db, guilds)
+
+
+async def legacy_setup(bot: StandInBot) -> int:
+    """The startup path before reconciliation: one guild after another, fetch and edit every panel"""
+    registered = 0
+    for guild in bot.guilds:
+        for vc_data in bot.db.get_temp_channels(guild.id):
+            channel = guild.get_channel(vc_data["channel_id"])
+            owner = guild.get_member(vc_data["owner_id"])
+            if channel and owner:
+                control_message = await channel.fetch_message(vc_data["control_message_id"])
+                await control_message.edit(view=None)
+                registered += 1
+            else:
+                bot.db.remove_temp_channel(vc_data["channel_id"])
+    return registered
+
+
+def report(label: str, elapsed: float, calls: Counter, registered: int) -> None:
+    api = ", ".join(f"{name} {count}" for name, count in sorted(calls.items())) or "none"
+    print(f"{label:<10} {elapsed:7.2f}s  {registered} VCs registered  API calls: {api}")
+
+
+async def run(args: argparse.Namespace) -> None:
+    for label in (["legacy"] if args.compare else []) + ["reconcile"]:
+        db = DBManager()
+        db.execute_and_commit("DELETE FROM temp_channels")
+        bot = populate(db, args.channels, args.guilds, args.latency, args.old_panels, random.Random(args.seed))
+        calls = bot.guilds[0].calls
+        started = time.perf_counter()
+        if label == "legacy":
+            registered = await legacy_setup(bot)
+        else:
+            cog = Vccontrol(bot)
+            await cog.reconcile_temp_channels()
+            registered = len(cog.temp_channels)
+        report(label, time.perf_counter() - started, calls, registered)
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark temp VC startup reconciliation")
+    parser.add_argument("--channels", type=int, default=500, help="Temp VCs in the database")
+    parser.add_argument("--guilds", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.08, help="Seconds per simulated API call")
+    parser.add_argument("--old-panels", type=float, default=0.0,
+                        help="Share of panels posted before the persistent custom_ids, as right after upgrading")
+    parser.add_argument("--compare", action="store_true", help="Also time the old sequential startup")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    root = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        os.symlink(os.path.join(root, "schema.sql"), os.path.join(scratch, "schema.sql"))
+        os.symlink(os.path.join(root, "migrations"), os.path.join(scratch, "migrations"))
+        os.chdir(scratch)
+        try:
+            asyncio.run(run(args))
+        finally:
+            os.chdir(root)
+
+
+if __name__ == "__main__":
+    main()
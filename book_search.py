@@ -0,0 +1,190 @@
+"""
+Library Genesis search behind a bounded worker pool, a TTL cache and request dedup.
+
+LibgenSearch scrapes synchronously, so searches run on a small dedicated
+thread pool with a cap on how many distinct searches may be queued; past
+that, callers get `BookSearchBusy` instead of piling up behind the scraper.
+Results are cached per (search type, query, filters) for a while, identical
+concurrent searches share one scrape, and a search nobody is waiting for any
+more (every caller was cancelled or timed out) is dropped if it hasn't
+started yet.
+"""
+import asyncio
+import functools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from libgen_api_enhanced import LibgenSearch
+
+SEARCH_CACHE_TTL = 3600
+EMPTY_CACHE_TTL = 300  # "no results" is cached for less time in case the mirror was just flaky
+
+SearchKey = Tuple[str, str, Tuple[Tuple[str, str], ...], bool]
+
+_local = threading.local()
+
+
+class BookSearchBusy(Exception):
+    """Too many distinct searches are already queued"""
+
+
+def _searcher() -> LibgenSearch:
+    # One client per worker thread rather than one per search
+    searcher = getattr(_local, "searcher", None)
+    if searcher is None:
+        searcher = _local.searcher = LibgenSearch()
+    return searcher
+
+
+def filter_results(
+    results: List[Dict[str, Any]],
+    filters: Dict[str, str],
+    exact_match: bool = True
+) -> List[Dict[str, Any]]:
+    """Filter results based on the provided filters"""
+    filtered_results = []
+
+    for result in results:
+        matches_all_filters = True
+
+        for filter_key, filter_value in filters.items():
+            result_value = result.get(filter_key, "")
+
+            if exact_match:
+                if result_value != filter_value:
+                    matches_all_filters = False
+                    break
+            else:
+                if filter_value.lower() not in result_value.lower():
+                    matches_all_filters = False
+                    break
+
+        if matches_all_filters:
+            filtered_results.append(result)
+
+    return filtered_results
+
+
+def search_books(
+    search_type: str,
+    query: str,
+    filters: Optional[Dict[str, str]] = None,
+    exact_match: bool = True
+) -> List[Dict[str, Any]]:
+    """Search by title, author or across all fields, optionally filtered. Blocking"""
+    searcher = _searcher()
+    if not filters:
+        if search_type == "title":
+            return searcher.search_title(query)
+        elif search_type == "author":
+            return searcher.search_author(query)
+        return searcher.search_default(query)
+
+    # LibgenSearch expects "Extension" capitalised
+    clean_filters = {
+        ("Extension" if key.lower() == "extension" else key): value
+        for key, value in filters.items()
+    }
+    if search_type == "title":
+        return searcher.search_title_filtered(query, clean_filters, exact_match)
+    elif search_type == "author":
+        return searcher.search_author_filtered(query, clean_filters, exact_match)
+    # The library has no filtered default search, so filter its results here
+    return filter_results(searcher.search_default(query), clean_filters, exact_match)
+
+
+class _Flight:
+    __slots__ = ("future", "waiters")
+
+    def __init__(self, future: asyncio.Future) -> None:
+        self.future = future
+        self.waiters = 0
+
+
+class BookSearch:
+    def __init__(
+        self,
+        *,
+        workers: int = 2,
+        max_pending: int = 8,
+        ttl: float = SEARCH_CACHE_TTL,
+        empty_ttl: float = EMPTY_CACHE_TTL,
+        max_entries: int = 256,
+    ) -> None:
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="book-search")
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self.empty_ttl = empty_ttl
+        self.max_entries = max_entries
+        self.cache: "OrderedDict[SearchKey, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self.flights: Dict[SearchKey, _Flight] = {}
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.rejected = 0
+        self.abandoned = 0
+
+    @staticmethod
+    def key(search_type: str, query: str, filters: Optional[Dict[str, str]], exact_match: bool) -> SearchKey:
+        normalized = tuple(sorted((name.lower(), value.strip().lower()) for name, value in (filters or {}).items()))
+        return search_type, " ".join(query.lower().split()), normalized, exact_match
+
+    async def search(
+        self,
+        search_type: str,
+        query: str,
+        filters: Optional[Dict[str, str]] = None,
+        exact_match: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Cached results, or a share of an in-flight search, or a new search on the pool"""
+        key = self.key(search_type, query, filters, exact_match)
+        cached = self.cache.get(key)
+        if cached is not None:
+            if cached[0] > time.monotonic():
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+            del self.cache[key]
+
+        flight = self.flights.get(key)
+        if flight is None:
+            if len(self.flights) >= self.max_pending:
+                self.rejected += 1
+                raise BookSearchBusy()
+            self.misses += 1
+            future = asyncio.get_running_loop().run_in_executor(
+                self.pool, functools.partial(search_books, search_type, query, filters, exact_match)
+            )
+            flight = self.flights[key] = _Flight(future)
+            future.add_done_callback(functools.partial(self._store, key, flight))
+        else:
+            self.shared += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.future)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.future.done():
+                # Everyone who asked has gone; a search still queued on the pool never starts
+                self.abandoned += 1
+                flight.future.cancel()
+                if self.flights.get(key) is flight:
+                    del self.flights[key]
+
+    def _store(self, key: SearchKey, flight: _Flight, future: asyncio.Future) -> None:
+        if self.flights.get(key) is flight:
+            del self.flights[key]
+        if future.cancelled() or future.exception() is not None:
+            return
+        results = future.result() or []
+        self.cache[key] = (time.monotonic() + (self.ttl if results else self.empty_ttl), results)
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=False, cancel_futures=True)
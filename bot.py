@@ -6,6 +6,8 @@ from difflib import SequenceMatcher
 import os 
 from dotenv import load_dotenv
 from db_manager import DBManager
+from http_client import HTTPClient, ResponseCache, UpstreamUnavailable
+from name_index import resolver
 from typing import Union, List, Optional
 import traceback
 load_dotenv()
@@ -29,6 +31,9 @@ class Morgana(commands.AutoShardedBot):
             
         )
         self.db = DBManager()
+        self.http_client = HTTPClient(cache=ResponseCache(self.db))
+        self.resolver = resolver
+        self.resolver.attach(self)
         self.owner_id = os.getenv("owner")
         self.token = os.getenv("token")
         self.plugins = plguins
@@ -102,6 +107,12 @@ class Morgana(commands.AutoShardedBot):
             if isinstance(error.original, discord.Forbidden):
                 await context.reply("I do not have enough permission to perform this action.")
                 return
+            if isinstance(error.original, UpstreamUnavailable):
+                await context.reply(f"That service isn't responding right now. Try again in {max(1, round(error.original.retry_after))} seconds.")
+                return
+            if isinstance(error.original, asyncio.TimeoutError):
+                await context.reply("That service took too long to respond. Please try again later.")
+                return
             
         else:
             try:
@@ -141,7 +152,10 @@ class Morgana(commands.AutoShardedBot):
     ) -> None:
         """Cleanup and close the bot."""
         await super().close()
+        if hasattr(self, 'http_client'):
+            await self.http_client.close()
         if hasattr(self, 'db'):
+            self.db.flush_tag_uses()
             self.db.close()
 
     def run(
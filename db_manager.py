@@ -2,13 +2,30 @@ import sqlite3
 import os
 import time
 import json
+import hashlib
+import random
+import re
+from collections import Counter, OrderedDict
+from dataclasses import replace
 from typing import Optional, Tuple, List, Dict, Any
 from datetime import datetime
+from guild_config import GuildConfig, WelcomerSettings
+
+TAG_CACHE_GUILDS = 256
+TAG_CACHE_SIZE = 64  # hot tags (and aliases) kept per guild
+TAG_USE_FLUSH_THRESHOLD = 500  # buffered tag uses that force a flush before the next scheduled one
+TAG_SEARCH_TERMS = 8
+TAG_SEARCH_CANDIDATES = 1000  # newest matches ranked per search, so very common words stay cheap
+TAG_SEARCH_TERM_RE = re.compile(r"\w+")
 
 class DBManager:
     def __init__(self):
         self.connection = sqlite3.connect("database.db")
         self._cursor = self.connection.cursor()
+        self._tag_cache: "OrderedDict[int, OrderedDict[str, Dict[str, Any]]]" = OrderedDict()
+        self._tag_uses: Counter = Counter()
+        self._pending_tag_uses = 0
+        self._guild_configs: Dict[int, GuildConfig] = {}
         self.execute("PRAGMA foreign_keys = ON")
         self.execute("""
             CREATE TABLE IF NOT EXISTS migrations (
@@ -63,6 +80,8 @@ class DBManager:
                 
             # Apply all pending migrations
             self._apply_migrations()
+            # Migrations that rebuild tables switch foreign keys off; make sure they're back on
+            self.execute("PRAGMA foreign_keys = ON")
                 
         except Exception as e:
             print(f"Error during database initialization: {e}")
@@ -401,12 +420,40 @@ class DBManager:
                 SET levelup_channel_id = NULL 
                 WHERE guild_id = ?
             """, (guild_id,))
+        self._update_guild_config(guild_id, levelup_channel_id=channel_id or None)
 
     def get_levelup_channel(self, guild_id: int) -> Optional[int]:
         """Get levelup channel ID"""
-        self.execute("SELECT levelup_channel_id FROM guild_leveling_settings", (guild_id,))
-        result = self.fetchone()
-        return result[0] if result else None
+        return self.get_guild_config(guild_id).levelup_channel_id
+
+    def get_guild_config(self, guild_id: int) -> GuildConfig:
+        """The guild's settings snapshot, read from the database on first use"""
+        config = self._guild_configs.get(guild_id)
+        if config is None:
+            config = self._guild_configs[guild_id] = self._load_guild_config(guild_id)
+        return config
+
+    def _load_guild_config(self, guild_id: int) -> GuildConfig:
+        self.execute("SELECT modlog_channel_id FROM guild_config WHERE guild_id = ?", (guild_id,))
+        modlog = self.fetchone()
+        self.execute("SELECT levelup_channel_id FROM guild_leveling_settings WHERE guild_id = ?", (guild_id,))
+        levelup = self.fetchone()
+        self.execute("SELECT channel_id, enabled FROM tempvc_config WHERE guild_id = ?", (guild_id,))
+        tempvc = self.fetchone()
+        return GuildConfig(
+            guild_id=guild_id,
+            modlog_channel_id=modlog[0] if modlog else None,
+            levelup_channel_id=levelup[0] if levelup else None,
+            tempvc_channel_id=tempvc[0] if tempvc else None,
+            tempvc_enabled=bool(tempvc[1]) if tempvc else False,
+            welcomer=self._load_welcomer_settings(guild_id),
+        )
+
+    def _update_guild_config(self, guild_id: int, **changes) -> None:
+        """Write-through for setters; a guild not loaded yet will read the new values when it is"""
+        config = self._guild_configs.get(guild_id)
+        if config is not None:
+            self._guild_configs[guild_id] = replace(config, **changes)
 
     def add_reminder(self, user_id: int, guild_id: int, channel_id: int, message_id: int, message: str, reminder_time: int) -> int:
         self.execute_and_commit("""
@@ -636,8 +683,77 @@ class DBManager:
             """, (limit,))
             return cur.fetchall()
 
+    def add_quiz_questions(self, rows: List[Tuple[str, str, str, str, str, Optional[str]]]) -> int:
+        """Add (category, question_hash, question, correct_answer, incorrect_answers_json, difficulty)
+        rows to the question bank, skipping hashes already stored. Returns how many were new."""
+        before = self.connection.total_changes
+        self._cursor.executemany("""
+            INSERT OR IGNORE INTO quiz_questions
+            (category, question_hash, question, correct_answer, incorrect_answers, difficulty)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, rows)
+        self.commit()
+        return self.connection.total_changes - before
+
+    def count_unseen_quiz_questions(self, user_id: int, category: str) -> int:
+        """Count banked questions in a category the user hasn't been asked yet"""
+        result = self.execute_query("""
+            SELECT COUNT(*) AS count FROM quiz_questions q
+            WHERE q.category = ?
+            AND NOT EXISTS (
+                SELECT 1 FROM quiz_seen s WHERE s.user_id = ? AND s.question_id = q.question_id
+            )
+        """, (category, user_id), fetch_one=True)
+        return result["count"] if result else 0
+
+    def get_quiz_bank_counts(self) -> Dict[str, int]:
+        """Get the number of banked questions per category"""
+        self.execute("SELECT category, COUNT(*) FROM quiz_questions GROUP BY category")
+        return dict(self.fetchall())
+
+    def get_random_quiz_question(self, user_id: int, category: str) -> Optional[dict]:
+        """Pick a random question the user hasn't seen, or any question once they've seen them all.
+
+        Counts the candidates and takes the one at a random offset along the
+        (category, question_id) index, so every candidate is equally likely
+        however the ids are spread out, without ORDER BY RANDOM() sorting them all.
+        """
+        unseen = """
+            AND NOT EXISTS (
+                SELECT 1 FROM quiz_seen s WHERE s.user_id = ? AND s.question_id = q.question_id
+            )
+        """
+        for filter_seen, params in ((unseen, (category, user_id)), ("", (category,))):
+            count = self.execute_query(f"""
+                SELECT COUNT(*) AS n FROM quiz_questions q
+                WHERE q.category = ? {filter_seen}
+            """, params, fetch_one=True)["n"]
+            if not count:
+                continue
+            question = self.execute_query(f"""
+                SELECT q.* FROM quiz_questions q
+                WHERE q.category = ? {filter_seen}
+                ORDER BY q.question_id
+                LIMIT 1 OFFSET ?
+            """, params + (random.randrange(count),), fetch_one=True)
+            if question:
+                question["incorrect_answers"] = json.loads(question["incorrect_answers"])
+                return question
+        return None
+
+    def mark_quiz_question_seen(self, user_id: int, question_id: int) -> None:
+        """Record that a user has been asked a question"""
+        self.execute_and_commit("""
+            INSERT INTO quiz_seen (user_id, question_id) VALUES (?, ?)
+            ON CONFLICT(user_id, question_id) DO UPDATE SET seen_at = CURRENT_TIMESTAMP
+        """, (user_id, question_id))
+
     def get_welcomer_settings(self, guild_id: int) -> dict:
         """Get welcomer settings for a guild"""
+        welcomer = self.get_guild_config(guild_id).welcomer
+        return welcomer.to_dict() if welcomer else None
+
+    def _load_welcomer_settings(self, guild_id: int) -> Optional[WelcomerSettings]:
         cur = self.execute("""
             SELECT * FROM welcomer_settings WHERE guild_id = ?
         """, (guild_id,))
@@ -652,31 +768,20 @@ class DBManager:
             WHERE guild_id = ?
         """, (guild_id,))
         buttons = cur.fetchall()
-        
-        result = {
-            'enabled': bool(settings[1]),
-            'channel_id': settings[2],
-            'message': settings[3],
-            'title': settings[4],
-            'description': settings[5],
-            'color': settings[6],
-            'footer': {
-                'text': settings[7],
-                'icon_url': settings[8]
-            },
-            'author': {
-                'name': settings[9],
-                'url': settings[10],
-                'icon_url': settings[11]
-            },
-            'thumbnail_url': settings[12],
-            'image_url': settings[13]
-        }
-        
-        if buttons:
-            result['buttons'] = [{'label': b[0], 'url': b[1]} for b in buttons]
-            
-        return result
+
+        cur = self.execute("""
+            SELECT max_joins, window_seconds FROM welcomer_burst 
+            WHERE guild_id = ?
+        """, (guild_id,))
+        return WelcomerSettings.from_row(settings, buttons, cur.fetchone())
+
+    def set_welcomer_burst(self, guild_id: int, max_joins: int, window_seconds: int) -> None:
+        """Set how many joins per window are welcomed one by one before they're coalesced"""
+        self.execute_and_commit("""
+            INSERT OR REPLACE INTO welcomer_burst (guild_id, max_joins, window_seconds)
+            VALUES (?, ?, ?)
+        """, (guild_id, max_joins, window_seconds))
+        self._update_guild_config(guild_id, welcomer=self._load_welcomer_settings(guild_id))
 
     def update_welcomer_settings(self, guild_id: int, settings: dict) -> None:
         """Update welcomer settings for a guild"""
@@ -735,6 +840,9 @@ class DBManager:
                         VALUES (?, ?, ?)
                     """, (guild_id, button['label'], button['url']))
 
+        # Buttons are only replaced when given, so read back what was stored
+        self._update_guild_config(guild_id, welcomer=self._load_welcomer_settings(guild_id))
+
     def get_shop_data(self, guild_id: int) -> dict:
         """Get shop data for a guild"""
         query = "SELECT * FROM shop_data WHERE guild_id = ?"
@@ -853,21 +961,57 @@ class DBManager:
         return self.execute_query(query, (code,), fetch_one=True)
 
     # Waifu System Methods
+    def sync_waifu_catalog(self, waifu_data: dict) -> bool:
+        """Import the waifu catalog into waifu_catalog if it changed since the last import"""
+        content_hash = hashlib.sha256(json.dumps(waifu_data, sort_keys=True).encode("utf-8")).hexdigest()
+        self.execute("SELECT content_hash FROM catalog_versions WHERE name = 'waifu'")
+        result = self.fetchone()
+        if result and result[0] == content_hash:
+            return False
+
+        rows = [
+            (
+                waifu_id,
+                data.get('name', 'Unknown'),
+                data.get('jp_name'),
+                data.get('series'),
+                data.get('image_link'),
+                data.get('popularity_rank'),
+                data.get('total_likes'),
+                data.get('rarity_score'),
+                data.get('rarity_tier', '')
+            )
+            for waifu_id, data in waifu_data.items()
+        ]
+        with self.connection as conn:
+            cur = conn.cursor()
+            cur.execute("DELETE FROM waifu_catalog")
+            cur.executemany("""
+                INSERT INTO waifu_catalog (
+                    waifu_id, name, jp_name, series, image_link,
+                    popularity_rank, total_likes, rarity_score, rarity_tier
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            cur.execute("""
+                INSERT INTO catalog_versions (name, content_hash) VALUES ('waifu', ?)
+                ON CONFLICT(name) DO UPDATE SET
+                content_hash = excluded.content_hash,
+                imported_at = CURRENT_TIMESTAMP
+            """, (content_hash,))
+        return True
+
     def save_waifu_card(self, user_id: int, waifu: dict, serial: str) -> None:
         """Save a waifu card to the database"""
         query = """
             INSERT INTO waifu_cards (
-                serial_number, owner_id, waifu_id, name, 
-                rarity, rank, level
-            ) VALUES (?, ?, ?, ?, ?, ?, 1)
+                serial_number, owner_id, waifu_id, rarity, level
+            ) VALUES (?, ?, ?, ?, 1)
         """
         params = (
             serial,
             user_id,
             waifu['id'],
-            waifu['name'],
-            waifu['rarity_tier'],
-            waifu.get('popularity_rank')
+            waifu['rarity_tier']
         )
         self.execute_and_commit(query, params)
 
@@ -886,24 +1030,58 @@ class DBManager:
 
     def get_user_cards(self, user_id: int, rarity: str = None, locked: bool = None) -> List[Dict]:
         """Get all cards owned by a user with optional filters"""
-        query = "SELECT * FROM waifu_cards WHERE owner_id = ?"
+        query = """
+            SELECT wc.*, c.name, c.popularity_rank AS rank
+            FROM waifu_cards wc
+            LEFT JOIN waifu_catalog c ON c.waifu_id = wc.waifu_id
+            WHERE wc.owner_id = ?
+        """
         params = [user_id]
         
         if rarity:
-            query += " AND rarity = ?"
+            query += " AND wc.rarity = ?"
             params.append(rarity)
         if locked is not None:
-            query += " AND locked = ?"
+            query += " AND wc.locked = ?"
             params.append(locked)
             
-        query += " ORDER BY obtained_at DESC"
+        query += " ORDER BY wc.obtained_at DESC"
         return self.execute_query(query, tuple(params), fetch_all=True)
 
     def get_card_by_serial(self, serial: str) -> Optional[Dict]:
         """Get a card by its serial number"""
-        query = "SELECT * FROM waifu_cards WHERE serial_number = ?"
+        query = """
+            SELECT wc.*, c.name, c.popularity_rank AS rank
+            FROM waifu_cards wc
+            LEFT JOIN waifu_catalog c ON c.waifu_id = wc.waifu_id
+            WHERE wc.serial_number = ?
+        """
         return self.execute_query(query, (serial,), fetch_one=True)
 
+    def get_random_card(self, rarity: str = None) -> Optional[Dict]:
+        """Get a random drawn card, optionally from a single rarity tier"""
+        query = """
+            SELECT wc.*, c.name, c.popularity_rank AS rank
+            FROM waifu_cards wc
+            LEFT JOIN waifu_catalog c ON c.waifu_id = wc.waifu_id
+        """
+        params = ()
+        if rarity:
+            query += " WHERE wc.rarity = ?"
+            params = (rarity,)
+        query += " ORDER BY RANDOM() LIMIT 1"
+        return self.execute_query(query, params, fetch_one=True)
+
+    def get_waifu_catalog_counts(self) -> List[Dict]:
+        """Get every catalog waifu with the number of cards drawn of it, by popularity rank"""
+        return self.execute_query("""
+            SELECT c.waifu_id, c.name, c.popularity_rank, COUNT(wc.card_id) as count
+            FROM waifu_catalog c
+            LEFT JOIN waifu_cards wc ON wc.waifu_id = c.waifu_id
+            GROUP BY c.waifu_id
+            ORDER BY c.popularity_rank IS NULL, c.popularity_rank
+        """, fetch_all=True)
+
     def update_card_owner(self, serial: str, new_owner_id: int) -> bool:
         """Update the owner of a card"""
         query = """
@@ -1015,21 +1193,22 @@ class DBManager:
                 SELECT 
                     wc.owner_id,
                     wc.rarity,
-                    wc.rank,
+                    c.popularity_rank as rank,
                     wc.serial_number,
-                    wc.name,
+                    c.name,
                     wc.level,
                     wc.locked,
                     CASE 
-                        WHEN wc.rarity = 'SS' THEN 3000 - (COALESCE(wc.rank, 0) * 5)
-                        WHEN wc.rarity = 'S' THEN 1000 - (COALESCE(wc.rank, 0) * 2)
-                        WHEN wc.rarity = 'A' THEN 100 - (COALESCE(wc.rank, 0) * 0.1)
-                        WHEN wc.rarity = 'B' THEN 30 - (COALESCE(wc.rank, 0) * 0.05)
-                        WHEN wc.rarity = 'C' THEN 10 - (COALESCE(wc.rank, 0) * 0.02)
-                        WHEN wc.rarity = 'D' THEN 3 - (COALESCE(wc.rank, 0) * 0.01)
+                        WHEN wc.rarity = 'SS' THEN 3000 - (COALESCE(c.popularity_rank, 0) * 5)
+                        WHEN wc.rarity = 'S' THEN 1000 - (COALESCE(c.popularity_rank, 0) * 2)
+                        WHEN wc.rarity = 'A' THEN 100 - (COALESCE(c.popularity_rank, 0) * 0.1)
+                        WHEN wc.rarity = 'B' THEN 30 - (COALESCE(c.popularity_rank, 0) * 0.05)
+                        WHEN wc.rarity = 'C' THEN 10 - (COALESCE(c.popularity_rank, 0) * 0.02)
+                        WHEN wc.rarity = 'D' THEN 3 - (COALESCE(c.popularity_rank, 0) * 0.01)
                         ELSE 0 
                     END as card_value
                 FROM waifu_cards wc
+                LEFT JOIN waifu_catalog c ON c.waifu_id = wc.waifu_id
                 WHERE NOT EXISTS (
                     SELECT 1 FROM waifu_trades wt 
                     WHERE wt.status = 'pending'
@@ -1090,11 +1269,13 @@ class DBManager:
         """Get pending trades for a user"""
         query = """
             SELECT t.*, 
-                   wc1.name as offerer_card_name,
-                   wc2.name as offeree_card_name
+                   c1.name as offerer_card_name,
+                   c2.name as offeree_card_name
             FROM waifu_trades t
             JOIN waifu_cards wc1 ON t.offerer_card = wc1.serial_number
             JOIN waifu_cards wc2 ON t.offeree_card = wc2.serial_number
+            LEFT JOIN waifu_catalog c1 ON c1.waifu_id = wc1.waifu_id
+            LEFT JOIN waifu_catalog c2 ON c2.waifu_id = wc2.waifu_id
             WHERE t.status = 'pending'
             AND (t.offerer_id = ? OR t.offeree_id = ?)
         """
@@ -1179,34 +1360,157 @@ class DBManager:
         """Get card value statistics for leaderboard"""
         return self.execute_query("""
             SELECT 
-                owner_id,
+                wc.owner_id,
                 COUNT(*) as total_cards,
-                GROUP_CONCAT(rarity) as cards_by_tier,
+                GROUP_CONCAT(wc.rarity) as cards_by_tier,
                 SUM(
                     CASE 
-                        WHEN rarity = 'SS' THEN 3000 - (rank * 5)
-                        WHEN rarity = 'S' THEN 1000 - (rank * 2)
-                        WHEN rarity = 'A' THEN 100 - (rank * 0.1)
-                        WHEN rarity = 'B' THEN 30 - (rank * 0.05)
-                        WHEN rarity = 'C' THEN 10 - (rank * 0.02)
-                        WHEN rarity = 'D' THEN 3 - (rank * 0.01)
+                        WHEN wc.rarity = 'SS' THEN 3000 - (c.popularity_rank * 5)
+                        WHEN wc.rarity = 'S' THEN 1000 - (c.popularity_rank * 2)
+                        WHEN wc.rarity = 'A' THEN 100 - (c.popularity_rank * 0.1)
+                        WHEN wc.rarity = 'B' THEN 30 - (c.popularity_rank * 0.05)
+                        WHEN wc.rarity = 'C' THEN 10 - (c.popularity_rank * 0.02)
+                        WHEN wc.rarity = 'D' THEN 3 - (c.popularity_rank * 0.01)
                         ELSE 0 
                     END
                 ) as total_value
-            FROM waifu_cards
-            GROUP BY owner_id
+            FROM waifu_cards wc
+            LEFT JOIN waifu_catalog c ON c.waifu_id = wc.waifu_id
+            GROUP BY wc.owner_id
             ORDER BY total_value DESC
             LIMIT 5
         """, fetch_all=True)
 
+    def get_waifu_counts(self, user_id: int = None) -> List[Tuple[int, str, int]]:
+        """Get (owner_id, waifu_id, count) rows, optionally for a single user"""
+        query = "SELECT owner_id, waifu_id, COUNT(*) FROM waifu_cards"
+        params = ()
+        if user_id is not None:
+            query += " WHERE owner_id = ?"
+            params = (user_id,)
+        query += " GROUP BY owner_id, waifu_id"
+        self.execute(query, params)
+        return self.fetchall()
+
+    def get_waifu_collection_checksum(self) -> Tuple[int, int, int, int]:
+        """
+        Get (owners, owned pairs, duplicate pairs, waifu_id sum over owned pairs)
+        from waifu_cards, to check persisted collection bitsets against
+        """
+        self.execute("""
+            SELECT COUNT(DISTINCT owner_id), COUNT(*), COALESCE(SUM(copies > 1), 0), COALESCE(SUM(waifu_id), 0)
+            FROM (
+                SELECT owner_id, CAST(waifu_id AS INTEGER) AS waifu_id, COUNT(*) AS copies
+                FROM waifu_cards
+                GROUP BY owner_id, waifu_id
+            )
+        """)
+        return tuple(self.fetchone())
+
+    def get_max_waifu_id(self) -> int:
+        """Get the highest waifu_id any card refers to, or 0 without cards"""
+        self.execute("SELECT COALESCE(MAX(CAST(waifu_id AS INTEGER)), 0) FROM waifu_cards")
+        return self.fetchone()[0]
+
+    def get_waifu_collections(self) -> List[Tuple[int, bytes, bytes]]:
+        """Get every persisted (user_id, owned, duplicates) collection bitset"""
+        self.execute("SELECT user_id, owned, duplicates FROM waifu_collections")
+        return self.fetchall()
+
+    def save_waifu_collections(self, rows: List[Tuple[int, bytes, bytes]]) -> None:
+        """Persist (user_id, owned, duplicates) collection bitsets"""
+        self._cursor.executemany("""
+            INSERT INTO waifu_collections (user_id, owned, duplicates)
+            VALUES (?, ?, ?)
+            ON CONFLICT(user_id) DO UPDATE SET
+            owned = excluded.owned,
+            duplicates = excluded.duplicates,
+            updated_at = CURRENT_TIMESTAMP
+        """, rows)
+        self.commit()
+
+    def get_http_cache(self, cache_key: str) -> Optional[Tuple[int, str, float, float]]:
+        """Get a cached (status, body, expires_at, stale_until) HTTP response"""
+        self.execute(
+            "SELECT status, body, expires_at, stale_until FROM http_cache WHERE cache_key = ?",
+            (cache_key,)
+        )
+        return self.fetchone()
+
+    def set_http_cache(self, cache_key: str, status: int, body: str, expires_at: float, stale_until: float) -> None:
+        """Store or replace a cached HTTP response"""
+        self.execute_and_commit("""
+            INSERT INTO http_cache (cache_key, status, body, expires_at, stale_until)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(cache_key) DO UPDATE SET
+            status = excluded.status,
+            body = excluded.body,
+            expires_at = excluded.expires_at,
+            stale_until = excluded.stale_until
+        """, (cache_key, status, body, expires_at, stale_until))
+
+    def prune_http_cache(self, now: float) -> int:
+        """Drop cached HTTP responses that are past their stale window"""
+        self.execute_and_commit("DELETE FROM http_cache WHERE stale_until < ?", (now,))
+        return self._cursor.rowcount
+
+    def get_interaction_gifs(self) -> List[Tuple[str, str, Optional[str]]]:
+        """Get every pooled (action, url, anime_name) interaction result, oldest first"""
+        self.execute("SELECT action, url, anime_name FROM interaction_gifs ORDER BY fetched_at, rowid")
+        return self.fetchall()
+
+    def replace_interaction_gifs(self, action: str, rows: List[Tuple[str, Optional[str]]]) -> None:
+        """Replace the pooled (url, anime_name) results for one interaction action"""
+        self.execute("DELETE FROM interaction_gifs WHERE action = ?", (action,))
+        self._cursor.executemany(
+            "INSERT OR IGNORE INTO interaction_gifs (action, url, anime_name) VALUES (?, ?, ?)",
+            [(action, url, anime_name) for url, anime_name in rows]
+        )
+        self.commit()
+
+    def add_news_subscription(self, guild_id: int, channel_id: int, category: str) -> bool:
+        """Subscribe a channel to a news category. Returns False if it already was"""
+        cursor = self.execute_and_commit(
+            "INSERT OR IGNORE INTO news_subscriptions (guild_id, channel_id, category) VALUES (?, ?, ?)",
+            (guild_id, channel_id, category)
+        )
+        return cursor.rowcount > 0
+
+    def remove_news_subscription(self, channel_id: int, category: str) -> bool:
+        """Unsubscribe a channel from a news category. Returns False if it wasn't subscribed"""
+        cursor = self.execute_and_commit(
+            "DELETE FROM news_subscriptions WHERE channel_id = ? AND category = ?",
+            (channel_id, category)
+        )
+        return cursor.rowcount > 0
+
+    def get_news_subscriptions(self) -> List[Tuple[int, int, str]]:
+        """Get every (guild_id, channel_id, category) subscription"""
+        self.execute("SELECT guild_id, channel_id, category FROM news_subscriptions")
+        return self.fetchall()
+
+    def get_guild_news_subscriptions(self, guild_id: int) -> List[Tuple[int, str]]:
+        """Get a guild's (channel_id, category) subscriptions"""
+        self.execute(
+            "SELECT channel_id, category FROM news_subscriptions WHERE guild_id = ? ORDER BY channel_id, category",
+            (guild_id,)
+        )
+        return self.fetchall()
+
     def add_temp_channel(self, channel_id: int, guild_id: int, owner_id: int, 
-                        control_message_id: int, text_channel_id: int, name: str) -> None:
+                        control_message_id: int, text_channel_id: int, name: str,
+                        panel_version: int = 0) -> None:
         """Add temporary channel to database"""
-        self.execute_and_commit("""
+        self.execute("""
             INSERT INTO temp_channels 
             (channel_id, guild_id, owner_id, control_message_id, text_channel_id, name)
             VALUES (?, ?, ?, ?, ?, ?)
         """, (channel_id, guild_id, owner_id, control_message_id, text_channel_id, name))
+        self.execute(
+            "INSERT INTO temp_channel_panels (channel_id, panel_version) VALUES (?, ?)",
+            (channel_id, panel_version)
+        )
+        self.commit()
         
         
     def remove_temp_channel(self, channel_id: int) -> None:
@@ -1214,7 +1518,68 @@ class DBManager:
             "DELETE FROM temp_channels WHERE channel_id = ?",
             (channel_id,)
         )
-    
+
+    def remove_temp_channels(self, channel_ids: List[int]) -> None:
+        if not channel_ids:
+            return
+        self._cursor.executemany(
+            "DELETE FROM temp_channels WHERE channel_id = ?",
+            [(channel_id,) for channel_id in channel_ids]
+        )
+        self.commit()
+
+    def set_temp_channel_owner(self, channel_id: int, owner_id: int) -> None:
+        """Set a temp VC's owner, which also answers any pending claim prompt"""
+        self.execute(
+            "UPDATE temp_channels SET owner_id = ? WHERE channel_id = ?",
+            (owner_id, channel_id)
+        )
+        self.execute(
+            "UPDATE temp_channel_panels SET claim_message_id = NULL WHERE channel_id = ?",
+            (channel_id,)
+        )
+        self.commit()
+
+    def set_temp_channel_panel_version(self, channel_id: int, panel_version: int) -> None:
+        self.execute_and_commit("""
+            INSERT INTO temp_channel_panels (channel_id, panel_version) VALUES (?, ?)
+            ON CONFLICT(channel_id) DO UPDATE SET panel_version = excluded.panel_version
+        """, (channel_id, panel_version))
+
+    def set_temp_channel_claim(self, channel_id: int, claim_message_id: int) -> None:
+        """Record the claim prompt posted in a temp VC whose owner left"""
+        self.execute_and_commit("""
+            INSERT INTO temp_channel_panels (channel_id, claim_message_id) VALUES (?, ?)
+            ON CONFLICT(channel_id) DO UPDATE SET claim_message_id = excluded.claim_message_id
+        """, (channel_id, claim_message_id))
+
+    def set_temp_channel_control_message(self, channel_id: int, control_message_id: int) -> None:
+        self.execute_and_commit(
+            "UPDATE temp_channels SET control_message_id = ? WHERE channel_id = ?",
+            (control_message_id, channel_id)
+        )
+
+    def get_all_temp_channels(self) -> List[Dict[str, Any]]:
+        """Every temp VC with its panel version (0 if never recorded) and pending claim prompt"""
+        self.execute("""
+            SELECT t.guild_id, t.channel_id, t.owner_id, t.control_message_id, t.text_channel_id,
+                   COALESCE(p.panel_version, 0), p.claim_message_id
+            FROM temp_channels t
+            LEFT JOIN temp_channel_panels p ON p.channel_id = t.channel_id
+        """)
+        return [
+            {
+                "guild_id": row[0],
+                "channel_id": row[1],
+                "owner_id": row[2],
+                "control_message_id": row[3],
+                "text_channel_id": row[4],
+                "panel_version": row[5],
+                "claim_message_id": row[6]
+            }
+            for row in self.fetchall()
+        ]
+
     def get_temp_channels(self, guild_id: int) -> List[Dict[str, Any]]:
         self.execute("""
             SELECT channel_id, owner_id, control_message_id, text_channel_id 
@@ -1234,12 +1599,7 @@ class DBManager:
 
     def get_template_channel(self, guild_id: int) -> Optional[int]:
         """Get template channel ID for a guild"""
-        self.execute("""
-            SELECT channel_id FROM tempvc_config 
-            WHERE guild_id = ? AND enabled = 1
-        """, (guild_id,))
-        result = self.fetchone()
-        return result[0] if result else None
+        return self.get_guild_config(guild_id).template_channel_id
 
     def set_template_channel(self, guild_id: int, channel_id: int) -> None:
         """Set template channel for a guild"""
@@ -1249,20 +1609,18 @@ class DBManager:
             VALUES (?, ?, 1)
         """, (guild_id, channel_id))
         self.commit()
+        self._update_guild_config(guild_id, tempvc_channel_id=channel_id, tempvc_enabled=True)
 
     def toggle_tempvc(self, guild_id: int, enabled: bool) -> None:
         self.execute_and_commit(
             "UPDATE tempvc_config SET enabled = ? WHERE guild_id = ?",
             (enabled, guild_id)
         )
+        if self._cursor.rowcount > 0:
+            self._update_guild_config(guild_id, tempvc_enabled=bool(enabled))
 
     def is_tempvc_enabled(self, guild_id: int) -> bool:
-        self.execute(
-            "SELECT enabled FROM tempvc_config WHERE guild_id = ?",
-            (guild_id,)
-        )
-        result = self.fetchone()
-        return bool(result[0]) if result else False
+        return self.get_guild_config(guild_id).tempvc_enabled
 
     # Moderation Methods
     def set_modlog(self, guild_id: int, channel_id: int) -> None:
@@ -1273,15 +1631,11 @@ class DBManager:
             ON CONFLICT(guild_id) 
             DO UPDATE SET modlog_channel_id = ?, updated_at = CURRENT_TIMESTAMP
         """, (guild_id, channel_id, channel_id))
+        self._update_guild_config(guild_id, modlog_channel_id=channel_id)
 
     def get_modlog(self, guild_id: int) -> Optional[int]:
         """Get moderation log channel ID for a guild"""
-        result = self.execute_query(
-            "SELECT modlog_channel_id FROM guild_config WHERE guild_id = ?",
-            (guild_id,),
-            fetch_one=True
-        )
-        return result["modlog_channel_id"] if result else None
+        return self.get_guild_config(guild_id).modlog_channel_id
 
     def add_mod_case(
         self,
@@ -1337,26 +1691,75 @@ class DBManager:
         except sqlite3.IntegrityError:
             return False
             
-    def get_tag(self, guild_id: int, name: str) -> Optional[Dict[str, Any]]:
-        """Gets a tag by name."""
-        # First try to get it directly
-        result = self.execute_query("SELECT * FROM tags WHERE guild_id = ? AND name = ?", (guild_id, name.lower()), fetch_one=True)
-        
+    def _select_tag(self, guild_id: int, name: str) -> Optional[Dict[str, Any]]:
+        """Looks a tag up by name, then by alias."""
+        result = self.execute_query("SELECT * FROM tags WHERE guild_id = ? AND name = ?", (guild_id, name), fetch_one=True)
         if result:
-            self.execute_and_commit("UPDATE tags SET use_count = use_count + 1 WHERE tag_id = ?", (result["tag_id"],))
             return result
-            
-        result = self.execute_query(
+        return self.execute_query(
             """SELECT t.* FROM tags t
                JOIN tag_aliases ta ON t.guild_id = ta.guild_id AND t.name = ta.original_tag_name
                WHERE ta.guild_id = ? AND ta.alias_name = ?""",
-            (guild_id, name.lower()), fetch_one=True
+            (guild_id, name), fetch_one=True
         )
-        
-        if result:
-            self.execute_and_commit("UPDATE tags SET use_count = use_count + 1 WHERE tag_id = ?", (result["tag_id"],))
-        return result
-            
+
+    def get_tag(self, guild_id: int, name: str, count_use: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Gets a tag by name or alias, from the hot-tag cache when possible.
+
+        Views (`count_use`) are buffered and written by `flush_tag_uses`, so the
+        returned `use_count` may lag behind.
+        """
+        name = name.lower()
+        guild_tags = self._tag_cache.get(guild_id)
+        result = guild_tags.get(name) if guild_tags is not None else None
+        if result is not None:
+            guild_tags.move_to_end(name)
+            self._tag_cache.move_to_end(guild_id)
+        else:
+            result = self._select_tag(guild_id, name)
+            if not result:
+                return None
+            self._cache_tag(guild_id, name, result)
+
+        if count_use:
+            self.record_tag_use(result["tag_id"])
+        return dict(result)
+
+    def _cache_tag(self, guild_id: int, name: str, tag: Dict[str, Any]) -> None:
+        guild_tags = self._tag_cache.get(guild_id)
+        if guild_tags is None:
+            guild_tags = self._tag_cache[guild_id] = OrderedDict()
+            while len(self._tag_cache) > TAG_CACHE_GUILDS:
+                self._tag_cache.popitem(last=False)
+        else:
+            self._tag_cache.move_to_end(guild_id)
+        guild_tags[name] = tag
+        while len(guild_tags) > TAG_CACHE_SIZE:
+            guild_tags.popitem(last=False)
+
+    def invalidate_tag_cache(self, guild_id: int) -> None:
+        """Forgets a guild's cached tags; every tag or alias change goes through here."""
+        self._tag_cache.pop(guild_id, None)
+
+    def record_tag_use(self, tag_id: int) -> None:
+        """Counts a tag view in memory; flushed in batches."""
+        self._tag_uses[tag_id] += 1
+        self._pending_tag_uses += 1
+        if self._pending_tag_uses >= TAG_USE_FLUSH_THRESHOLD:
+            self.flush_tag_uses()
+
+    def flush_tag_uses(self) -> int:
+        """Writes buffered tag views in one transaction. Returns how many tags were updated."""
+        if not self._tag_uses:
+            return 0
+        rows = [(count, tag_id) for tag_id, count in self._tag_uses.items()]
+        self._tag_uses.clear()
+        self._pending_tag_uses = 0
+        self._cursor.executemany("UPDATE tags SET use_count = use_count + ? WHERE tag_id = ?", rows)
+        self.commit()
+        return len(rows)
+
     def get_tag_by_id(self, tag_id: int) -> Optional[Dict[str, Any]]:
         """Gets a tag by ID."""
         return self.execute_query("SELECT * FROM tags WHERE tag_id = ?", (tag_id,), fetch_one=True
@@ -1365,39 +1768,50 @@ class DBManager:
     def edit_tag(self, guild_id: int, name: str, content: str, owner_id: int) -> bool:
         """Edits a tag's content."""
         self.execute_and_commit("UPDATE tags SET content = ? WHERE guild_id = ? AND name = ? AND owner_id = ?", (content, guild_id, name.lower(), owner_id))
-        return self._cursor.rowcount > 0
+        return self._tags_changed(guild_id)
         
     def delete_tag(self, guild_id: int, name: str, owner_id: int) -> bool:
         """Deletes a tag."""
         self.execute_and_commit("DELETE FROM tags WHERE guild_id = ? AND name = ? AND owner_id = ?", (guild_id, name.lower(), owner_id))
-        return self._cursor.rowcount > 0
+        return self._tags_changed(guild_id)
         
     def delete_tag_by_id(self, tag_id: int) -> bool:
         """Deletes a tag by ID."""
+        tag = self.get_tag_by_id(tag_id)
+        if not tag: return False
         self.execute_and_commit("DELETE FROM tags WHERE tag_id = ?", (tag_id,))
-        return self._cursor.rowcount > 0
+        return self._tags_changed(tag["guild_id"])
         
     def transfer_tag(self, guild_id: int, name: str, old_owner_id: int, new_owner_id: int) -> bool:
         """Transfers a tag to a new owner."""
         self.execute_and_commit("UPDATE tags SET owner_id = ? WHERE guild_id = ? AND name = ? AND owner_id = ?", (new_owner_id, guild_id, name.lower(), old_owner_id))
-        return self._cursor.rowcount > 0
+        return self._tags_changed(guild_id)
         
     def claim_tag(self, guild_id: int, name: str, new_owner_id: int, old_owner_id: int) -> bool:
         """Claims a tag if the previous owner is no longer in the server."""
         self.execute_and_commit("UPDATE tags SET owner_id = ? WHERE guild_id = ? AND name = ? AND owner_id = ?", (new_owner_id, guild_id, name.lower(), old_owner_id))
-        return self._cursor.rowcount > 0
+        return self._tags_changed(guild_id)
+
+    def _tags_changed(self, guild_id: int) -> bool:
+        """Drops the guild's cached tags if the last statement changed anything."""
+        if self._cursor.rowcount > 0:
+            self.invalidate_tag_cache(guild_id)
+            return True
+        return False
         
     def create_tag_alias(self, guild_id: int, alias_name: str, original_name: str) -> bool:
         """Creates an alias for an existing tag."""
         try:
-            original_tag = self.get_tag(guild_id, original_name)
+            original_tag = self.get_tag(guild_id, original_name, count_use=False)
             if not original_tag: return False
                 
             self.execute_and_commit("INSERT INTO tag_aliases (guild_id, alias_name, original_tag_name) VALUES (?, ?, ?)", (guild_id, alias_name.lower(), original_name.lower()))
+            self.invalidate_tag_cache(guild_id)
             return True
         except sqlite3.IntegrityError: return False
         
     def get_guild_tag_stats(self, guild_id: int) -> Dict[str, Any]:
+        self.flush_tag_uses()
         query = """
             SELECT 
                 COUNT(*) as total_tags,
@@ -1414,6 +1828,7 @@ class DBManager:
         
     def get_top_guild_tags(self, guild_id: int, page: int = 1) -> List[Dict[str, Any]]:
         """Gets the top tags in a guild."""
+        self.flush_tag_uses()
         offset = (page - 1) * 10
         return self.execute_query("SELECT * FROM tags WHERE guild_id = ? ORDER BY use_count DESC LIMIT 10 OFFSET ?", (guild_id, offset), fetch_all=True)
     
@@ -1434,34 +1849,58 @@ class DBManager:
         return self.execute_query("SELECT * FROM tags WHERE guild_id = ? ORDER BY RANDOM() LIMIT 1", (guild_id,), fetch_one=True
         )
         
-    def search_tags(self, guild_id: int, query: str) -> List[Dict[str, Any]]:
-        """Searches for tags in a guild."""
-        search_term = f"%{query.lower()}%"
-        
-        # Search in both tags and aliases
-        tags = self.execute_query("""
-            SELECT DISTINCT t.*, ta.alias_name
-            FROM tags t
-            LEFT JOIN tag_aliases ta ON t.guild_id = ta.guild_id AND t.name = ta.original_tag_name
-            WHERE t.guild_id = ? AND (t.name LIKE ? OR ta.alias_name LIKE ?)
-            ORDER BY t.name
-            LIMIT 100
-        """, (guild_id, search_term, search_term), fetch_all=True)
-        
-        # Group aliases for each tag
-        result = {}
+    def search_tags(self, guild_id: int, query: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Full-text search over a guild's tag names, aliases and content.
+
+        Every word of the query must match the start of a word in the tag, so
+        partial words work. Results are ranked by bm25 with name matches
+        weighted above alias matches and alias matches above content. Each
+        result carries its aliases and a `snippet` of the content with the
+        matched words in bold.
+
+        A word that appears in most of a big guild's tags would mean scoring
+        all of them, so only the newest `TAG_SEARCH_CANDIDATES` matches are
+        ranked; names and aliases are searched separately so a matching tag
+        name is never cut off by that.
+        """
+        terms = TAG_SEARCH_TERM_RE.findall(query.lower())[:TAG_SEARCH_TERMS]
+        if not terms:
+            return []
+        phrases = " ".join(f'"{term}"*' for term in terms)
+        results: Dict[int, Dict[str, Any]] = {}
+        for columns in ("name aliases", "name aliases content"):
+            match = f'guild : "g{guild_id}" AND {{{columns}}} : ({phrases})'
+            for tag in self._rank_tag_matches(match, limit):
+                if tag["tag_id"] not in results or tag["score"] < results[tag["tag_id"]]["score"]:
+                    results[tag["tag_id"]] = tag
+
+        tags = sorted(results.values(), key=lambda tag: tag["score"])[:limit]
         for tag in tags:
-            tag_id = tag['tag_id']
-            if tag_id not in result:
-                result[tag_id] = tag.copy()
-                result[tag_id]['aliases'] = []
-            if tag.get('alias_name'):
-                result[tag_id]['aliases'].append(tag['alias_name'])
-                
-        return list(result.values())
+            tag["aliases"] = tag["aliases"].split() if tag["aliases"] else []
+        return tags
+
+    def _rank_tag_matches(self, match: str, limit: int) -> List[Dict[str, Any]]:
+        # FTS5 seeks rowid ranges cheaply, so bound the ranking to the newest candidates
+        floor = self.execute_query(
+            "SELECT rowid FROM tags_fts WHERE tags_fts MATCH ? ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+            (match, TAG_SEARCH_CANDIDATES - 1), fetch_one=True
+        )
+        return self.execute_query("""
+            SELECT t.tag_id, t.name, t.owner_id, t.use_count, f.aliases,
+                   snippet(tags_fts, 2, '**', '**', '…', 12) AS snippet,
+                   bm25(tags_fts, 10.0, 5.0, 1.0, 0.0) AS score
+            FROM tags_fts f
+            JOIN tags t ON t.tag_id = f.rowid
+            WHERE tags_fts MATCH ? AND f.rowid >= ?
+            ORDER BY score
+            LIMIT ?
+        """, (match, floor["rowid"] if floor else 0, limit), fetch_all=True)
+
     def get_tag_info(self, guild_id: int, name: str) -> Optional[Dict[str, Any]]:
-        """Gets detailed information about a tag."""
-        tag = self.get_tag(guild_id, name)
+        """Gets detailed information about a tag. Doesn't count as a use."""
+        self.flush_tag_uses()
+        tag = self._select_tag(guild_id, name.lower())
         if not tag: return None
         aliases = self.execute_query("SELECT alias_name FROM tag_aliases WHERE guild_id = ? AND original_tag_name = ?", (guild_id, tag["name"]), fetch_all=True)
         tag["aliases"] = [alias["alias_name"] for alias in aliases]
@@ -1469,6 +1908,7 @@ class DBManager:
         
     def get_guild_tag_stats(self, guild_id: int) -> Dict[str, Any]:
         """Gets tag statistics for a guild."""
+        self.flush_tag_uses()
         stats = {}
         
         total_query = "SELECT COUNT(*) as count FROM tags WHERE guild_id = ?"
@@ -1500,6 +1940,7 @@ class DBManager:
         
     def get_user_tag_stats(self, guild_id: int, user_id: int) -> Dict[str, Any]:
         """Gets tag statistics for a user in a guild."""
+        self.flush_tag_uses()
         stats = {}
         
         total_query = "SELECT COUNT(*) as count FROM tags WHERE guild_id = ? AND owner_id = ?"
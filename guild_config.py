@@ -0,0 +1,84 @@
+"""
+Typed, immutable snapshots of per-guild settings.
+
+`DBManager.get_guild_config` loads one of these per guild on first use and
+every setter replaces it after writing, so event handlers (voice state
+updates, member joins, level-ups, moderation actions) read settings from
+memory instead of querying SQLite each time.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_BURST_JOINS = 5  # joins per window before welcomes are coalesced; 0 never coalesces
+DEFAULT_BURST_WINDOW = 10  # seconds
+
+@dataclass(frozen=True)
+class WelcomerSettings:
+    enabled: bool = False
+    channel_id: Optional[int] = None
+    message: Optional[str] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    color: Optional[str] = None
+    footer_text: Optional[str] = None
+    footer_icon_url: Optional[str] = None
+    author_name: Optional[str] = None
+    author_url: Optional[str] = None
+    author_icon_url: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    image_url: Optional[str] = None
+    buttons: Tuple[Tuple[str, str], ...] = ()  # (label, url)
+    burst_joins: int = DEFAULT_BURST_JOINS
+    burst_window: int = DEFAULT_BURST_WINDOW
+
+    @classmethod
+    def from_row(cls, row: tuple, buttons: list, burst: Optional[tuple] = None) -> "WelcomerSettings":
+        """From a `welcomer_settings` row (column order as in the schema), its (label, url) buttons
+        and its `welcomer_burst` (max_joins, window_seconds) row, if any"""
+        burst_joins, burst_window = burst or (DEFAULT_BURST_JOINS, DEFAULT_BURST_WINDOW)
+        return cls(
+            bool(row[1]), *row[2:14],
+            buttons=tuple((label, url) for label, url in buttons),
+            burst_joins=burst_joins,
+            burst_window=burst_window,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """A fresh copy in the dict shape the welcomer setup views edit"""
+        settings = {
+            'enabled': self.enabled,
+            'channel_id': self.channel_id,
+            'message': self.message,
+            'title': self.title,
+            'description': self.description,
+            'color': self.color,
+            'footer': {
+                'text': self.footer_text,
+                'icon_url': self.footer_icon_url
+            },
+            'author': {
+                'name': self.author_name,
+                'url': self.author_url,
+                'icon_url': self.author_icon_url
+            },
+            'thumbnail_url': self.thumbnail_url,
+            'image_url': self.image_url
+        }
+        if self.buttons:
+            settings['buttons'] = [{'label': label, 'url': url} for label, url in self.buttons]
+        return settings
+
+
+@dataclass(frozen=True)
+class GuildConfig:
+    guild_id: int
+    modlog_channel_id: Optional[int] = None
+    levelup_channel_id: Optional[int] = None
+    tempvc_channel_id: Optional[int] = None
+    tempvc_enabled: bool = False
+    welcomer: Optional[WelcomerSettings] = None
+
+    @property
+    def template_channel_id(self) -> Optional[int]:
+        """The temp VC template channel, if the system is enabled"""
+        return self.tempvc_channel_id if self.tempvc_enabled else None
@@ -0,0 +1,522 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Hashable, NamedTuple, Optional, Set, TypeVar
+from urllib.parse import urlsplit
+
+import aiohttp
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class HostLimit:
+    """Token bucket settings for one upstream host"""
+    rate: float  # requests per second
+    burst: int
+    max_wait: float = 10.0  # longest a request may queue before failing fast
+
+
+# Hosts with known (or observed) limits; everything else gets DEFAULT_HOST_LIMIT
+HOST_LIMITS: Dict[str, HostLimit] = {
+    "opentdb.com": HostLimit(rate=0.2, burst=1, max_wait=60.0),  # one request per 5s per IP
+    "api.popcat.xyz": HostLimit(rate=5, burst=10),
+    "coliru.stacked-crooked.com": HostLimit(rate=1, burst=2),
+}
+DEFAULT_HOST_LIMIT = HostLimit(rate=10, burst=20)
+
+
+class UpstreamUnavailable(aiohttp.ClientError):
+    """Raised without touching the network when a host's breaker is open or its queue is too long"""
+
+    def __init__(self, host: str, retry_after: float, reason: str) -> None:
+        super().__init__(f"{host} is unavailable ({reason}), retry in {retry_after:.0f}s")
+        self.host = host
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class TokenBucket:
+    """FIFO token bucket; `pause` empties it for a server-supplied Retry-After"""
+
+    def __init__(self, host: str, limit: HostLimit) -> None:
+        self.host = host
+        self.limit = limit
+        self.tokens = float(limit.burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.waiting = 0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.limit.burst, self.tokens + (now - self.updated) * self.limit.rate)
+        self.updated = now
+
+    def estimated_wait(self) -> float:
+        now = time.monotonic()
+        self._refill(now)
+        deficit = self.waiting + 1 - self.tokens
+        return max(0.0, self.blocked_until - now) + max(0.0, deficit / self.limit.rate)
+
+    async def acquire(self) -> float:
+        """Wait for a token and return how long that took"""
+        wait = self.estimated_wait()
+        if wait > self.limit.max_wait:
+            raise UpstreamUnavailable(self.host, wait, "rate limited")
+
+        started = time.monotonic()
+        self.waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    if now < self.blocked_until:
+                        await asyncio.sleep(self.blocked_until - now)
+                        continue
+                    self._refill(now)
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return time.monotonic() - started
+                    await asyncio.sleep((1 - self.tokens) / self.limit.rate)
+        finally:
+            self.waiting -= 1
+
+    def pause(self, seconds: float) -> None:
+        self.tokens = 0.0
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class CircuitBreaker:
+    """
+    Classic closed -> open -> half-open breaker.
+
+    After `failure_threshold` consecutive failures the host is skipped for
+    `reset_timeout` seconds, then a single probe request decides whether it
+    closes again or stays open for another round.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.trips = 0
+
+    def retry_after(self) -> float:
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        if self.state == self.OPEN:
+            if self.retry_after() > 0:
+                return False
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            if self.probing:
+                return False
+            self.probing = True
+        return True
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+        self.probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.trips += 1
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+        self.probing = False
+
+    def release(self) -> None:
+        """Free the half-open probe slot if its request ended without a verdict (e.g. cancelled)"""
+        self.probing = False
+
+
+@dataclass
+class HostStats:
+    """Request counters and a rolling latency window for a single upstream host"""
+    requests: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    rejected: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    recent: Deque[float] = field(default_factory=lambda: deque(maxlen=256))
+
+    def record(self, latency: float) -> None:
+        self.requests += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.recent.append(latency)
+
+    def record_wait(self, wait: float) -> None:
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.requests if self.requests else 0.0
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.requests if self.requests else 0.0
+
+    def percentile(self, pct: float) -> float:
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _retry_after(value: Optional[str], default: float = 5.0) -> float:
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+class CachedResponse(NamedTuple):
+    status: int
+    data: Any
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    stale_hits: int = 0
+    negative_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.stale_hits + self.negative_hits + self.misses
+
+    @property
+    def hit_ratio(self) -> float:
+        served = self.hits + self.stale_hits + self.negative_hits
+        return served / self.lookups if self.lookups else 0.0
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls that share a key into a single in-flight call.
+
+    The first caller for a key starts the work; anyone arriving before it
+    finishes awaits the same result (or exception) instead of repeating it.
+    The work is shielded, so a cancelled caller doesn't cancel it for the rest.
+    """
+
+    def __init__(self) -> None:
+        self.calls: Dict[Hashable, asyncio.Future] = {}
+        self.started = 0
+        self.shared = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.calls
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        future = self.calls.get(key)
+        if future is not None:
+            self.shared += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(fn())
+        self.calls[key] = future
+        self.started += 1
+        future.add_done_callback(lambda _: self.calls.pop(key, None))
+        return await asyncio.shield(future)
+
+
+class ResponseCache:
+    """
+    Two-tier cache for decoded JSON responses.
+
+    A bounded in-memory LRU sits in front of the `http_cache` table so entries
+    survive restarts. Each entry is fresh until `expires_at`, then served stale
+    (while a refresh runs in the background) until `stale_until`.
+    Cached data is shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, db, max_entries: int = 1024) -> None:
+        self.db = db
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.stats = CacheStats()
+        if db is not None:
+            db.prune_http_cache(time.time())
+
+    def get(self, key: str) -> Optional[tuple]:
+        """Return (status, data, expires_at, stale_until) or None once past the stale window"""
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        elif self.db is not None:
+            row = self.db.get_http_cache(key)
+            if row is not None:
+                status, body, expires_at, stale_until = row
+                entry = (status, json.loads(body), expires_at, stale_until)
+                self._remember(key, entry)
+                self.stats.disk_hits += 1
+
+        if entry is not None and entry[3] < time.time():
+            self.entries.pop(key, None)
+            return None
+        return entry
+
+    def set(self, key: str, status: int, data: Any, ttl: float, stale_ttl: float) -> None:
+        now = time.time()
+        entry = (status, data, now + ttl, now + ttl + stale_ttl)
+        self._remember(key, entry)
+        if self.db is not None:
+            self.db.set_http_cache(key, status, json.dumps(data), entry[2], entry[3])
+
+    def _remember(self, key: str, entry: tuple) -> None:
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+class HTTPClient:
+    """
+    One pooled aiohttp session shared by every plugin.
+
+    Connections are kept alive and reused, DNS lookups are cached and each host
+    gets a bounded number of sockets so one slow API can't starve the others.
+    Requests to a host pass through its token bucket and circuit breaker, so a
+    host that is down or rate limiting us fails fast with `UpstreamUnavailable`.
+    Every request is timed per host; see `stats`.
+    """
+
+    def __init__(
+        self,
+        *,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        dns_ttl: int = 300,
+        keepalive_timeout: float = 30.0,
+        timeout: float = 15.0,
+        connect_timeout: float = 5.0,
+        cache: Optional[ResponseCache] = None,
+        host_limits: Optional[Dict[str, HostLimit]] = None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ) -> None:
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = aiohttp.ClientTimeout(total=timeout, connect=connect_timeout)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.hosts: Dict[str, HostStats] = {}
+        self.host_limits = HOST_LIMITS if host_limits is None else host_limits
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.cache = cache if cache is not None else ResponseCache(None)
+        self.flights = SingleFlight()
+        self._background: Set[asyncio.Task] = set()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The underlying session, created on first use inside the running loop"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self._session
+
+    async def close(self) -> None:
+        for task in list(self._background):
+            task.cancel()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _host(self, url: str) -> str:
+        host = urlsplit(str(url)).hostname or "unknown"
+        if host not in self.hosts:
+            self.hosts[host] = HostStats()
+            self.buckets[host] = TokenBucket(host, self.host_limits.get(host, DEFAULT_HOST_LIMIT))
+            self.breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return host
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, **kwargs: Any) -> AsyncIterator[aiohttp.ClientResponse]:
+        """
+        Send a request through the shared pool and yield the response.
+
+        Latency is measured up to the response headers. 5xx responses, and client
+        errors and timeouts before the headers arrive, are counted against the
+        host and trip its breaker; exceptions raised while the caller handles the
+        response are not. A 429 pauses the host's bucket for the Retry-After the server sent.
+        """
+        host = self._host(url)
+        stats, bucket, breaker = self.hosts[host], self.buckets[host], self.breakers[host]
+        if not breaker.allow():
+            stats.rejected += 1
+            raise UpstreamUnavailable(host, breaker.retry_after(), "circuit open")
+        probe = breaker.state == CircuitBreaker.HALF_OPEN
+
+        try:
+            try:
+                stats.record_wait(await bucket.acquire())
+            except UpstreamUnavailable:
+                stats.rejected += 1
+                raise
+
+            started = time.perf_counter()
+            try:
+                response = await self.session.request(method, url, **kwargs)
+            except asyncio.TimeoutError:
+                stats.timeouts += 1
+                stats.errors += 1
+                breaker.record_failure()
+                raise
+            except aiohttp.ClientError:
+                stats.errors += 1
+                breaker.record_failure()
+                raise
+
+            # Only the request and its headers count against the host; errors the
+            # caller raises while handling the response (raise_for_status on a
+            # 404, a bad JSON body) are the caller's.
+            stats.record(time.perf_counter() - started)
+            if response.status >= 500:
+                stats.errors += 1
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            if response.status == 429:
+                bucket.pause(_retry_after(response.headers.get("Retry-After")))
+            try:
+                yield response
+            finally:
+                response.release()
+        finally:
+            if probe:
+                breaker.release()
+
+    def get(self, url: str, **kwargs: Any):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any):
+        return self.request("POST", url, **kwargs)
+
+    async def get_json(self, url: str, **kwargs: Any) -> Any:
+        """GET a URL and decode the body as JSON, raising on non-2xx statuses"""
+        async with self.get(url, **kwargs) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    async def get_bytes(self, url: str, **kwargs: Any) -> bytes:
+        """GET a URL and return the raw body, raising on non-2xx statuses"""
+        async with self.get(url, **kwargs) as response:
+            response.raise_for_status()
+            return await response.read()
+
+    async def fetch_json(self, url: str, **kwargs: Any) -> CachedResponse:
+        """GET a JSON endpoint without caching; `data` is None unless the status is 200"""
+        async with self.get(url, **kwargs) as response:
+            if response.status == 200:
+                return CachedResponse(response.status, await response.json(content_type=None))
+            return CachedResponse(response.status, None)
+
+    async def fetch_json_shared(self, url: str, **kwargs: Any) -> CachedResponse:
+        """
+        Like `fetch_json`, but concurrent calls for the same URL share one upstream
+        request. Meant for endpoints that are hammered in bursts, where handing
+        every waiter the same result is fine.
+        """
+        return await self.flights.do(("fetch", url), lambda: self.fetch_json(url, **kwargs))
+
+    async def get_json_cached(
+        self,
+        url: str,
+        *,
+        ttl: float,
+        stale_ttl: Optional[float] = None,
+        negative_ttl: Optional[float] = None,
+        **kwargs: Any,
+    ) -> CachedResponse:
+        """
+        GET a JSON endpoint through the response cache.
+
+        200 responses are kept for `ttl` seconds and may then be served stale for
+        another `stale_ttl` seconds while they're refreshed in the background.
+        404s are cached for `negative_ttl` (defaults to `ttl`). Any other status
+        is returned as-is with `data` set to None and never cached.
+        """
+        stale_ttl = ttl if stale_ttl is None else stale_ttl
+        negative_ttl = ttl if negative_ttl is None else negative_ttl
+        key = f"GET {url}"
+        stats = self.cache.stats
+
+        entry = self.cache.get(key)
+        if entry is not None:
+            status, data, expires_at, _ = entry
+            if status == 404:
+                stats.negative_hits += 1
+            elif expires_at > time.time():
+                stats.hits += 1
+            else:
+                stats.stale_hits += 1
+                self._refresh(key, url, ttl, stale_ttl, negative_ttl, kwargs)
+            return CachedResponse(status, data)
+
+        stats.misses += 1
+        return await self.flights.do(
+            ("cache", key), lambda: self._fetch_and_store(key, url, ttl, stale_ttl, negative_ttl, kwargs)
+        )
+
+    async def _fetch_and_store(self, key, url, ttl, stale_ttl, negative_ttl, kwargs) -> CachedResponse:
+        result = await self.fetch_json(url, **kwargs)
+        if result.status == 200:
+            self.cache.set(key, result.status, result.data, ttl, stale_ttl)
+        elif result.status == 404:
+            self.cache.set(key, result.status, None, negative_ttl, 0)
+        return result
+
+    def _refresh(self, key, url, ttl, stale_ttl, negative_ttl, kwargs) -> None:
+        if ("cache", key) in self.flights:
+            return
+
+        async def runner():
+            try:
+                await self.flights.do(
+                    ("cache", key), lambda: self._fetch_and_store(key, url, ttl, stale_ttl, negative_ttl, kwargs)
+                )
+                self.cache.stats.refreshes += 1
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass
+
+        task = asyncio.create_task(runner())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def breaker_states(self) -> Dict[str, str]:
+        return {host: breaker.state for host, breaker in self.breakers.items()}
+
+    def stats(self) -> Dict[str, HostStats]:
+        """Per-host metrics, busiest hosts first"""
+        return dict(sorted(self.hosts.items(), key=lambda item: item[1].requests, reverse=True))
@@ -0,0 +1,211 @@
+"""
+In-process renderer for the text-on-template memes (biden, oogway, pikachu).
+
+Template images live in assets/memes/ and are decoded once, on the render pool
+by their first render; fonts are loaded once per size. Rendering runs on a
+small dedicated thread pool so PIL work never blocks the event loop, and
+finished PNGs are kept in an LRU keyed by (template, hash of the text), so
+repeated requests upload the cached bytes without re-rendering. Concurrent
+requests for the same image share one render. Until the template images are
+added, the Fun cog keeps using popcat's remote render.
+"""
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+from http_client import SingleFlight
+
+TEMPLATE_DIR = os.path.join("assets", "memes")
+FONT_PATH = os.path.join("assets", "arial.ttf")
+MAX_TEXT_LENGTH = 300
+
+
+@dataclass(frozen=True)
+class TextBox:
+    """Where text goes on a template, as fractions of the image size"""
+    left: float
+    top: float
+    width: float
+    height: float
+    fill: Tuple[int, int, int] = (0, 0, 0)
+    stroke: Optional[Tuple[int, int, int]] = None
+    align: str = "left"
+    max_size: int = 64
+    min_size: int = 14
+
+
+@dataclass(frozen=True)
+class MemeLayout:
+    filename: str
+    box: TextBox
+
+
+LAYOUTS: Dict[str, MemeLayout] = {
+    # Tweet screenshot: the tweet body sits under the name/handle header
+    "biden": MemeLayout("biden.png", TextBox(0.04, 0.24, 0.92, 0.42, max_size=56)),
+    # Oogway at his desk: white quote text over the dark upper half
+    "oogway": MemeLayout("oogway.png", TextBox(0.05, 0.05, 0.90, 0.40, fill=(255, 255, 255),
+                                               stroke=(0, 0, 0), align="center")),
+    # Surprised Pikachu: caption on the white band above the frame
+    "pikachu": MemeLayout("pikachu.png", TextBox(0.03, 0.02, 0.94, 0.22, max_size=48)),
+}
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+class MemeRenderer:
+    def __init__(
+        self,
+        template_dir: str = TEMPLATE_DIR,
+        font_path: str = FONT_PATH,
+        *,
+        cache_size: int = 256,
+        workers: int = 2,
+    ) -> None:
+        self.template_dir = template_dir
+        self.font_path = font_path
+        self.cache_size = cache_size
+        self.cache: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="meme-render")
+        self.flights = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.render_time = 0.0
+        self._templates: Dict[str, Image.Image] = {}
+        self._missing: set = set()
+        self._local = threading.local()  # FreeType faces aren't safe to share between render threads
+        self._load_lock = threading.Lock()
+
+    def available(self, name: str) -> bool:
+        """
+        Whether the template image for `name` is installed. Only checks the file
+        is there; it's decoded on the render pool by the first render.
+        """
+        if name not in LAYOUTS or name in self._missing:
+            return False
+        return name in self._templates or os.path.isfile(os.path.join(self.template_dir, LAYOUTS[name].filename))
+
+    def _template(self, name: str) -> Optional[Image.Image]:
+        if name in self._templates:
+            return self._templates[name]
+        if name in self._missing:
+            return None
+        with self._load_lock:
+            if name not in self._templates and name not in self._missing:
+                path = os.path.join(self.template_dir, LAYOUTS[name].filename)
+                try:
+                    with Image.open(path) as image:
+                        self._templates[name] = image.convert("RGB")
+                except OSError:
+                    self._missing.add(name)
+                    return None
+        return self._templates.get(name)
+
+    def _font(self, size: int) -> ImageFont.FreeTypeFont:
+        fonts: Dict[int, ImageFont.FreeTypeFont] = self._local.__dict__.setdefault("fonts", {})
+        font = fonts.get(size)
+        if font is None:
+            try:
+                font = ImageFont.truetype(self.font_path, size)
+            except OSError:
+                font = ImageFont.load_default(size)
+            fonts[size] = font
+        return font
+
+    def _wrap(self, text: str, font: ImageFont.FreeTypeFont, width: int) -> List[str]:
+        lines: List[str] = []
+        for paragraph in text.splitlines() or [""]:
+            line = ""
+            for word in paragraph.split():
+                candidate = f"{line} {word}" if line else word
+                if font.getlength(candidate) <= width:
+                    line = candidate
+                    continue
+                if line:
+                    lines.append(line)
+                # Break words that are wider than the box on their own
+                while font.getlength(word) > width and len(word) > 1:
+                    cut = len(word) - 1
+                    while cut > 1 and font.getlength(word[:cut]) > width:
+                        cut -= 1
+                    lines.append(word[:cut])
+                    word = word[cut:]
+                line = word
+            lines.append(line)
+        return lines
+
+    def _fit(self, text: str, width: int, height: int, box: TextBox) -> Tuple[ImageFont.FreeTypeFont, List[str], int]:
+        """Largest font size whose wrapped text fits the box, stepping down to min_size"""
+        size = box.max_size
+        while True:
+            font = self._font(size)
+            lines = self._wrap(text, font, width)
+            line_height = int(size * 1.2)
+            if len(lines) * line_height <= height or size <= box.min_size:
+                max_lines = max(1, height // line_height)
+                if len(lines) > max_lines:
+                    lines = lines[:max_lines]
+                    lines[-1] = lines[-1].rstrip() + "..."
+                return font, lines, line_height
+            size = max(box.min_size, size - 4)
+
+    def render_sync(self, name: str, text: str) -> bytes:
+        """Draw `text` onto the template and return PNG bytes. Runs on the render pool"""
+        template = self._template(name)
+        if template is None:
+            raise FileNotFoundError(os.path.join(self.template_dir, LAYOUTS[name].filename))
+
+        started = time.perf_counter()
+        box = LAYOUTS[name].box
+        image = template.copy()
+        left, top = int(box.left * image.width), int(box.top * image.height)
+        width, height = int(box.width * image.width), int(box.height * image.height)
+        font, lines, line_height = self._fit(text[:MAX_TEXT_LENGTH], width, height, box)
+
+        draw = ImageDraw.Draw(image)
+        stroke_width = max(1, line_height // 16) if box.stroke else 0
+        for index, line in enumerate(lines):
+            x = left
+            if box.align == "center":
+                x = left + (width - font.getlength(line)) / 2
+            draw.text(
+                (x, top + index * line_height), line, font=font, fill=box.fill,
+                stroke_width=stroke_width, stroke_fill=box.stroke
+            )
+
+        output = BytesIO()
+        image.save(output, format="PNG", optimize=False)
+        self.render_time += time.perf_counter() - started
+        return output.getvalue()
+
+    async def render(self, name: str, text: str) -> bytes:
+        """PNG bytes for `name` with `text`, from the cache or rendered on the pool"""
+        key = (name, text_hash(text))
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        loop = asyncio.get_running_loop()
+        png = await self.flights.do(key, lambda: loop.run_in_executor(self.pool, self.render_sync, name, text))
+        self.cache[key] = png
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return png
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=False, cancel_futures=True)
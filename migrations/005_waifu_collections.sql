@@ -0,0 +1,7 @@
+-- Per-user collection bitsets, one bit per catalog waifu_id
+CREATE TABLE IF NOT EXISTS waifu_collections (
+    user_id INTEGER PRIMARY KEY,
+    owned BLOB NOT NULL,
+    duplicates BLOB NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
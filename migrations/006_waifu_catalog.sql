@@ -0,0 +1,64 @@
+PRAGMA foreign_keys = OFF;
+
+-- Waifu catalog, imported from waifu_list_final.json whenever its hash changes
+CREATE TABLE IF NOT EXISTS waifu_catalog (
+    waifu_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    jp_name TEXT,
+    series TEXT,
+    image_link TEXT,
+    popularity_rank INTEGER,
+    total_likes INTEGER,
+    rarity_score TEXT,
+    rarity_tier TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS catalog_versions (
+    name TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    imported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_waifu_catalog_tier ON waifu_catalog(rarity_tier);
+CREATE INDEX IF NOT EXISTS idx_waifu_catalog_rank ON waifu_catalog(popularity_rank);
+
+-- Rebuild waifu_cards without the name/rank copies; cards join waifu_catalog instead
+CREATE TABLE IF NOT EXISTS waifu_cards_slim (
+    card_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    serial_number TEXT UNIQUE NOT NULL,
+    owner_id INTEGER NOT NULL,
+    waifu_id TEXT NOT NULL,
+    rarity TEXT NOT NULL CHECK(rarity IN ('SS', 'S', 'A', 'B', 'C', 'D')),
+    level INTEGER DEFAULT 1,
+    locked BOOLEAN DEFAULT FALSE,
+    obtained_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_modified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO waifu_cards_slim (
+    card_id, serial_number, owner_id, waifu_id,
+    rarity, level, locked, obtained_at, last_modified_at
+)
+SELECT
+    card_id, serial_number, owner_id, waifu_id,
+    rarity, level, locked, obtained_at, last_modified_at
+FROM waifu_cards;
+
+DROP TABLE waifu_cards;
+ALTER TABLE waifu_cards_slim RENAME TO waifu_cards;
+
+CREATE INDEX IF NOT EXISTS idx_waifu_cards_owner ON waifu_cards(owner_id);
+CREATE INDEX IF NOT EXISTS idx_waifu_cards_serial ON waifu_cards(serial_number);
+CREATE INDEX IF NOT EXISTS idx_waifu_cards_rarity ON waifu_cards(rarity);
+CREATE INDEX IF NOT EXISTS idx_waifu_cards_waifu ON waifu_cards(waifu_id);
+
+CREATE TRIGGER IF NOT EXISTS update_card_modified_time 
+AFTER UPDATE ON waifu_cards
+FOR EACH ROW
+BEGIN
+    UPDATE waifu_cards 
+    SET last_modified_at = CURRENT_TIMESTAMP
+    WHERE card_id = NEW.card_id;
+END;
+
+PRAGMA foreign_keys = ON;
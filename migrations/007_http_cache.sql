@@ -0,0 +1,10 @@
+-- On-disk tier of the shared HTTP response cache
+CREATE TABLE IF NOT EXISTS http_cache (
+    cache_key TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    body TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    stale_until REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_http_cache_stale ON http_cache(stale_until);
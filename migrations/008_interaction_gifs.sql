@@ -0,0 +1,8 @@
+-- Pre-fetched nekos.best results per interaction action, kept across restarts
+CREATE TABLE IF NOT EXISTS interaction_gifs (
+    action TEXT NOT NULL,
+    url TEXT NOT NULL,
+    anime_name TEXT,
+    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (action, url)
+);
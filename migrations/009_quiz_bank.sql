@@ -0,0 +1,22 @@
+-- Persistent OpenTDB question bank, deduplicated by content hash
+CREATE TABLE IF NOT EXISTS quiz_questions (
+    question_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    category TEXT NOT NULL,
+    question_hash TEXT NOT NULL UNIQUE,
+    question TEXT NOT NULL,
+    correct_answer TEXT NOT NULL,
+    incorrect_answers TEXT NOT NULL,
+    difficulty TEXT,
+    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Questions each user has already been asked
+CREATE TABLE IF NOT EXISTS quiz_seen (
+    user_id INTEGER NOT NULL,
+    question_id INTEGER NOT NULL,
+    seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, question_id),
+    FOREIGN KEY (question_id) REFERENCES quiz_questions(question_id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_quiz_questions_category ON quiz_questions(category, question_id);
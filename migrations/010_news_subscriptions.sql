@@ -0,0 +1,10 @@
+-- Channels that receive new BBC articles for a news category
+CREATE TABLE IF NOT EXISTS news_subscriptions (
+    guild_id INTEGER NOT NULL,
+    channel_id INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (channel_id, category)
+);
+
+CREATE INDEX IF NOT EXISTS idx_news_subscriptions_guild ON news_subscriptions(guild_id);
@@ -0,0 +1,63 @@
+-- Full-text index over tag names, aliases and content. rowid is the tag_id;
+-- guild holds 'g<guild_id>' so a search is scoped to one guild inside the index
+CREATE VIRTUAL TABLE IF NOT EXISTS tags_fts USING fts5(
+    name,
+    aliases,
+    content,
+    guild,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS tags_fts_insert
+AFTER INSERT ON tags
+BEGIN
+    INSERT INTO tags_fts (rowid, name, aliases, content, guild)
+    VALUES (NEW.tag_id, NEW.name, '', NEW.content, 'g' || NEW.guild_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS tags_fts_update
+AFTER UPDATE OF name, content ON tags
+BEGIN
+    UPDATE tags_fts SET name = NEW.name, content = NEW.content WHERE rowid = NEW.tag_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS tags_fts_delete
+AFTER DELETE ON tags
+BEGIN
+    DELETE FROM tags_fts WHERE rowid = OLD.tag_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS tags_fts_alias_insert
+AFTER INSERT ON tag_aliases
+BEGIN
+    UPDATE tags_fts SET aliases = (
+        SELECT group_concat(alias_name, ' ') FROM tag_aliases
+        WHERE guild_id = NEW.guild_id AND original_tag_name = NEW.original_tag_name
+    )
+    WHERE rowid = (SELECT tag_id FROM tags WHERE guild_id = NEW.guild_id AND name = NEW.original_tag_name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS tags_fts_alias_delete
+AFTER DELETE ON tag_aliases
+BEGIN
+    UPDATE tags_fts SET aliases = COALESCE((
+        SELECT group_concat(alias_name, ' ') FROM tag_aliases
+        WHERE guild_id = OLD.guild_id AND original_tag_name = OLD.original_tag_name
+    ), '')
+    WHERE rowid = (SELECT tag_id FROM tags WHERE guild_id = OLD.guild_id AND name = OLD.original_tag_name);
+END;
+
+-- Backfill existing tags
+INSERT INTO tags_fts (rowid, name, aliases, content, guild)
+SELECT
+    t.tag_id,
+    t.name,
+    COALESCE((
+        SELECT group_concat(ta.alias_name, ' ') FROM tag_aliases ta
+        WHERE ta.guild_id = t.guild_id AND ta.original_tag_name = t.name
+    ), ''),
+    t.content,
+    'g' || t.guild_id
+FROM tags t
+WHERE t.tag_id NOT IN (SELECT rowid FROM tags_fts);
@@ -0,0 +1,7 @@
+-- Join-burst limits for the welcomer: past max_joins joins within window_seconds,
+-- joins are welcomed with one summary per window instead (max_joins = 0 turns this off)
+CREATE TABLE IF NOT EXISTS welcomer_burst (
+    guild_id INTEGER PRIMARY KEY,
+    max_joins INTEGER NOT NULL DEFAULT 5,
+    window_seconds INTEGER NOT NULL DEFAULT 10
+);
@@ -0,0 +1,8 @@
+-- Per temp VC panel state: the panel version its control message was posted (or last
+-- re-attached) with, and the claim prompt still waiting for an answer, if any
+CREATE TABLE IF NOT EXISTS temp_channel_panels (
+    channel_id INTEGER PRIMARY KEY,
+    panel_version INTEGER NOT NULL DEFAULT 0,
+    claim_message_id INTEGER DEFAULT NULL,
+    FOREIGN KEY (channel_id) REFERENCES temp_channels(channel_id) ON DELETE CASCADE
+);
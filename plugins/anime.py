@@ -1,10 +1,11 @@
 import discord
-import requests
 from utils import PaginationView
 from discord import app_commands
 from discord.ext import commands
 from typing import List, Dict, Any, Optional
 
+SEARCH_CACHE_TTL = 6 * 3600
+
 class Anime(commands.Cog):
     def __init__(
             self, 
@@ -39,10 +40,9 @@ class Anime(commands.Cog):
         complete with artist attribution and profile links."""
         try:
             url: str = "https://nekos.best/api/v2/waifu"
-            response: requests.Response = requests.get(url)
-            data: Dict[str, Any] = response.json()
+            status, data = await self.bot.http_client.fetch_json_shared(url)
             
-            if response.status_code == 200:
+            if status == 200:
                 embed: discord.Embed = discord.Embed(
                     description=f"Drawn by [{data['results'][0]['artist_name']}]({data['results'][0]['artist_href']})",
                     color=discord.Color.dark_grey()
@@ -66,10 +66,9 @@ class Anime(commands.Cog):
         complete with artist attribution and profile links."""
         try:
             url: str = "https://nekos.best/api/v2/neko"
-            response: requests.Response = requests.get(url)
-            data: Dict[str, Any] = response.json()
+            status, data = await self.bot.http_client.fetch_json_shared(url)
             
-            if response.status_code == 200:
+            if status == 200:
                 embed: discord.Embed = discord.Embed(
                     description=f"Drawn by [{data['results'][0]['artist_name']}]({data['results'][0]['artist_href']})",
                     color=discord.Color.dark_grey()
@@ -106,10 +105,9 @@ class Anime(commands.Cog):
         complete with artist attribution and profile links."""
         try:
             url: str = "https://nekos.best/api/v2/husbando"
-            response: requests.Response = requests.get(url)
-            data: Dict[str, Any] = response.json()
+            status, data = await self.bot.http_client.fetch_json_shared(url)
             
-            if response.status_code == 200:
+            if status == 200:
                 embed: discord.Embed = discord.Embed(
                     description=f"Drawn by [{data['results'][0]['artist_name']}]({data['results'][0]['artist_href']})",
                     color=discord.Color.dark_grey()
@@ -149,10 +147,9 @@ class Anime(commands.Cog):
         and media content in a paginated format. Supports partial or complete title search queries."""
         try:
             url: str = f"https://kitsu.io/api/edge/anime?filter[text]={name}"
-            response: requests.Response = requests.get(url)
-            data: Dict[str, Any] = response.json()
+            status, data = await self.bot.http_client.get_json_cached(url, ttl=SEARCH_CACHE_TTL)
             
-            if response.status_code == 200 and data['data']:
+            if status == 200 and data['data']:
                 embeds: List[discord.Embed] = []
                 for anime in data['data']:
                     attr: Dict[str, Any] = anime['attributes']
@@ -1,6 +1,7 @@
 import io
 import discord
 from discord.ext import commands
+import asyncio
 import aiohttp
 
 ADD_BOOKMARK_EMOJI = "🔖"
@@ -10,10 +11,6 @@ class Bookmark(commands.Cog):
     """Message bookmark system for personal reference"""
     def __init__(self, bot):
         self.bot = bot
-        self.session = aiohttp.ClientSession()
-
-    async def cog_unload(self):
-        await self.session.close()
 
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
@@ -88,12 +85,12 @@ class Bookmark(commands.Cog):
                 break
             if embed.image and embed.image.url:
                 try:
-                    async with self.session.get(embed.image.url) as resp:
+                    async with self.bot.http_client.get(embed.image.url) as resp:
                         if resp.status == 200:
                             data = await resp.read()
                             filename = embed.image.url.split("/")[-1].split("?")[0]
                             files.append(discord.File(io.BytesIO(data), filename=filename))
-                except aiohttp.ClientError:
+                except (aiohttp.ClientError, asyncio.TimeoutError):
                     pass
 
     async def _get_files_from_message(self, message):
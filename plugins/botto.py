@@ -16,7 +16,6 @@ from discord.ext import commands
 from datetime import timedelta
 import platform
 import datetime
-import aiohttp
 import random
 from bot import Morgana
 from discord.ext import tasks
@@ -318,6 +317,55 @@ class Botto(commands.Cog):
         except Exception as e:
             await self._handle_error(ctx, e, "sending suggestion")
 
+    @grbt.command(
+        name="http",
+        description="Show latency and error metrics for outgoing API requests"
+    )
+    async def http_stats(self, ctx: commands.Context):
+        if not ctx.author.id == config["owner"]:
+            raise commands.MissingPermissions(["bot_owner"])
+
+        hosts = self.bot.http_client.stats()
+        if not hosts:
+            return await ctx.reply("No outgoing requests have been made yet.")
+
+        breakers = self.bot.http_client.breaker_states()
+        lines = []
+        for host, stats in list(hosts.items())[:20]:
+            lines.append(
+                f"`{host}` [{breakers.get(host, 'closed')}] — {stats.requests} req, {stats.errors} err "
+                f"({stats.timeouts} timeout), {stats.rejected} rejected\n"
+                f"-# avg {stats.mean_latency * 1000:.0f}ms · p50 {stats.percentile(50) * 1000:.0f}ms · "
+                f"p95 {stats.percentile(95) * 1000:.0f}ms · max {stats.max_latency * 1000:.0f}ms · "
+                f"queue avg {stats.mean_wait * 1000:.0f}ms / max {stats.max_wait * 1000:.0f}ms"
+            )
+
+        embed = discord.Embed(
+            title="HTTP Client",
+            description="\n".join(lines),
+            color=discord.Color.dark_grey()
+        )
+
+        cache = self.bot.http_client.cache
+        embed.add_field(
+            name="Response Cache",
+            value=(
+                f"Hit ratio: {cache.stats.hit_ratio:.1%} of {cache.stats.lookups} lookups\n"
+                f"Fresh: {cache.stats.hits} · Stale: {cache.stats.stale_hits} · 404: {cache.stats.negative_hits}\n"
+                f"Misses: {cache.stats.misses} · From disk: {cache.stats.disk_hits} · Refreshes: {cache.stats.refreshes}\n"
+                f"In memory: {len(cache.entries)}/{cache.max_entries}"
+            ),
+            inline=False
+        )
+
+        flights = self.bot.http_client.flights
+        embed.add_field(
+            name="Coalescing",
+            value=f"Upstream calls: {flights.started} · Joined in-flight: {flights.shared} · Running: {len(flights.calls)}",
+            inline=False
+        )
+        await ctx.reply(embed=embed)
+
     @commands.command(name="stats", aliases=["statistics", "about"])
     async def stats_command(self, ctx: commands.Context):
         await self.stats(ctx)
@@ -433,11 +481,10 @@ class Botto(commands.Cog):
         if not ctx.author.id == config["owner"]:
             raise commands.MissingPermissions(["bot_owner"])
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    avatar_bytes = await response.read()
-                    await self.bot.user.edit(avatar=avatar_bytes)
+        async with self.bot.http_client.get(url) as response:
+            if response.status == 200:
+                avatar_bytes = await response.read()
+                await self.bot.user.edit(avatar=avatar_bytes)
 
 
     def load_database_schema(self):
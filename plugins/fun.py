@@ -3,9 +3,9 @@ import discord
 # from Quote2Image import Convert, GenerateColors, ImgObject
 import io
 from bot import Morgana
-import aiohttp
 from discord import app_commands
 from typing import Optional, Dict, Any
+from meme_renderer import MemeRenderer
 
 class Fun(commands.Cog):
 
@@ -14,6 +14,33 @@ class Fun(commands.Cog):
             bot: Morgana
         ) -> None:
         self.bot: Morgana = bot
+        self.memes = MemeRenderer()
+
+    async def cog_unload(self) -> None:
+        self.memes.close()
+
+    async def send_meme(self, ctx: commands.Context, name: str, text: str) -> None:
+        """
+        Render a template meme locally and upload it, falling back to popcat's
+        remote render if the template image isn't installed.
+        """
+        embed = discord.Embed(
+            color=discord.Color.dark_grey()
+        )
+
+        if self.memes.available(name):
+            try:
+                png = await self.memes.render(name, text)
+            except OSError:
+                png = None  # the template file couldn't be decoded; popcat it is
+            if png is not None:
+                embed.set_image(url=f"attachment://{name}.png")
+                await ctx.reply(embed=embed, file=discord.File(io.BytesIO(png), filename=f"{name}.png"))
+                return
+
+        formatted_text = text.replace(" ", "+")
+        embed.set_image(url=f"https://api.popcat.xyz/{name}?text={formatted_text}")
+        await ctx.reply(embed=embed)
 
     @commands.hybrid_group(
         name="fun",
@@ -41,14 +68,13 @@ class Fun(commands.Cog):
         Get a random fact from the internet.
         """
         url: str = "https://uselessfacts.jsph.pl/api/v2/facts/random"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data: Dict[str, Any] = await response.json()
-                    
-                    await ctx.reply(data["text"])
-                else:
-                    await ctx.reply("The Fact API is unavailable at the moment")
+        async with self.bot.http_client.get(url) as response:
+            if response.status == 200:
+                data: Dict[str, Any] = await response.json()
+                
+                await ctx.reply(data["text"])
+            else:
+                await ctx.reply("The Fact API is unavailable at the moment")
 
     @commands.command(
         name="fact",
@@ -75,13 +101,12 @@ class Fun(commands.Cog):
         Get a random joke from the internet.
         """
         url: str = "https://api.popcat.xyz/joke"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data: Dict[str, Any] = await response.json()
-                    await ctx.reply(data["joke"])
-                else:
-                    await ctx.reply("The joke API is unavailable at the moment")
+        async with self.bot.http_client.get(url) as response:
+            if response.status == 200:
+                data: Dict[str, Any] = await response.json()
+                await ctx.reply(data["joke"])
+            else:
+                await ctx.reply("The joke API is unavailable at the moment")
 
     @commands.command(
         name="joke",
@@ -108,13 +133,12 @@ class Fun(commands.Cog):
         Get a random pickup line from the internet.
         """
         url: str = "https://api.popcat.xyz/pickuplines"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data: Dict[str, Any] = await response.json()
-                    await ctx.reply(data["pickupline"])
-                else:
-                    await ctx.reply("The pickup line API is unavailable at the moment")
+        async with self.bot.http_client.get(url) as response:
+            if response.status == 200:
+                data: Dict[str, Any] = await response.json()
+                await ctx.reply(data["pickupline"])
+            else:
+                await ctx.reply("The pickup line API is unavailable at the moment")
 
     @commands.command(
         name="pickupline",
@@ -143,13 +167,12 @@ class Fun(commands.Cog):
         Ask the magic 8-ball a question and get an answer.
         """
         url: str = "https://api.popcat.xyz/8ball"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data: Dict[str, Any] = await response.json()
-                    await ctx.reply(data["answer"])
-                else:
-                    await ctx.reply("The 8-ball API is unavailable at the moment")
+        async with self.bot.http_client.get(url) as response:
+            if response.status == 200:
+                data: Dict[str, Any] = await response.json()
+                await ctx.reply(data["answer"])
+            else:
+                await ctx.reply("The 8-ball API is unavailable at the moment")
 
     @commands.command(
         name="8ball",
@@ -179,17 +202,16 @@ class Fun(commands.Cog):
         Get a random roast from the internet. Optionally mention a user to roast.
         """
         url: str = "https://evilinsult.com/generate_insult.php?lang=en&type=json"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data: Dict[str, Any] = await response.json()
-                    roast_text = data["insult"]
-                    if target:
-                        roast_text = f"{target.mention}, {roast_text}"
-                    
-                    await ctx.reply(roast_text)
-                else:
-                    await ctx.reply("Failed to fetch a roast. Please try again.")
+        async with self.bot.http_client.get(url) as response:
+            if response.status == 200:
+                data: Dict[str, Any] = await response.json()
+                roast_text = data["insult"]
+                if target:
+                    roast_text = f"{target.mention}, {roast_text}"
+                
+                await ctx.reply(roast_text)
+            else:
+                await ctx.reply("Failed to fetch a roast. Please try again.")
 
     @commands.command(
         name="roast",
@@ -213,15 +235,7 @@ class Fun(commands.Cog):
         """
         Generate a Biden meme image with custom text.
         """
-        formatted_text = text.replace(" ", "+")
-        url = f"https://api.popcat.xyz/biden?text={formatted_text}"
-
-        embed = discord.Embed(
-            color=discord.Color.dark_grey()
-        )
-        embed.set_image(url=url)
-
-        await ctx.reply(embed=embed)
+        await self.send_meme(ctx, "biden", text)
 
     @commands.command(
         name="biden",
@@ -242,15 +256,7 @@ class Fun(commands.Cog):
         """
         Generate an Oogway meme image with custom text.
         """
-        formatted_text = text.replace(" ", "+")
-        url = f"https://api.popcat.xyz/oogway?text={formatted_text}"
-
-        embed = discord.Embed(
-            color=discord.Color.dark_grey()
-        )
-        embed.set_image(url=url)
-
-        await ctx.reply(embed=embed)
+        await self.send_meme(ctx, "oogway", text)
 
     @commands.command(
         name="oogway",
@@ -271,15 +277,7 @@ class Fun(commands.Cog):
         """
         Generate a Pikachu meme image with custom text.
         """
-        formatted_text = text.replace(" ", "+")
-        url = f"https://api.popcat.xyz/pikachu?text={formatted_text}"
-
-        embed = discord.Embed(
-            color=discord.Color.dark_grey()
-        )
-        embed.set_image(url=url)
-
-        await ctx.reply(embed=embed)
+        await self.send_meme(ctx, "pikachu", text)
 
     @commands.command(
         name="pikachu",
@@ -303,17 +301,16 @@ class Fun(commands.Cog):
         formatted_text = text.replace(" ", "+")
         url = f"https://api.popcat.xyz/reverse?text={formatted_text}"
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    reversed_text = data.get("text", "Error: No reversed text returned")
-                    
-                    
-                    await ctx.reply(reversed_text)
-                else:   
-                    error_message = "The roast API is unavailable at the moment"
-                    await ctx.reply(error_message)
+        async with self.bot.http_client.get(url) as response:
+            if response.status == 200:
+                data = await response.json()
+                reversed_text = data.get("text", "Error: No reversed text returned")
+                
+                
+                await ctx.reply(reversed_text)
+            else:   
+                error_message = "The roast API is unavailable at the moment"
+                await ctx.reply(error_message)
 
     @commands.command(name="reverse", description="Reverse the given text")
     async def reverse_command(self, ctx: commands.Context, *, text: str):
@@ -334,18 +331,17 @@ class Fun(commands.Cog):
         formatted_text = text.replace(" ", "+")
         url = f"https://api.popcat.xyz/lulcat?text={formatted_text}"
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    lulcat_text = data.get("text", "Error: No lulified text returned")
-                    
-                    
-                    ctx.reply(lulcat_text)
-                else:   
-                    error_message = "The lulify API is unavailable at the moment"
-                    await ctx.reply(error_message)
-                    
+        async with self.bot.http_client.get(url) as response:
+            if response.status == 200:
+                data = await response.json()
+                lulcat_text = data.get("text", "Error: No lulified text returned")
+                
+                
+                ctx.reply(lulcat_text)
+            else:   
+                error_message = "The lulify API is unavailable at the moment"
+                await ctx.reply(error_message)
+                
     @commands.command(name="lulify", description="Translate your text into funny Lul Cat Language! ")
     async def lulify_command(self, ctx: commands.Context, *, text: str):
         """
@@ -431,17 +427,16 @@ class Fun(commands.Cog):
         Get a random meme from the internet.
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get('https://meme-api.com/gimme') as response:
-                    if response.status == 200:
-                        meme_data = await response.json()
-                        meme_title = meme_data['title']
-                        meme_url = meme_data['url']
-                        embed = discord.Embed(description=meme_title, color=discord.Color.from_rgb(195, 238, 250))
-                        embed.set_image(url=meme_url)
-                        await ctx.reply(embed=embed)
-                    else:
-                        await ctx.reply("Failed to fetch a meme. Please try again.")
+            async with self.bot.http_client.get('https://meme-api.com/gimme') as response:
+                if response.status == 200:
+                    meme_data = await response.json()
+                    meme_title = meme_data['title']
+                    meme_url = meme_data['url']
+                    embed = discord.Embed(description=meme_title, color=discord.Color.from_rgb(195, 238, 250))
+                    embed.set_image(url=meme_url)
+                    await ctx.reply(embed=embed)
+                else:
+                    await ctx.reply("Failed to fetch a meme. Please try again.")
         except Exception as e:
             await ctx.reply(f"An error occurred: {e}")
 
@@ -2,9 +2,11 @@ import discord
 from discord import app_commands
 import random
 from discord.ext import commands
-import requests 
 from bot import Morgana
 
+# Scripture doesn't change, so looked-up verses can be kept for a long time
+VERSE_CACHE_TTL = 30 * 24 * 3600
+
 class Holy(commands.Cog):
     def __init__(self, bot: Morgana):
         self.bot = bot
@@ -32,10 +34,9 @@ class Holy(commands.Cog):
         else:
             url = f'https://api.alquran.cloud/v1/ayah/{query}/editions/quran-uthmani,en.pickthall'
         
-        response = requests.get(url)
-        data = response.json()
+        _, data = await self.bot.http_client.get_json_cached(url, ttl=VERSE_CACHE_TTL, negative_ttl=3600)
 
-        if data['code'] != 200:
+        if not data or data['code'] != 200:
             await ctx.reply(f"Could not fetch the verse. Please check the format and try again.")
             return
         
@@ -66,18 +67,21 @@ class Holy(commands.Cog):
             raise commands.BadArgument("Invalid format. Use `bookName chapter:verse` (e.g. John 3:16)")
             
         if query == None:
-            response = requests.get('https://bible-api.com/?random=verse')
+            url = 'https://bible-api.com/?random=verse'
         else:
-            try:
-                response = requests.get(f'https://bible-api.com/{query}')
-            except Exception:
-                await ctx.reply(f"Invalid format. Use `bookName chapter:verse` (e.g. John 3:16)")
-                return
-        
-        data = response.json()
+            url = f'https://bible-api.com/{query}'
+
+        try:
+            if query is None:
+                _, data = await self.bot.http_client.fetch_json(url)
+            else:
+                _, data = await self.bot.http_client.get_json_cached(url, ttl=VERSE_CACHE_TTL, negative_ttl=3600)
+        except Exception:
+            await ctx.reply(f"Invalid format. Use `bookName chapter:verse` (e.g. John 3:16)")
+            return
         
         print(data)
-        if 'text' not in data:
+        if not data or 'text' not in data:
             await ctx.reply(f"Could not fetch the verse. Please check the format and try again.")
             return
         
@@ -1,13 +1,126 @@
 import discord
 from discord.ext import commands
-import requests
+import asyncio
 import random
+import aiohttp
+from collections import deque
+from typing import Deque, Dict, Optional, Set, Tuple
 from data import interaction_data
 from utils import find_member
 
+POOL_SIZE = 20  # nekos.best returns at most 20 results per request
+POOL_LOW_WATER = 5
+
+
+class GifPool:
+    """
+    Ready-to-send nekos.best results for every interaction action.
+
+    Replies take a (url, anime_name) pair from memory; once an action drops
+    below the low-water mark it is topped up in the background with a single
+    `?amount=` request. Pools are written to the database after each refill
+    and on unload so a restart starts warm.
+    """
+
+    def __init__(self, bot: commands.Bot, size: int = POOL_SIZE, low_water: int = POOL_LOW_WATER):
+        self.bot = bot
+        self.size = size
+        self.low_water = low_water
+        self.pools: Dict[str, Deque[Tuple[str, Optional[str]]]] = {
+            action: deque() for action in interaction_data
+        }
+        self.hits = 0
+        self.misses = 0
+        self._tasks: Set[asyncio.Task] = set()
+
+    def load(self) -> None:
+        for action, url, anime_name in self.bot.db.get_interaction_gifs():
+            if action in self.pools:
+                self.pools[action].append((url, anime_name))
+
+    def save(self, action: Optional[str] = None) -> None:
+        for name in ([action] if action else self.pools):
+            self.bot.db.replace_interaction_gifs(name, list(self.pools[name]))
+
+    def take(self, action: str) -> Optional[Tuple[str, Optional[str]]]:
+        """Pop a ready result without touching the network, scheduling a refill when running low"""
+        pool = self.pools[action]
+        result = pool.popleft() if pool else None
+        if result:
+            self.hits += 1
+        else:
+            self.misses += 1
+        if len(pool) < self.low_water:
+            self.schedule_refill(action)
+        return result
+
+    def schedule_refill(self, action: str) -> None:
+        if ("gif-pool", action) in self.bot.http_client.flights:
+            return
+        task = asyncio.create_task(self.refill(action))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def refill(self, action: str) -> None:
+        try:
+            await self.bot.http_client.flights.do(("gif-pool", action), lambda: self._refill(action))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Failed to refill {action} GIF pool: {e}")
+
+    async def _refill(self, action: str) -> None:
+        pool = self.pools[action]
+        missing = self.size - len(pool)
+        if missing <= 0:
+            return
+
+        status, data = await self.bot.http_client.fetch_json(
+            interaction_data[action][0], params={"amount": missing}
+        )
+        if status != 200:
+            return
+
+        seen = {url for url, _ in pool}
+        for result in data.get('results', []):
+            if result.get('url') and result['url'] not in seen:
+                pool.append((result['url'], result.get('anime_name')))
+                seen.add(result['url'])
+        self.save(action)
+
+    def start(self) -> None:
+        """Load the persisted pools and top up any that are low in the background"""
+        self.load()
+        for action, pool in self.pools.items():
+            if len(pool) < self.low_water:
+                self.schedule_refill(action)
+
+    def close(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        self.save()
+
+
 class InteractionsCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.gif_pool = GifPool(bot)
+
+    async def cog_load(self):
+        self.gif_pool.start()
+
+    async def cog_unload(self):
+        self.gif_pool.close()
+
+    async def fetch_gif(self, action: str) -> Optional[Tuple[str, Optional[str]]]:
+        result = self.gif_pool.take(action)
+        if result:
+            return result
+
+        # Cold pool (first start, or nekos.best was down): fall back to a direct,
+        # coalesced fetch while the background refill catches up
+        status, data = await self.bot.http_client.fetch_json_shared(interaction_data[action][0])
+        if status != 200 or not data.get('results'):
+            return None
+        return data['results'][0]['url'], data['results'][0].get('anime_name')
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
@@ -47,20 +160,22 @@ class InteractionsCog(commands.Cog):
                 await message.reply("Couldn't find that user!")
                 return
             
-            response = requests.get(url=interaction_data[command][0])
-            
-            if response.status_code != 200:
+            try:
+                gif = await self.fetch_gif(command)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                gif = None
+            if not gif:
                 await message.reply("Failed to fetch data.")
                 return
 
-            data = response.json()
+            url, anime_name = gif
             txt = random.choice(interaction_data[command][1])
             embed = discord.Embed(
                 description=f"{message.author.mention} {txt} {user.mention}",
                 color=discord.Color.dark_grey()
             )
-            embed.set_image(url=data['results'][0]['url'])
-            embed.set_footer(text=f"Anime: {data['results'][0]['anime_name']}")
+            embed.set_image(url=url)
+            embed.set_footer(text=f"Anime: {anime_name}")
             
             await message.reply(embed=embed)
 
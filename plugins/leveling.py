@@ -33,14 +33,6 @@ class ranking(commands.Cog):
             "xp_color": "5865f2",
             "circle_avatar": True
         }
-        self.level_up_channels = {}
-        self.load_level_channels()
-
-    def load_level_channels(self):
-        for guild in self.bot.guilds:
-            channel_id = self.bot.db.get_levelup_channel(guild.id)
-            if channel_id:
-                self.level_up_channels[guild.id] = channel_id
 
     def get_user_data(self, guild_id: int, user_id: int) -> dict:
         xp, level, last_xp = self.bot.db.get_user_level_data(guild_id, user_id)
@@ -79,10 +71,9 @@ class ranking(commands.Cog):
         old_level, new_level, leveled_up = await self.update_user_data(guild_id, user_id, xp_gained)
         
         if leveled_up:
-            level_up_channel = None
-            if guild_id in self.level_up_channels:
-                level_up_channel = message.guild.get_channel(self.level_up_channels[guild_id])
-
+            channel_id = self.bot.db.get_guild_config(guild_id).levelup_channel_id
+            level_up_channel = message.guild.get_channel(channel_id) if channel_id else None
+            if level_up_channel:
                 await level_up_channel.send(
                     f"Congratulations {message.author.mention}! You've reached level {new_level}!"
                 )
@@ -361,12 +352,8 @@ class ranking(commands.Cog):
         self.bot.db.set_levelup_channel(ctx.guild.id, channel.id if channel else None)
         
         if channel:
-            # Update cache
-            self.level_up_channels[ctx.guild.id] = channel.id
             await ctx.reply(f"Level up messages will now be sent to {channel.mention}!")
         else:
-            # Remove from cache
-            self.level_up_channels.pop(ctx.guild.id, None)
             await ctx.reply("Level up messages is now disabled.")
 
     @commands.command(name="leaderboard", aliases=["lb", "top"])
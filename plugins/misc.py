@@ -5,7 +5,6 @@ import asyncio
 import datetime
 import time
 import io
-import aiohttp
 import re
 from lxml import etree
 import urllib
@@ -13,13 +12,75 @@ from discord import app_commands
 from typing import Optional, List, Literal, Union, Dict, Any
 from utils import PaginationView
 import random
-import requests
 import json
 import unicodedata
 import os
-from libgen_api_enhanced import LibgenSearch
-import functools
-from concurrent.futures import ThreadPoolExecutor
+import difflib
+from collections.abc import Sequence
+from book_search import BookSearch, BookSearchBusy
+
+# How long upstream lookups are served from the response cache, in seconds
+URBAN_CACHE_TTL = 3600
+IMDB_CACHE_TTL = 24 * 3600
+DEFINE_CACHE_TTL = 7 * 24 * 3600
+LYRICS_CACHE_TTL = 7 * 24 * 3600
+# Give up on (and cancel, if still queued) a book search after this long
+BOOK_SEARCH_TIMEOUT = 60
+
+ELEMENTS_PATH = os.path.join("assets", "periodic_table.json")
+ELEMENT_ALIASES = {"aluminum": "aluminium", "cesium": "caesium", "sulphur": "sulfur"}
+
+
+class ElementIndex:
+    """The bundled periodic table, loaded on first use and indexed by symbol, name and atomic number"""
+
+    def __init__(self, path: str = ELEMENTS_PATH):
+        self.path = path
+        self._elements: Optional[List[Dict[str, Any]]] = None
+        self._by_key: Dict[str, Dict[str, Any]] = {}
+        self._names: List[str] = []
+
+    @property
+    def elements(self) -> List[Dict[str, Any]]:
+        if self._elements is None:
+            with open(self.path, encoding="utf-8") as f:
+                elements = json.load(f)
+            for element in elements:
+                self._by_key[str(element["atomic_number"])] = element
+                self._by_key[element["symbol"].lower()] = element
+                self._by_key[element["name"].lower()] = element
+            for alias, name in ELEMENT_ALIASES.items():
+                self._by_key[alias] = self._by_key[name]
+            self._names = [element["name"].lower() for element in elements] + list(ELEMENT_ALIASES)
+            self._elements = elements
+        return self._elements
+
+    def lookup(self, query: str) -> Optional[Dict[str, Any]]:
+        """Exact symbol, name or atomic number, falling back to the closest name for typos"""
+        self.elements  # load on first use
+        key = query.strip().lower()
+        element = self._by_key.get(key)
+        if element is None:
+            matches = difflib.get_close_matches(key, self._names, n=1, cutoff=0.6)
+            element = self._by_key[matches[0]] if matches else None
+        return element
+
+    def search(self, current: str, limit: int = 25) -> List[Dict[str, Any]]:
+        """Autocomplete candidates: symbol/number/name prefix matches first, then substrings"""
+        current = current.strip().lower()
+        if not current:
+            return self.elements[:limit]
+        prefix, contains = [], []
+        for element in self.elements:
+            name = element["name"].lower()
+            if element["symbol"].lower() == current or str(element["atomic_number"]) == current or name.startswith(current):
+                prefix.append(element)
+            elif current in name:
+                contains.append(element)
+        return (prefix + contains)[:limit]
+
+    def random(self) -> Dict[str, Any]:
+        return random.choice(self.elements)
 
 
 class CodeBlock:
@@ -60,10 +121,73 @@ class CodeBlock:
             raise commands.BadArgument(fmt) from e
         
         
+class BookEmbeds(Sequence):
+    """Book search results as a lazy sequence of embeds, built and memoized per page"""
+
+    def __init__(self, results: List[Dict[str, Any]]):
+        self.results = results
+        self._embeds: Dict[int, discord.Embed] = {}
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __getitem__(self, index: int) -> discord.Embed:
+        if index < 0:
+            index += len(self.results)
+        embed = self._embeds.get(index)
+        if embed is None:
+            embed = self._embeds[index] = self.create_embed(self.results[index])
+        return embed
+
+    @staticmethod
+    def create_embed(book: Dict[str, Any]) -> discord.Embed:
+        embed = discord.Embed(
+            title=f"{book.get('Title', 'Unknown Title')}",
+            description=f"**By** {book.get('Author', 'Unknown')}\n**Published by** {book.get('Publisher', 'Unknown')}",
+            color=discord.Color.dark_blue()
+        )
+        
+        cover_url = book.get('Cover')
+        if cover_url: embed.set_image(url=cover_url)
+        
+        metadata = {
+            "Year": book.get("Year", "Unknown"),
+            "Language": book.get("Language", "Unknown"),
+            "Pages": book.get("Pages", "Unknown"),
+            "Size": book.get("Size", "Unknown"),
+            "Format": book.get("Extension", "Unknown"),
+            "ID": book.get("ID", "Unknown")
+        }
+        embed.description += f'\n\n{metadata["Year"]} | {metadata["Language"]} | {metadata["Pages"]} pages | {metadata["Size"]} | {metadata["Format"]}'
+        
+        download_links = ""
+        
+        direct_link = book.get("Direct_Download_Link")
+        if direct_link:
+            download_links += f"[__↓ Direct Download__]({direct_link})\n"
+                    
+        mirror_links = []
+        for i in range(1, 6):
+            mirror_key = f"Mirror_{i}"
+            if mirror_key in book and book[mirror_key]:
+                mirror_links.append(f"[Mirror {i}]({book[mirror_key]})")
+        
+        if mirror_links:
+            download_links += " | ".join(mirror_links)
+        
+        if download_links:
+            embed.description += f"\n\n{download_links}"
+        return embed
+
+
 class Misc(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self._executor = ThreadPoolExecutor(max_workers=2)
+        self.books = BookSearch()
+        self.elements = ElementIndex()
+
+    async def cog_unload(self):
+        self.books.close()
 
     @commands.hybrid_group(name="misc")
     async def misc(self, ctx: commands.Context):
@@ -85,37 +209,40 @@ class Misc(commands.Cog):
         
         This command provides detailed data about elements from the periodic table,
         including physical properties, atomic characteristics, historical discovery
-        information, and a brief scientific summary. When used without specifying
+        information, and its classification. When used without specifying
         an element, it returns information about a randomly selected element for
         educational exploration.
         """
-        async with aiohttp.ClientSession() as session:
-            if query:
-                url = f"https://api.popcat.xyz/periodic-table?element={query}"
-            else:
-                url = "https://api.popcat.xyz/periodic-table/random"
-
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                                        
-                    embed = discord.Embed(
-                        title=f"{data['name']}", 
-                        description=(
-                            f"- **Symbol**: {data['symbol']}\n" +
-                            f"- **Atomic Number**: {data['atomic_number']}\n" +
-                            f"- **Atomic Mass**: {data['atomic_mass']}\n" +
-                            f"- **Period**: {data['period']}\n" +
-                            f"- **Phase**: {data['phase']}\n" +
-                            f"- **Discovered By**: {data['discovered_by']}\n" +
-                            f"- **Element Summary:**\n  - {data['summary']}"
-                        ),
-                        color=discord.Color.dark_grey()
-                    )
-                    embed.set_thumbnail(url=data['image'])
-                    await ctx.reply(embed=embed)
-                else:
-                    await ctx.reply("Failed to fetch element data. Please try again.")
+        data = self.elements.lookup(query) if query else self.elements.random()
+        if data is None:
+            return await ctx.reply(f"No element matches `{query}`.")
+
+        if data['year_discovered']:
+            discovered = f"{data['discovered_by']} ({data['year_discovered']})"
+        else:
+            discovered = "Known since antiquity"
+        embed = discord.Embed(
+            title=f"{data['name']}", 
+            description=(
+                f"- **Symbol**: {data['symbol']}\n" +
+                f"- **Atomic Number**: {data['atomic_number']}\n" +
+                f"- **Atomic Mass**: {data['atomic_mass']}\n" +
+                f"- **Period**: {data['period']}\n" +
+                f"- **Group**: {data['group'] or 'f-block'}\n" +
+                f"- **Category**: {data['category']}\n" +
+                f"- **Phase**: {data['phase']}\n" +
+                f"- **Discovered By**: {discovered}"
+            ),
+            color=discord.Color.dark_grey()
+        )
+        await ctx.reply(embed=embed)
+
+    @periodic_table.autocomplete("query")
+    async def periodic_table_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        return [
+            app_commands.Choice(name=f"{element['atomic_number']}. {element['name']} ({element['symbol']})", value=element['name'])
+            for element in self.elements.search(current)
+        ]
 
     @commands.command(name="periodic-table", aliases=["pt", "element"], description="Get information about an element from the periodic table")
     async def periodic_table_command(self, ctx: commands.Context, *, query: Optional[str] = None):
@@ -123,7 +250,7 @@ class Misc(commands.Cog):
         
         This command provides detailed data about elements from the periodic table,
         including physical properties, atomic characteristics, historical discovery
-        information, and a brief scientific summary. When used without specifying
+        information, and its classification. When used without specifying
         an element, it returns information about a randomly selected element for
         educational exploration.
         """
@@ -139,45 +266,43 @@ class Misc(commands.Cog):
         the definition, usage examples, and community ratings. The interactive display
         allows browsing through multiple definition entries when available.
         """
-        async with aiohttp.ClientSession() as session:
-            url = f"https://api.urbandictionary.com/v0/define?term={word}"
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    definitions = data.get('list', [])
-                    
-                    if not definitions:
-                        await ctx.reply(f"No definitions found for '{word}'.")
-                        return
-                    embeds = []
-                    for index, entry in enumerate(definitions, start=1):
-                        definition = entry['definition'][:2048]
-                        example = entry['example'][:1024]
-                        
-                        
-                        def process_text(text):
-                            return re.sub(r'\[([^\]]+)\]', lambda m: f"[{m.group(1)}](https://www.urbandictionary.com/define.php?term={m.group(1).replace(' ', '%20')})", text)
-                        
-                        definition = process_text(definition)
-                        example = process_text(example)
-                        
-                        embed = discord.Embed(
-                            title=f"{word.capitalize()} {index}/{len(definitions)}",
-                            description=definition,
-                            color=discord.Color.dark_grey()
-                        )
-                        embed.url = entry['permalink']
-                        embed.add_field(name="Example", value=example or "N/A", inline=False)
-                        embed.add_field(name="Author", value=entry['author'], inline=True)
-                        embed.add_field(name="Likes", value=entry['thumbs_up'], inline=True)
-                        embed.add_field(name="Dislikes", value=entry['thumbs_down'], inline=True)
-                        embed.set_footer(text=f"Definition ID: {entry['defid']}")
-                        embeds.append(embed)
-
-                    paginator = PaginationView(embeds, ctx.author)
-                    await ctx.reply(embed=embeds[0], view=paginator)
-                else:
-                    await ctx.reply("Failed to fetch data from Urban Dictionary. Please try again.")
+        url = f"https://api.urbandictionary.com/v0/define?term={word}"
+        status, data = await self.bot.http_client.get_json_cached(url, ttl=URBAN_CACHE_TTL)
+        if status == 200:
+            definitions = data.get('list', [])
+            
+            if not definitions:
+                await ctx.reply(f"No definitions found for '{word}'.")
+                return
+            embeds = []
+            for index, entry in enumerate(definitions, start=1):
+                definition = entry['definition'][:2048]
+                example = entry['example'][:1024]
+                
+                
+                def process_text(text):
+                    return re.sub(r'\[([^\]]+)\]', lambda m: f"[{m.group(1)}](https://www.urbandictionary.com/define.php?term={m.group(1).replace(' ', '%20')})", text)
+                
+                definition = process_text(definition)
+                example = process_text(example)
+                
+                embed = discord.Embed(
+                    title=f"{word.capitalize()} {index}/{len(definitions)}",
+                    description=definition,
+                    color=discord.Color.dark_grey()
+                )
+                embed.url = entry['permalink']
+                embed.add_field(name="Example", value=example or "N/A", inline=False)
+                embed.add_field(name="Author", value=entry['author'], inline=True)
+                embed.add_field(name="Likes", value=entry['thumbs_up'], inline=True)
+                embed.add_field(name="Dislikes", value=entry['thumbs_down'], inline=True)
+                embed.set_footer(text=f"Definition ID: {entry['defid']}")
+                embeds.append(embed)
+
+            paginator = PaginationView(embeds, ctx.author)
+            await ctx.reply(embed=embeds[0], view=paginator)
+        else:
+            await ctx.reply("Failed to fetch data from Urban Dictionary. Please try again.")
 
     @commands.command(name="urbandictionary", aliases=["urban", "ud", "urbandict"], description="Get definitions from Urban Dictionary")
     async def ud_command(self, ctx: commands.Context, *, word: str):
@@ -206,44 +331,42 @@ class Misc(commands.Cog):
     async def imdb(self, ctx: Union[commands.Context, discord.Interaction], title: str):
         url = f"https://api.popcat.xyz/imdb?q={urllib.parse.quote(title)}"
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    embed = discord.Embed(
-                        title=f"{data['title']} ({data['year']})",
-                        description=data['plot'],
-                        color=discord.Color.gold(),
-                        url=data['imdburl']
-                    )
-                    
-                    embed.set_thumbnail(url=data['poster'])
-                    
-                    embed.add_field(name="Rating", value=f"{data['rating']}/10", inline=True)
-                    embed.add_field(name="Runtime", value=data['runtime'], inline=True)
-                    embed.add_field(name="Genres", value=data['genres'], inline=True)
-                    
-                    embed.add_field(name="Director", value=data['director'], inline=True)
-                    embed.add_field(name="Actors", value=data['actors'], inline=True)
-                    
-                    ratings = "\n".join([f"{rating['source']}: {rating['value']}" for rating in data['ratings']])
-                    embed.add_field(name="Ratings", value=ratings, inline=False)
-                    
-                    embed.add_field(name="Awards", value=data['awards'], inline=False)
-                    
-                    embed.set_footer(text=f"IMDb ID: {data['imdbid']} | Type: {data['type'].capitalize()}")
-                    
-                    if isinstance(ctx, discord.Interaction):
-                        await ctx.followup.send(embed=embed)
-                    else:
-                        await ctx.reply(embed=embed)
-                else:
-                    error_message = "Failed to fetch data from IMDb. Please try again."
-                    if isinstance(ctx, discord.Interaction):
-                        await ctx.followup.send(error_message)
-                    else:
-                        await ctx.reply(error_message)
+        status, data = await self.bot.http_client.get_json_cached(url, ttl=IMDB_CACHE_TTL)
+        if status == 200:
+            
+            embed = discord.Embed(
+                title=f"{data['title']} ({data['year']})",
+                description=data['plot'],
+                color=discord.Color.gold(),
+                url=data['imdburl']
+            )
+            
+            embed.set_thumbnail(url=data['poster'])
+            
+            embed.add_field(name="Rating", value=f"{data['rating']}/10", inline=True)
+            embed.add_field(name="Runtime", value=data['runtime'], inline=True)
+            embed.add_field(name="Genres", value=data['genres'], inline=True)
+            
+            embed.add_field(name="Director", value=data['director'], inline=True)
+            embed.add_field(name="Actors", value=data['actors'], inline=True)
+            
+            ratings = "\n".join([f"{rating['source']}: {rating['value']}" for rating in data['ratings']])
+            embed.add_field(name="Ratings", value=ratings, inline=False)
+            
+            embed.add_field(name="Awards", value=data['awards'], inline=False)
+            
+            embed.set_footer(text=f"IMDb ID: {data['imdbid']} | Type: {data['type'].capitalize()}")
+            
+            if isinstance(ctx, discord.Interaction):
+                await ctx.followup.send(embed=embed)
+            else:
+                await ctx.reply(embed=embed)
+        else:
+            error_message = "Failed to fetch data from IMDb. Please try again."
+            if isinstance(ctx, discord.Interaction):
+                await ctx.followup.send(error_message)
+            else:
+                await ctx.reply(error_message)
 
     @commands.command(name="imdb", description="Get information about a movie or TV show from IMDb")
     async def imdb_slash(self, ctx:commands.Context, title: str):
@@ -266,42 +389,40 @@ class Misc(commands.Cog):
         """
         url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data and isinstance(data, list) and len(data) > 0:
-                        word_data = data[0]
-                        embed = discord.Embed(title=f"Definition of '{word_data['word']}'", color=discord.Color.dark_grey())
-                        
-                        if 'phonetic' in word_data:
-                            embed.add_field(name="Phonetic", value=word_data['phonetic'], inline=False)
-                        
-                        for meaning in word_data.get('meanings', []):
-                            part_of_speech = meaning.get('partOfSpeech', 'Unknown')
-                            definitions = meaning.get('definitions', [])
-                            if definitions:
-                                definition_text = definitions[0].get('definition', 'No definition available')
-                                example = definitions[0].get('example', '')
-                                field_value = f"{definition_text}\n\n*Example:* {example}" if example else definition_text
-                                embed.add_field(name=part_of_speech.capitalize(), value=field_value, inline=False)
-                        
-                        if isinstance(ctx, discord.Interaction):
-                            await ctx.response.send_message(embed=embed)
-                        else:
-                            await ctx.reply(embed=embed)
-                    else:
-                        error_message = f"No definition found for '{word}'."
-                        if isinstance(ctx, discord.Interaction):
-                            await ctx.response.send_message(error_message, ephemeral=True)
-                        else:
-                            await ctx.reply(error_message)
+        status, data = await self.bot.http_client.get_json_cached(url, ttl=DEFINE_CACHE_TTL)
+        if status == 200:
+            if data and isinstance(data, list) and len(data) > 0:
+                word_data = data[0]
+                embed = discord.Embed(title=f"Definition of '{word_data['word']}'", color=discord.Color.dark_grey())
+                
+                if 'phonetic' in word_data:
+                    embed.add_field(name="Phonetic", value=word_data['phonetic'], inline=False)
+                
+                for meaning in word_data.get('meanings', []):
+                    part_of_speech = meaning.get('partOfSpeech', 'Unknown')
+                    definitions = meaning.get('definitions', [])
+                    if definitions:
+                        definition_text = definitions[0].get('definition', 'No definition available')
+                        example = definitions[0].get('example', '')
+                        field_value = f"{definition_text}\n\n*Example:* {example}" if example else definition_text
+                        embed.add_field(name=part_of_speech.capitalize(), value=field_value, inline=False)
+                
+                if isinstance(ctx, discord.Interaction):
+                    await ctx.response.send_message(embed=embed)
                 else:
-                    error_message = f"Failed to fetch definition for '{word}'. Please try again."
-                    if isinstance(ctx, discord.Interaction):
-                        await ctx.response.send_message(error_message, ephemeral=True)
-                    else:
-                        await ctx.reply(error_message)
+                    await ctx.reply(embed=embed)
+            else:
+                error_message = f"No definition found for '{word}'."
+                if isinstance(ctx, discord.Interaction):
+                    await ctx.response.send_message(error_message, ephemeral=True)
+                else:
+                    await ctx.reply(error_message)
+        else:
+            error_message = f"Failed to fetch definition for '{word}'. Please try again."
+            if isinstance(ctx, discord.Interaction):
+                await ctx.response.send_message(error_message, ephemeral=True)
+            else:
+                await ctx.reply(error_message)
 
     @commands.command(name="define", description="Get the definition of a word")
     async def define_command(self, ctx: commands.Context, word: str):
@@ -329,13 +450,10 @@ class Misc(commands.Cog):
         api_url = f"https://api.popcat.xyz/lyrics?song={formatted_query}"
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(api_url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                    else:
-                        await ctx.reply(f"Error fetching lyrics. Status code: {response.status}")
-                        return
+            status, data = await self.bot.http_client.get_json_cached(api_url, ttl=LYRICS_CACHE_TTL)
+            if status != 200:
+                await ctx.reply(f"Error fetching lyrics. Status code: {status}")
+                return
         except Exception as e:
             await ctx.reply(f"An error occurred: {str(e)}")
             return
@@ -430,14 +548,9 @@ class Misc(commands.Cog):
         if year: filters["Year"] = year
             
         try:
-            if filters:
-                results = await self._run_in_executor(
-                    self._search_books_filtered, "title", clean_query, filters
-                )
-            else:
-                results = await self._run_in_executor(
-                    self._search_books, "title", clean_query
-                )
+            results = await self._find_books(ctx, "title", clean_query, filters)
+            if results is None:
+                return
             
             # If no results found, try to find common misspellings
             if not results:
@@ -447,9 +560,7 @@ class Misc(commands.Cog):
                 # Try up to 2 alternative spellings
                 for alt_query in alternative_queries[:2]:
                     
-                    alt_results = await self._run_in_executor(
-                        self._search_books, "title", alt_query
-                    )
+                    alt_results = await self.books.search("title", alt_query)
                     
                     if alt_results:
                         alternative_results.append((alt_query, alt_results))
@@ -498,15 +609,9 @@ class Misc(commands.Cog):
         if year: filters["Year"] = year
             
         try:
-            # Run the potentially slow network operation in a thread pool
-            if filters:
-                results = await self._run_in_executor(
-                    self._search_books_filtered, "author", clean_author, filters
-                )
-            else:
-                results = await self._run_in_executor(
-                    self._search_books, "author", clean_author
-                )
+            results = await self._find_books(ctx, "author", clean_author, filters)
+            if results is None:
+                return
                 
             await self._send_book_results(ctx, results, f"Author: {clean_author}")
         except Exception as e:
@@ -558,13 +663,9 @@ class Misc(commands.Cog):
         if pages: filters["Pages"] = pages
             
         try:
-            results = await self._run_in_executor(
-                self._search_books_filtered, 
-                search_type, 
-                clean_query, 
-                filters,
-                exact_match
-            )
+            results = await self._find_books(ctx, search_type, clean_query, filters, exact_match)
+            if results is None:
+                return
                 
             await self._send_book_results(ctx, results, f"Advanced search: {clean_query}")
         except Exception as e:
@@ -602,109 +703,34 @@ class Misc(commands.Cog):
         if extension: filters["Extension"] = extension
         if language: filters["Language"] = language
             
-        if filters:
-            results = await self._run_in_executor(
-                self._search_books_filtered, "default", clean_query, filters
-            )
-        else:
-            results = await self._run_in_executor(
-                self._search_books, "default", clean_query
-            )
+        results = await self._find_books(ctx, "default", clean_query, filters)
+        if results is None:
+            return
             
         await self._send_book_results(ctx, results, f"General search: {clean_query}")
 
-    async def _run_in_executor(self, func, *args, **kwargs):
-        """Run a blocking function in a thread pool executor"""
-        return await self.bot.loop.run_in_executor(
-            self._executor, 
-            functools.partial(func, *args, **kwargs)
-        )
-    
-    def _search_books(self, search_type: str, query: str) -> List[Dict[str, Any]]:
-        """Search for books by title, author, or default"""
-        searcher = LibgenSearch()
-        try:
-            if search_type == "title":
-                return searcher.search_title(query)
-            elif search_type == "author":
-                return searcher.search_author(query)
-            else: 
-                return searcher.search_default(query)
-        except json.JSONDecodeError as e:
-            print(f"JSON decode error in _search_books: {str(e)}")
-            print(f"Query was: {query}, search_type: {search_type}")
-            # Return empty list on JSON error
-            return []
-        except Exception as e:
-            print(f"Error in _search_books: {str(e)}")
-            return []
-    
-    def _search_books_filtered(
-        self, 
-        search_type: str, 
-        query: str, 
+    async def _find_books(
+        self,
+        ctx: commands.Context,
+        search_type: str,
+        query: str,
         filters: Dict[str, str],
         exact_match: bool = True
-    ) -> List[Dict[str, Any]]:
-        """Search for books with filters by title or author"""
-        searcher = LibgenSearch()
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Search through the shared book search service, replying and returning None if it fails"""
         try:
-            # Make a copy of filters and replace "extension" with the parameter
-            # that LibgenSearch actually accepts (likely "Extension")
-            clean_filters = {}
-            for key, value in filters.items():
-                if key.lower() == "extension":
-                    clean_filters["Extension"] = value
-                else:
-                    clean_filters[key] = value
-            
-            if search_type == "title":
-                return searcher.search_title_filtered(query, clean_filters, exact_match)
-            elif search_type == "author":
-                return searcher.search_author_filtered(query, clean_filters, exact_match)
-            else:
-                # Enhanced library doesn't have filtered default search, 
-                # so we'll get results and filter them manually
-                results = searcher.search_default(query)
-                return self._filter_results(results, clean_filters, exact_match)
-        except json.JSONDecodeError as e:
-            print(f"JSON decode error in _search_books_filtered: {str(e)}")
-            print(f"Query was: {query}, search_type: {search_type}")
-            print(f"Filters: {filters}")
-            # Return empty list on JSON error
-            return []
+            return await asyncio.wait_for(
+                self.books.search(search_type, query, filters, exact_match),
+                timeout=BOOK_SEARCH_TIMEOUT
+            )
+        except BookSearchBusy:
+            await ctx.reply("Too many book searches are running right now. Please try again in a moment.")
+        except asyncio.TimeoutError:
+            await ctx.reply("The book search took too long. Please try again later.")
         except Exception as e:
-            print(f"Error in _search_books_filtered: {str(e)}")
-            return []
-    
-    def _filter_results(
-        self, 
-        results: List[Dict[str, Any]], 
-        filters: Dict[str, str],
-        exact_match: bool = True
-    ) -> List[Dict[str, Any]]:
-        """Filter results based on the provided filters"""
-        filtered_results = []
-        
-        for result in results:
-            matches_all_filters = True
-            
-            for filter_key, filter_value in filters.items():
-                result_value = result.get(filter_key, "")
-                
-                if exact_match:
-                    if result_value != filter_value:
-                        matches_all_filters = False
-                        break
-                else:
-                    if filter_value.lower() not in result_value.lower():
-                        matches_all_filters = False
-                        break
-                        
-            if matches_all_filters:
-                filtered_results.append(result)
-                
-        return filtered_results
+            print(f"Error searching books ({search_type}: {query}): {e}")
+            await ctx.reply("An error occurred while searching for books. Please try again later.")
+        return None
     
     def _find_similar_titles(self, query: str) -> List[str]:
         """Find similar book titles that might match a misspelled query"""
@@ -712,55 +738,12 @@ class Misc(commands.Cog):
     
 
     async def _send_book_results(self, ctx: commands.Context, results: List[Dict[str, Any]], query_info: str):
-        """Format and send book search results"""
+        """Send book search results, building each page's embed only when it is first shown"""
         if not results:
             await ctx.reply(f"No books found for '{query_info}'.")
             return
             
-        results = results[:25]
-        embeds = []
-        
-        for idx, book in enumerate(results, 1):
-            embed = discord.Embed(
-                title=f"{book.get('Title', 'Unknown Title')}",
-                description=f"**By** {book.get('Author', 'Unknown')}\n**Published by** {book.get('Publisher', 'Unknown')}",
-                color=discord.Color.dark_blue()
-            )
-            
-            cover_url = book.get('Cover')
-            if cover_url: embed.set_image(url=cover_url)
-            
-            metadata = {
-                "Year": book.get("Year", "Unknown"),
-                "Language": book.get("Language", "Unknown"),
-                "Pages": book.get("Pages", "Unknown"),
-                "Size": book.get("Size", "Unknown"),
-                "Format": book.get("Extension", "Unknown"),
-                "ID": book.get("ID", "Unknown")
-            }
-            embed.description += f'\n\n{metadata["Year"]} | {metadata["Language"]} | {metadata["Pages"]} pages | {metadata["Size"]} | {metadata["Format"]}'
-            
-            download_links = ""
-            
-            direct_link = book.get("Direct_Download_Link")
-            if direct_link:
-                download_links += f"[__↓ Direct Download__]({direct_link})\n"
-                        
-            mirror_links = []
-            for i in range(1, 6):
-                mirror_key = f"Mirror_{i}"
-                if mirror_key in book and book[mirror_key]:
-                    mirror_links.append(f"[Mirror {i}]({book[mirror_key]})")
-            
-            if mirror_links:
-                download_links += " | ".join(mirror_links)
-            
-            if download_links:
-                embed.description += f"\n\n{download_links}"
-            
-            embed.set_footer(text=f"Result {idx}/{len(results)} for search: {query_info}")
-            embeds.append(embed)
-    
+        embeds = BookEmbeds(results)
         paginator = PaginationView(embeds, ctx.author)
         await ctx.reply(embed=embeds[0], view=paginator)
 
@@ -818,46 +801,45 @@ class Misc(commands.Cog):
             'Connection': 'keep-alive',
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, params=params) as resp:
-                if resp.status != 200:
-                    return await ctx.reply(f'An error occurred (status code: {resp.status}). Retry later.')
-
-                if resp.url.path != '/mwiki/index.php':
-                    return await ctx.reply(f'<{resp.url}>')
+        async with self.bot.http_client.get(url, headers=headers, params=params) as resp:
+            if resp.status != 200:
+                return await ctx.reply(f'An error occurred (status code: {resp.status}). Retry later.')
 
-                e = discord.Embed(color=discord.Colour.dark_grey())
-                root = etree.fromstring(await resp.text(), etree.HTMLParser())
+            if resp.url.path != '/mwiki/index.php':
+                return await ctx.reply(f'<{resp.url}>')
 
-                nodes = root.findall(".//div[@class='mw-search-result-heading']/a")
+            e = discord.Embed(color=discord.Colour.dark_grey())
+            root = etree.fromstring(await resp.text(), etree.HTMLParser())
 
-                description = []
-                special_pages = []
-                for node in nodes:
-                    href = node.attrib['href']
-                    if not href.startswith('/w/cpp'):
-                        continue
+            nodes = root.findall(".//div[@class='mw-search-result-heading']/a")
 
-                    if href.startswith(('/w/cpp/language', '/w/cpp/concept')):
-                        # special page
-                        special_pages.append(f'[{node.text}](http://en.cppreference.com{href})')
-                    else:
-                        description.append(f'[`{node.text}`](http://en.cppreference.com{href})')
+            description = []
+            special_pages = []
+            for node in nodes:
+                href = node.attrib['href']
+                if not href.startswith('/w/cpp'):
+                    continue
 
-                if len(special_pages) > 0:
-                    e.add_field(name='Language Results', value='\n'.join(special_pages), inline=False)
-                    if len(description):
-                        e.add_field(name='Library Results', value='\n'.join(description[:10]), inline=False)
+                if href.startswith(('/w/cpp/language', '/w/cpp/concept')):
+                    # special page
+                    special_pages.append(f'[{node.text}](http://en.cppreference.com{href})')
                 else:
-                    if not len(description):
-                        return await ctx.reply('No results found.')
+                    description.append(f'[`{node.text}`](http://en.cppreference.com{href})')
 
-                    e.title = 'Search Results'
-                    e.description = '\n'.join(description[:15])
+            if len(special_pages) > 0:
+                e.add_field(name='Language Results', value='\n'.join(special_pages), inline=False)
+                if len(description):
+                    e.add_field(name='Library Results', value='\n'.join(description[:10]), inline=False)
+            else:
+                if not len(description):
+                    return await ctx.reply('No results found.')
 
-                e.add_field(name='See More', value=f'[`{discord.utils.escape_markdown(query)}` results]({resp.url})')
-                await ctx.reply(embed=e)
-                
+                e.title = 'Search Results'
+                e.description = '\n'.join(description[:15])
+
+            e.add_field(name='See More', value=f'[`{discord.utils.escape_markdown(query)}` results]({resp.url})')
+            await ctx.reply(embed=e)
+            
     @commands.command(
         name="compile",
         description="Compile code via Coliru"
@@ -884,24 +866,23 @@ class Misc(commands.Cog):
         data = json.dumps(payload)
 
         async with ctx.typing():
-            async with aiohttp.ClientSession() as session:
-                async with session.post('http://coliru.stacked-crooked.com/compile', data=data) as resp:
-                    if resp.status != 200:
-                        await ctx.reply('Coliru did not respond in time.')
-                        return
-
-                    output = await resp.text(encoding='utf-8')
-
-                    if len(output) < 1992:
-                        await ctx.reply(f'```\n{output}\n```')
-                        return
-
-                    # output is too big so post it in gist
-                    async with session.post('http://coliru.stacked-crooked.com/share', data=data) as r:
-                        if r.status != 200:
-                            await ctx.reply('Could not create coliru shared link')
-                        else:
-                            shared_id = await r.text()
-                            await ctx.reply(f'Output too big. Coliru link: http://coliru.stacked-crooked.com/a/{shared_id}')
+            async with self.bot.http_client.post('http://coliru.stacked-crooked.com/compile', data=data) as resp:
+                if resp.status != 200:
+                    await ctx.reply('Coliru did not respond in time.')
+                    return
+
+                output = await resp.text(encoding='utf-8')
+
+                if len(output) < 1992:
+                    await ctx.reply(f'```\n{output}\n```')
+                    return
+
+                # output is too big so post it in gist
+                async with self.bot.http_client.post('http://coliru.stacked-crooked.com/share', data=data) as r:
+                    if r.status != 200:
+                        await ctx.reply('Could not create coliru shared link')
+                    else:
+                        shared_id = await r.text()
+                        await ctx.reply(f'Output too big. Coliru link: http://coliru.stacked-crooked.com/a/{shared_id}')
 async def setup(bot):
     await bot.add_cog(Misc(bot))
@@ -126,8 +126,7 @@ class Mod(commands.Cog):
         self, 
         guild_id: int
     ) -> Optional[discord.TextChannel]:
-        # Replace MongoDB with SQLite
-        channel_id = self.bot.db.get_modlog(guild_id)
+        channel_id = self.bot.db.get_guild_config(guild_id).modlog_channel_id
         if channel_id:
             return self.bot.get_channel(channel_id)
         return None
@@ -1,74 +1,199 @@
 import discord
+import asyncio
+import time
 import aiohttp
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 from bot import Morgana
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from http_client import HostLimit, TokenBucket
 from utils import PaginationView
 from urllib.parse import urlparse
 
+NEWS_POLL_INTERVAL = 300
+MAX_POSTS_PER_CATEGORY = 5  # new articles pushed per category per poll; the rest wait for /news
+# Shared by every shard so one busy poll can't burst past Discord's global send limit
+FANOUT_LIMIT = HostLimit(rate=5, burst=10, max_wait=float("inf"))
+
+
+def article_key(article: Dict[str, Any]) -> str:
+    return (article.get('news_link') or article.get('title') or '').strip()
+
+
+def is_valid_url(url: str) -> bool:
+    if not url or not isinstance(url, str):
+        return False
+    try:
+        url = url.strip()
+        result = urlparse(url)
+        return all([
+            result.scheme in ('http', 'https'),
+            result.netloc,
+            len(url) < 2000 
+        ])
+    except (ValueError, AttributeError):
+        return False
+
+
+def create_article_embed(article: Dict[str, Any]) -> discord.Embed:
+    embed = discord.Embed(
+        title=article['title'],
+        description=article['summary'],
+        color=discord.Color.dark_grey()
+    )
+    
+    news_link = article.get('news_link', '')
+    if news_link and is_valid_url(news_link):
+        try: embed.url = news_link.strip()
+        except Exception: pass
+
+    image_link = article.get('image_link', '')
+    if image_link and is_valid_url(image_link):
+        try:
+            embed.set_thumbnail(url=image_link.strip())
+        except Exception:
+            pass
+    return embed
+
+
+class NewsFeed:
+    """
+    The latest BBC snapshot, shared by `/news` and the subscription fan-out.
+
+    `refresh` fetches the feed once, diffs it against the previous snapshot
+    and rebuilds embeds only for categories whose articles changed, so a
+    command just hands out the prebuilt list. The first refresh only primes
+    the snapshot; everything in it counts as already seen.
+    """
+
+    def __init__(self, bot: Morgana, api_url: str) -> None:
+        self.bot = bot
+        self.api_url = api_url
+        self.snapshot: Dict[str, List[Dict[str, Any]]] = {}
+        self.embeds: Dict[str, List[discord.Embed]] = {}
+        self.updated_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def categories(self) -> List[str]:
+        return list(self.snapshot)
+
+    async def refresh(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Fetch the feed and return the articles that are new since the last snapshot, per category"""
+        async with self._lock:
+            status, data = await self.bot.http_client.fetch_json_shared(self.api_url)
+            if status != 200 or not isinstance(data, dict) or not data:
+                return {}
+
+            primed = bool(self.snapshot)
+            new_articles: Dict[str, List[Dict[str, Any]]] = {}
+            for category, articles in data.items():
+                previous = self.snapshot.get(category, [])
+                keys = [article_key(article) for article in articles]
+                if keys == [article_key(article) for article in previous] and category in self.embeds:
+                    continue
+
+                self.embeds[category] = [create_article_embed(article) for article in articles]
+                known = {article_key(article) for article in previous}
+                fresh = [article for article, key in zip(articles, keys) if key and key not in known]
+                if primed and fresh:
+                    new_articles[category] = fresh
+
+            for category in set(self.embeds) - set(data):
+                del self.embeds[category]
+            self.snapshot = data
+            self.updated_at = time.time()
+            return new_articles
+
+    async def get_embeds(self, category: str) -> List[discord.Embed]:
+        if not self.snapshot:
+            await self.refresh()
+        # PaginationView rewrites footers on the embeds it's given, so hand out copies
+        return [embed.copy() for embed in self.embeds.get(category, [])]
+
+
+class NewsFanout:
+    """
+    Pushes new articles to subscribed channels from a single feed fetch.
+
+    Sends are grouped by shard and drained by one worker per shard, all drawing
+    from a single token bucket, so a slow or rate-limited shard doesn't hold up
+    the others and the combined rate stays under FANOUT_LIMIT.
+    """
+
+    def __init__(self, bot: Morgana, limit: HostLimit = FANOUT_LIMIT) -> None:
+        self.bot = bot
+        self.bucket = TokenBucket("discord-news", limit)
+        self.sent = 0
+        self.failed = 0
+
+    async def publish(self, new_articles: Dict[str, List[Dict[str, Any]]]) -> None:
+        if not new_articles:
+            return
+
+        shards: Dict[int, List[Tuple[discord.abc.Messageable, List[discord.Embed]]]] = {}
+        for guild_id, channel_id, category in self.bot.db.get_news_subscriptions():
+            articles = new_articles.get(category)
+            channel = self.bot.get_channel(channel_id)
+            if not articles or channel is None:
+                continue
+            embeds = []
+            for article in articles[:MAX_POSTS_PER_CATEGORY]:
+                embed = create_article_embed(article)
+                embed.set_footer(text=f"BBC News • {category}")
+                embeds.append(embed)
+            shards.setdefault(channel.guild.shard_id, []).append((channel, embeds))
+
+        await asyncio.gather(*(self._drain(jobs) for jobs in shards.values()))
+
+    async def _drain(self, jobs: List[Tuple[discord.abc.Messageable, List[discord.Embed]]]) -> None:
+        for channel, embeds in jobs:
+            await self.bucket.acquire()
+            try:
+                await channel.send(embeds=embeds)
+                self.sent += 1
+            except discord.HTTPException as e:
+                self.failed += 1
+                print(f"Failed to post news to channel {channel.id}: {e}")
+
+
 class News(commands.Cog):
     def __init__(self, bot: Morgana):
         self.bot: Morgana = bot
         self.api_url: str = "https://bbc-api.vercel.app/news?lang=english"
-        self._news_categories: List[str] = []
-
-    async def fetch_news_data(self) -> Dict[str, Any]:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self.api_url) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    return {}
-                
-    async def create_news_embeds(self, news_data: Dict[str, Any], category: str) -> List[discord.Embed]:
-        embeds: List[discord.Embed] = []
-        for index, article in enumerate(news_data.get(category, []), start=1):
-            embed = discord.Embed(
-                title=article['title'],
-                description=article['summary'],
-                color=discord.Color.dark_grey()
-            )
-            
-            news_link = article.get('news_link', '')
-            if news_link and self.is_valid_url(news_link):
-                try: embed.url = news_link.strip()
-                except Exception: pass
-
-            image_link = article.get('image_link', '')
-            if image_link and self.is_valid_url(image_link):
-                try:
-                    embed.set_thumbnail(url=image_link.strip())
-                except Exception:
-                    pass
-
-            embed.set_footer(text=f"Page {index}/{len(news_data.get(category, []))}")
-            embeds.append(embed)
-        return embeds
-
-    def is_valid_url(self, url: str) -> bool:
-        if not url or not isinstance(url, str):
-            return False
+        self.feed = NewsFeed(bot, self.api_url)
+        self.fanout = NewsFanout(bot)
+
+    async def cog_load(self):
+        self.poll_feed.start()
+
+    async def cog_unload(self):
+        self.poll_feed.cancel()
+
+    @tasks.loop(seconds=NEWS_POLL_INTERVAL)
+    async def poll_feed(self):
+        """Fetch the feed once and push new articles to every subscribed channel"""
         try:
-            url = url.strip()
-            result = urlparse(url)
-            return all([
-                result.scheme in ('http', 'https'),
-                result.netloc,
-                len(url) < 2000 
-            ])
-        except (ValueError, AttributeError):
-            return False
+            new_articles = await self.feed.refresh()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"News poll failed: {e}")
+            return
+        await self.fanout.publish(new_articles)
 
+    @poll_feed.before_loop
+    async def before_poll_feed(self):
+        await self.bot.wait_until_ready()
 
     async def category_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
-        if not self._news_categories:
-            news_data = await self.fetch_news_data()
-            self._news_categories = list(news_data.keys())
+        if not self.feed.snapshot:
+            try:
+                await self.feed.refresh()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass
         
         return [
             app_commands.Choice(name=cat, value=cat)
-            for cat in self._news_categories
+            for cat in self.feed.categories
             if current.lower() in cat.lower()
         ][:25]
 
@@ -77,21 +202,23 @@ class News(commands.Cog):
     async def news_hybrid(self, ctx: commands.Context, category: str = "Latest"):
         """
         Get the latest news from a specific category.
-        Fetches the latest news articles from the BBC API and displays them in an embed format.
+        Shows articles from the latest BBC feed snapshot, which is refreshed in the background.
         """
         await ctx.defer()
-        news_data = await self.fetch_news_data()
+        try:
+            if not self.feed.snapshot:
+                await self.feed.refresh()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
         
-        if not news_data:
+        if not self.feed.snapshot:
             await ctx.reply("Failed to fetch news data.")
             return
 
-        self._news_categories = list(news_data.keys())
-        
-        if category not in news_data:
+        if category not in self.feed.snapshot:
             category = "Latest"
 
-        embeds = await self.create_news_embeds(news_data, category)
+        embeds = await self.feed.get_embeds(category)
         
         if not embeds:
             await ctx.reply(f"No news found for category: {category}")
@@ -101,6 +228,42 @@ class News(commands.Cog):
         await ctx.reply(embed=embeds[0], view=view)
         view.message = await ctx.interaction.original_response()
 
+    @commands.hybrid_group(name="newsfeed", description="Post new BBC articles to a channel", invoke_without_command=True)
+    @commands.guild_only()
+    async def newsfeed(self, ctx: commands.Context):
+        subscriptions = self.bot.db.get_guild_news_subscriptions(ctx.guild.id)
+        if not subscriptions:
+            return await ctx.reply("No channels are subscribed to news in this server.")
+
+        lines = [f"<#{channel_id}> — {category}" for channel_id, category in subscriptions]
+        embed = discord.Embed(
+            title="News Subscriptions",
+            description="\n".join(lines),
+            color=discord.Color.dark_grey()
+        )
+        await ctx.reply(embed=embed)
+
+    @newsfeed.command(name="subscribe", description="Post new articles from a category to a channel")
+    @commands.has_permissions(manage_guild=True)
+    @app_commands.autocomplete(category=category_autocomplete)
+    async def newsfeed_subscribe(self, ctx: commands.Context, category: str = "Latest", channel: Optional[discord.TextChannel] = None):
+        channel = channel or ctx.channel
+        if self.feed.snapshot and category not in self.feed.snapshot:
+            return await ctx.reply(f"Unknown news category: {category}")
+
+        if not self.bot.db.add_news_subscription(ctx.guild.id, channel.id, category):
+            return await ctx.reply(f"{channel.mention} is already subscribed to {category}.")
+        await ctx.reply(f"New {category} articles will be posted in {channel.mention}.")
+
+    @newsfeed.command(name="unsubscribe", description="Stop posting a news category to a channel")
+    @commands.has_permissions(manage_guild=True)
+    @app_commands.autocomplete(category=category_autocomplete)
+    async def newsfeed_unsubscribe(self, ctx: commands.Context, category: str = "Latest", channel: Optional[discord.TextChannel] = None):
+        channel = channel or ctx.channel
+        if not self.bot.db.remove_news_subscription(channel.id, category):
+            return await ctx.reply(f"{channel.mention} isn't subscribed to {category}.")
+        await ctx.reply(f"{channel.mention} will no longer receive {category} articles.")
+
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(News(bot))
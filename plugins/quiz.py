@@ -1,77 +1,116 @@
 from discord.ext import commands
 import discord
 import html
+import json
+import hashlib
 import asyncio
 import datetime
-import aiohttp
 import random
-from typing import Literal
+import aiohttp
+from typing import Literal, Set
+
+CATEGORIES = {
+    "history": [22], "gk": [9], "music": [12], "anime": [31],
+    "science": [17, 18, 19], "games": [15]
+}
+
+def question_hash(category: str, question: str, correct_answer: str) -> str:
+    """Identify a question by its content so refills never store the same one twice"""
+    key = "|".join(part.strip().casefold() for part in (category, question, correct_answer))
+    return hashlib.sha1(key.encode()).hexdigest()
 
 class Quiz(commands.Cog):
+    """
+    Questions are served from an on-disk bank (quiz_questions) rather than from
+    OpenTDB directly. Each user gets questions they haven't seen yet, and a
+    category is topped up in the background once a user's unseen count drops
+    below the low-water mark, so a quiz never waits on the network and keeps
+    working from the stored bank while OpenTDB is unreachable.
+    """
+
     def __init__(self, bot):
         self.bot = bot
-        self.question_cache = {
-            "history": [], "gk": [], "music": [], 
-            "anime": [], "science": [], "games": []
-        }
         self.min_questions = 10
         self.refill_amount = 40
+        self.max_refill_attempts = 3
         self.reward_amount = 0.50 
+        self._refills: Set[asyncio.Task] = set()
 
-    @commands.Cog.listener()
-    async def on_ready(self):
-        await self.preload_questions()
-        
-    async def preload_questions(self):
-        categories = {
-            "history": 22, "gk": 9, "music": 12, "anime": 31,
-            "science": random.choice([17, 18, 19]), "games": 15
-        }
-
-        for category_name, category_id in categories.items():
-            if len(self.question_cache[category_name]) < self.min_questions:
-                await self.fetch_and_store_questions(category_name, category_id, self.refill_amount)
-                await asyncio.sleep(5)  # Rate limiting
+    async def cog_load(self):
+        counts = self.bot.db.get_quiz_bank_counts()
+        for category_name in CATEGORIES:
+            if counts.get(category_name, 0) < self.min_questions:
+                # opentdb's one-request-per-5s limit is enforced by the shared HTTP client
+                self.schedule_refill(category_name)
+
+    async def cog_unload(self):
+        for task in list(self._refills):
+            task.cancel()
+
+    def schedule_refill(self, category_name):
+        if ("quiz-refill", category_name) in self.bot.http_client.flights:
+            return
+        task = asyncio.create_task(self.fetch_and_store_questions(
+            category_name, random.choice(CATEGORIES[category_name]), self.refill_amount
+        ))
+        self._refills.add(task)
+        task.add_done_callback(self._refills.discard)
     
     async def fetch_and_store_questions(self, category_name, category_id, refill_amount):
-        """Fetch questions from OpenTDB API and store in cache"""
-        async with aiohttp.ClientSession() as session:
-            url = f"https://opentdb.com/api.php?amount={refill_amount}&category={category_id}&type=multiple"
-            async with session.get(url) as response:
-                
+        """Fetch questions from OpenTDB API into the bank, one refill per category at a time"""
+        try:
+            await self.bot.http_client.flights.do(
+                ("quiz-refill", category_name),
+                lambda: self._refill_questions(category_name, category_id, refill_amount)
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Quiz refill for {category_name} failed: {e}")
+
+    async def _refill_questions(self, category_name, category_id, refill_amount):
+        url = f"https://opentdb.com/api.php?amount={refill_amount}&category={category_id}&type=multiple"
+        for _ in range(self.max_refill_attempts):
+            # A 429 pauses opentdb in the shared client for its Retry-After,
+            # so the next attempt queues behind that instead of sleeping here
+            async with self.bot.http_client.get(url) as response:
                 if response.status == 429:
-                    retry_after = int(response.headers.get("Retry-After", 5))  
-                    await asyncio.sleep(retry_after)
-                    return await self.fetch_and_store_questions(category_name, category_id, refill_amount) 
-                
+                    continue
                 if response.status != 200: return
-                    
                 data = await response.json()
+            break
+        else:
+            return
 
-        if data["response_code"] == 0:
-            self.question_cache[category_name].extend(data["results"])
-        
-    async def fetch_questions(self, type):
-        """Get a question from cache or fetch new ones if needed"""
-        categories = {
-            "history": 22, "gk": 9, "music": 12, "anime": 31,
-            "science": random.choice([17, 18, 19]), "games": 15
-        }
+        if data["response_code"] != 0:
+            return
 
-        category_id = categories.get(type, random.choice(list(categories.values())))
-        category_name = next((name for name, id in categories.items() if id == category_id), "Unknown")
+        rows = []
+        for result in data["results"]:
+            question = html.unescape(result["question"])
+            correct_answer = html.unescape(result["correct_answer"])
+            incorrect_answers = [html.unescape(answer) for answer in result["incorrect_answers"]]
+            rows.append((
+                category_name, question_hash(category_name, question, correct_answer),
+                question, correct_answer, json.dumps(incorrect_answers), result.get("difficulty")
+            ))
+        added = self.bot.db.add_quiz_questions(rows)
+        print(f"Quiz bank: added {added}/{len(rows)} new {category_name} questions")
+        
+    async def fetch_questions(self, type, user_id: int):
+        """Get an unseen question from the bank, refilling it in the background when low"""
+        category_name = type if type in CATEGORIES else random.choice(list(CATEGORIES))
 
+        quiz_question = self.bot.db.get_random_quiz_question(user_id, category_name)
+        if self.bot.db.count_unseen_quiz_questions(user_id, category_name) <= self.min_questions:
+            self.schedule_refill(category_name)
+        if quiz_question is None:
+            return None
 
-        quiz_question = self.question_cache[category_name].pop(0)
-        question_text = html.unescape(quiz_question["question"])
-        correct_answer = html.unescape(quiz_question["correct_answer"])
-        options = [html.unescape(option) for option in quiz_question["incorrect_answers"] + [correct_answer]]
+        self.bot.db.mark_quiz_question_seen(user_id, quiz_question["question_id"])
+        correct_answer = quiz_question["correct_answer"]
+        options = quiz_question["incorrect_answers"] + [correct_answer]
         random.shuffle(options)
 
-        if len(self.question_cache[category_name]) < self.min_questions:
-            asyncio.create_task(self.fetch_and_store_questions(category_name, category_id, self.refill_amount))
-
-        return question_text, correct_answer, options, category_name
+        return quiz_question["question"], correct_answer, options, category_name
 
     def update_score(self, user_id: int, correct: bool, category: str):
         """Update quiz score in database - synchronous version"""
@@ -105,7 +144,7 @@ class Quiz(commands.Cog):
     @quiz.command(name="start", description="Take a random quiz!")
     async def quiz_random(self, ctx: commands.Context, 
                          category: Literal["history", "gk", "music", "anime", "science", "games"] = None):
-        question_data = await self.fetch_questions(category)
+        question_data = await self.fetch_questions(category, ctx.author.id)
         if question_data is None:
             return await ctx.reply("Failed to fetch the quiz.")
 
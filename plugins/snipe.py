@@ -1,74 +1,80 @@
-from discord.ext import commands
+from discord.ext import commands, tasks
 import discord
-from typing import Optional
+from typing import List, Optional
 from discord import app_commands
 from utils import PaginationView
-import time
+from snipe_store import SnipeRecord, SnipeStore
 from bot import Morgana
 
+SNIPE_IDLE_TTL = 24 * 3600  # guilds with no deletions or edits for this long are forgotten
+
+
 class Snipe(commands.Cog):
     """Message recovery and edit history tracking"""
     
     def __init__(self, bot: Morgana):
         self.bot = bot
-        self.deleted_messages = {}
-        self.edited_messages = {}
+        self.store = SnipeStore()
+
+    async def cog_load(self):
+        self.evict_idle.start()
+
+    async def cog_unload(self):
+        self.evict_idle.cancel()
+
+    @tasks.loop(minutes=30)
+    async def evict_idle(self):
+        self.store.evict_idle(SNIPE_IDLE_TTL)
 
     @commands.Cog.listener()
     async def on_message_delete(self, message):
         """Record deleted messages for future retrieval"""
         if message.guild and not message.author.bot:
-            if message.guild.id not in self.deleted_messages:
-                self.deleted_messages[message.guild.id] = []
-            self.deleted_messages[message.guild.id].append((message, discord.utils.utcnow()))
-            if len(self.deleted_messages[message.guild.id]) > 8:
-                self.deleted_messages[message.guild.id].pop(0)
+            record = SnipeRecord.from_message(message, discord.utils.utcnow().timestamp())
+            self.store.add(message.guild.id, "deleted", record)
 
     @commands.Cog.listener()
     async def on_message_edit(self, before, after):
         """Track edited messages and retain original content"""
         if before.guild and not before.author.bot:
-            if before.guild.id not in self.edited_messages:
-                self.edited_messages[before.guild.id] = []
-            self.edited_messages[before.guild.id].append((before, after))
-            if len(self.edited_messages[before.guild.id]) > 8:
-                self.edited_messages[before.guild.id].pop(0)
+            edited_at = after.edited_at or discord.utils.utcnow()
+            record = SnipeRecord.from_message(before, edited_at.timestamp(), after=after.content)
+            self.store.add(before.guild.id, "edited", record)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.store.remove_guild(guild.id)
 
     @commands.hybrid_group(name="snipe", aliases=["s", "sn", "snp"], fallback="deleted")
     @commands.has_permissions(manage_messages=True)
     @app_commands.describe(count="Number of messages to snipe (default: 1, max: 8)")
     async def snipe(self, ctx, count: int = 1):
         """Recover recently deleted messages"""
-        await self._snipe_deleted(ctx, min(count, 8))
+        await self._snipe_deleted(ctx, max(1, min(count, 8)))
 
     @snipe.command(name="edited")
     @commands.has_permissions(manage_messages=True)
     @app_commands.describe(count="Number of edited messages to show (default: 1, max: 8)")
     async def snipe_edited(self, ctx, count: int = 1):
         """View message edit history with before/after comparison"""
-        count = min(count, 8)
-        if not self.edited_messages.get(ctx.guild.id):
+        records = self.store.latest(ctx.guild.id, "edited", max(1, min(count, 8)))
+        if not records:
             await ctx.reply("No edited messages found.")
             return
 
-        edited_messages = self.edited_messages[ctx.guild.id][-count:]
         embeds = []
-        for before, after in edited_messages:
+        for record in records:
             embed = discord.Embed(color=discord.Color.dark_grey())
-            embed.description = f"✏️ Message edited by {before.author.mention} in {before.channel.mention} at <t:{int(after.edited_at.timestamp())}:T>\n\n"
-            embed.description += f"Before: ||{before.content[:1024] or 'None'}||\n"
-            embed.description += f"After: {after.content[:1024] or 'None'}"
+            embed.description = f"✏️ Message edited by <@{record.author_id}> in <#{record.channel_id}> at <t:{int(record.timestamp)}:T>\n\n"
+            embed.description += f"Before: ||{record.content or 'None'}||\n"
+            embed.description += f"After: {record.after or 'None'}"
 
-            if before.attachments:
-                embed.description += f"\n\nAttachments: {', '.join([f'[{a.filename}]({a.url})' for a in before.attachments])}"
+            if record.attachments:
+                embed.description += f"\n\nAttachments: {', '.join([f'[{filename}]({url})' for filename, url in record.attachments])}"
 
             embeds.append(embed)
 
-        if len(embeds) == 1:
-            await ctx.reply(embed=embeds[0])
-        else:
-            view = PaginationView(embeds[::-1], ctx.author)  
-            view.message = await ctx.reply(embed=embeds[-1], view=view)
+        await self._send_embeds(ctx, embeds)
 
     @commands.command(name="snipe_edited", aliases=["editsnipe"])
     @commands.has_permissions(manage_messages=True)
@@ -87,69 +93,66 @@ class Snipe(commands.Cog):
     @app_commands.describe(user="The user to snipe messages from", count="Number of messages to snipe (default: 1, max: 8)")
     async def snipe_user(self, ctx, user: discord.Member, count: int = 1):
         """Recover deleted messages from a specific user"""
-        if not self.deleted_messages.get(ctx.guild.id):
-            await ctx.reply("No deleted messages found.")
+        records = self.store.latest(ctx.guild.id, "deleted", max(1, min(count, 8)), user_id=user.id)
+        if not records:
+            await ctx.reply(f"No deleted messages found for {user.mention}.")
             return
 
-        count = min(count, 8) 
-        user_messages = [msg for msg, _ in self.deleted_messages[ctx.guild.id] if msg.author == user]
-        if not user_messages:
-            await ctx.reply(f"No deleted messages found for {user.mention}.")
+        await self._send_embeds(ctx, [await self._create_snipe_embed(ctx, record) for record in records])
+
+    @snipe.command(name="channel")
+    @commands.has_permissions(manage_messages=True)
+    @app_commands.describe(channel="The channel to snipe messages from (default: this one)", count="Number of messages to snipe (default: 1, max: 8)")
+    async def snipe_channel(self, ctx, channel: Optional[discord.TextChannel] = None, count: int = 1):
+        """Recover deleted messages from a specific channel"""
+        channel = channel or ctx.channel
+        records = self.store.latest(ctx.guild.id, "deleted", max(1, min(count, 8)), channel_id=channel.id)
+        if not records:
+            await ctx.reply(f"No deleted messages found in {channel.mention}.")
             return
 
-        messages_to_show = user_messages[-count:]
-        if len(messages_to_show) == 1:
-            await self._send_snipe_embed(ctx, messages_to_show[0])
-        else:
-            embeds = []
-            for message in messages_to_show:
-                embed = await self._create_snipe_embed(message, discord.utils.utcnow())
-                embeds.append(embed)
-            
-            view = PaginationView(embeds[::-1], ctx.author)
-            view.message = await ctx.reply(embed=embeds[-1], view=view)
+        await self._send_embeds(ctx, [await self._create_snipe_embed(ctx, record) for record in records])
 
     async def _snipe_deleted(self, ctx, count: int):
         """Internal method to handle deleted message recovery"""
-        if not self.deleted_messages.get(ctx.guild.id):
+        records = self.store.latest(ctx.guild.id, "deleted", count)
+        if not records:
             await ctx.reply("No deleted messages found.")
             return
 
-        messages = self.deleted_messages[ctx.guild.id][-count:]
-        embeds = []
-        for message, deleted_at in messages:
-            embed = await self._create_snipe_embed(message, deleted_at)
-            embeds.append(embed)
+        await self._send_embeds(ctx, [await self._create_snipe_embed(ctx, record) for record in records])
 
-        if len(embeds) == 1:
-            await ctx.reply(embed=embeds[0])
-        else:
-            view = PaginationView(embeds[::-1], ctx.author)  
-            view.message = await ctx.reply(embed=embeds[-1], view=view)
-
-    async def _create_snipe_embed(self, message, deleted_at):
+    async def _create_snipe_embed(self, ctx, record: SnipeRecord):
         """Format deleted message data into readable embed"""
         embed = discord.Embed(color=discord.Color.dark_grey())
-        embed.description = f"🚮 Message sent by {message.author.mention} deleted in {message.channel.mention}"
-        embed.description += f" at <t:{int(deleted_at.timestamp())}:T>\n\n"
-        embed.description += f"Content: {message.content[:1024]}" if message.content else "Content: None"
+        embed.description = f"🚮 Message sent by <@{record.author_id}> deleted in <#{record.channel_id}>"
+        embed.description += f" at <t:{int(record.timestamp)}:T>\n\n"
+        content = record.content
+        embed.description += f"Content: {content}" if content else "Content: None"
 
-        if message.attachments:
-            embed.description += f"\n\nAttachments: {', '.join([f'[{a.filename}]({a.url})' for a in message.attachments])}"
+        if record.attachments:
+            embed.description += f"\n\nAttachments: {', '.join([f'[{filename}]({url})' for filename, url in record.attachments])}"
 
-        if message.reference:
+        if record.reference_id:
+            channel = ctx.guild.get_channel_or_thread(record.channel_id)
             try:
-                ref_message = await message.channel.fetch_message(message.reference.message_id)
-                embed.description += f"\n\nReplying to: [this message]({ref_message.jump_url})"
+                ref_message = await channel.fetch_message(record.reference_id) if channel else None
             except discord.NotFound:
+                ref_message = None
+            if ref_message:
+                embed.description += f"\n\nReplying to: [this message]({ref_message.jump_url})"
+            else:
                 embed.description += "\n\nReplying to: [a deleted message]()"
 
         return embed
 
-    async def _send_snipe_embed(self, ctx, message):
-        """Display a single sniped message"""
-        embed = await self._create_snipe_embed(message, discord.utils.utcnow())
-        await ctx.reply(embed=embed)
+    async def _send_embeds(self, ctx, embeds: List[discord.Embed]):
+        """Reply with one embed, or page through several newest first"""
+        if len(embeds) == 1:
+            await ctx.reply(embed=embeds[0])
+        else:
+            view = PaginationView(embeds, ctx.author)
+            view.message = await ctx.reply(embed=embeds[0], view=view)
 
 async def setup(bot):
     await bot.add_cog(Snipe(bot))
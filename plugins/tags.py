@@ -1,16 +1,31 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
-from typing import Union, Optional, List, Dict, Any
+from typing import Union, Optional, Dict, Any
 from datetime import datetime
 from bot import Morgana
 from utils import PaginationView
+from automod_keywords import AutomodKeywords
 
+TAG_USE_FLUSH_INTERVAL = 60
 
 
 class Tags(commands.Cog):
     def __init__(self, bot: Morgana):
         self.bot: Morgana = bot
+        self.automod = AutomodKeywords()
+
+    async def cog_load(self):
+        self.flush_tag_uses.start()
+
+    async def cog_unload(self):
+        self.flush_tag_uses.cancel()
+        self.bot.db.flush_tag_uses()
+
+    @tasks.loop(seconds=TAG_USE_FLUSH_INTERVAL)
+    async def flush_tag_uses(self):
+        """Write buffered tag use counts"""
+        self.bot.db.flush_tag_uses()
 
     @commands.hybrid_group(name="tag", invoke_without_command=True, description="Retrieve or manage tags", aliases=["tags", "tg"])
     @app_commands.describe(name="The name of the tag to retrieve")
@@ -86,7 +101,7 @@ class Tags(commands.Cog):
             return await ctx.reply("Tag alias name is too long (maximum 100 characters)")
         
         # Check if original tag exists
-        original_tag = self.bot.db.get_tag(ctx.guild.id, old_name)
+        original_tag = self.bot.db.get_tag(ctx.guild.id, old_name, count_use=False)
         if not original_tag:
             return await ctx.reply(f"Tag `{old_name}` not found.")
         
@@ -111,45 +126,47 @@ class Tags(commands.Cog):
         else:
             await ctx.reply(f"An alias or tag with the name `{new_name}` already exists.")
 
-    # Add a helper method to check for automod violations
     async def check_automod_violation(self, guild_id, content):
         """
-        Checks if the content would violate the server's automod rules.
-        
-        Returns True if violations are found, False otherwise.
+        Checks if the content would violate the server's automod keyword rules.
+
+        Returns [True, message] if violations are found, [False, ""] otherwise.
         """
         guild = self.bot.get_guild(guild_id)
-        
-        try:
-            rules: list[discord.AutoModRule] = await guild.fetch_automod_rules()
-            
-            found_words = []
-            for rule in rules:
-                if hasattr(rule.trigger, 'keyword_filter'):
-                    censored: List[str] = rule.trigger.keyword_filter
-                    for word in censored:
-                        if word.lower() in content.lower():
-                            found_words.append(word)
-            
-            if found_words:
-                censored_display = []
-                for word in found_words[:3]:
-                    if len(word) <= 2:
-                        masked = word
-                    else:
-                        masked = f"{word[0]}{'*' * (len(word)-2)}{word[-1]}"
-                    censored_display.append(masked)
-                
-                if len(found_words) > 3:
-                    censored_display.append("etc...")
-                
-                return [True, f"Your content has {len(found_words)} censored words, like {', '.join(censored_display)}"]
-            
-            return [False, ""]
-        except Exception as e:
-            # Log the error but allow the tag to be created
-            print(f"Error in automod check: {e}")
-            return [False, ""]
+        found_words = await self.automod.find(guild, content)
+
+        if found_words:
+            censored_display = []
+            for word in found_words[:3]:
+                word = word.strip("*")
+                if len(word) <= 2:
+                    masked = word
+                else:
+                    masked = f"{word[0]}{'*' * (len(word)-2)}{word[-1]}"
+                censored_display.append(masked)
+
+            if len(found_words) > 3:
+                censored_display.append("etc...")
+
+            return [True, f"Your content has {len(found_words)} censored words, like {', '.join(censored_display)}"]
+
+        return [False, ""]
+
+    @commands.Cog.listener()
+    async def on_automod_rule_create(self, rule: discord.AutoModRule):
+        self.automod.update_rule(rule)
+
+    @commands.Cog.listener()
+    async def on_automod_rule_update(self, rule: discord.AutoModRule):
+        self.automod.update_rule(rule)
+
+    @commands.Cog.listener()
+    async def on_automod_rule_delete(self, rule: discord.AutoModRule):
+        self.automod.remove_rule(rule)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.automod.forget(guild.id)
 
     @tag.command(name="all", description="List all tags in the server")
     @app_commands.describe(page="The page number to view")
@@ -211,13 +228,22 @@ class Tags(commands.Cog):
             
         if len(content) > 2000:
             return await ctx.reply("Tag content is too long (maximum 2000 characters)")
+
+        can_bypass = ctx.author.guild_permissions.manage_messages or ctx.author.guild_permissions.administrator
+        has_banned_words, violation_message = await self.check_automod_violation(ctx.guild.id, content)
+
+        if has_banned_words and not can_bypass:
+            return await ctx.reply(f"Tag edit canceled. {violation_message}")
         
         success = self.bot.db.edit_tag(ctx.guild.id, name, content, ctx.author.id)
         
         if success:
-            await ctx.reply(f"Tag `{name}` edited successfully.")
+            if has_banned_words and can_bypass:
+                await ctx.reply(f"Tag `{name}` edited successfully.\n> Note: {violation_message}")
+            else:
+                await ctx.reply(f"Tag `{name}` edited successfully.")
         else:
-            tag = self.bot.db.get_tag(ctx.guild.id, name)
+            tag = self.bot.db.get_tag(ctx.guild.id, name, count_use=False)
             if not tag:
                 await ctx.reply(f"Tag `{name}` does not exist.")
             else:
@@ -232,7 +258,7 @@ class Tags(commands.Cog):
         if success:
             await ctx.reply(f"Tag `{name}` deleted successfully.")
         else:
-            tag = self.bot.db.get_tag(ctx.guild.id, name)
+            tag = self.bot.db.get_tag(ctx.guild.id, name, count_use=False)
             if not tag:
                 await ctx.reply(f"Tag `{name}` does not exist.")
             else:
@@ -298,7 +324,7 @@ class Tags(commands.Cog):
     @tag.command(name="search", description="Search for tags")
     @app_commands.describe(query="The search query (min 3 characters)")
     async def tag_search(self, ctx, *, query: str):
-        """Searches for a tag."""
+        """Searches tag names, aliases and content, best matches first."""
         if len(query) < 3:
             return await ctx.reply("Search query must be at least 3 characters long.")
             
@@ -307,7 +333,7 @@ class Tags(commands.Cog):
         if not tags:
             return await ctx.reply(f"No tags found matching query: `{query}`")
         
-        tag_list = "\n".join(f"`{tag['name']}`" for tag in tags[:15])
+        tag_list = "\n".join(self._format_search_result(tag) for tag in tags[:15])
         
         embed = discord.Embed(
             title=f"Tag Search: {query}",
@@ -320,6 +346,17 @@ class Tags(commands.Cog):
         
         await ctx.reply(embed=embed)
 
+    @staticmethod
+    def _format_search_result(tag: Dict[str, Any]) -> str:
+        """One result line: the name, its aliases and the matching part of the content"""
+        line = f"`{tag['name']}`"
+        if tag["aliases"]:
+            line += f" (aka {', '.join(f'`{alias}`' for alias in tag['aliases'][:3])})"
+        snippet = " ".join(tag["snippet"].split())
+        if "**" in snippet:  # only when the content itself matched
+            line += f" — {snippet[:200]}"
+        return line
+
     @tag.command(name="list", description="List tags owned by a user")
     @app_commands.describe(member="The member whose tags to list (defaults to you)")
     async def tag_list(self, ctx, member: discord.Member = None):
@@ -419,7 +456,7 @@ class Tags(commands.Cog):
         if success:
             await ctx.reply(f"Tag `{name}` transferred to {member.mention}.")
         else:
-            tag = self.bot.db.get_tag(ctx.guild.id, name)
+            tag = self.bot.db.get_tag(ctx.guild.id, name, count_use=False)
             if not tag:
                 await ctx.reply(f"Tag `{name}` does not exist.")
             else:
@@ -429,7 +466,7 @@ class Tags(commands.Cog):
     @app_commands.describe(name="The name of the tag to claim")
     async def tag_claim(self, ctx, *, name: str):
         """Claims an unclaimed tag."""
-        tag = self.bot.db.get_tag(ctx.guild.id, name)
+        tag = self.bot.db.get_tag(ctx.guild.id, name, count_use=False)
         
         if not tag:
             return await ctx.reply(f"Tag `{name}` not found.")
@@ -1,16 +1,156 @@
 from discord import app_commands
 from discord.ext import commands
 from bot import Morgana
-from typing import Union
+from typing import Dict, List, Optional, Tuple, Union
+import asyncio
 import discord
+import functools
 import random
 from gender_guesser.detector import Detector
 from utils import find_member
 import time
 
+GENDERS = {"female": "female", "mostly_female": "female", "male": "male", "mostly_male": "male"}
+
+_detector: Optional[Detector] = None
+
+
+def get_detector() -> Detector:
+    """The gender detector, loading its name dictionary from disk on first use only"""
+    global _detector
+    if _detector is None:
+        _detector = Detector()
+    return _detector
+
+
+@functools.lru_cache(maxsize=65536)
+def classify_name(first_name: str) -> Optional[str]:
+    return GENDERS.get(get_detector().get_gender(first_name))
+
+
+class MemberPool:
+    """Member ids with O(1) add, remove and random pick"""
+
+    def __init__(self) -> None:
+        self.ids: List[int] = []
+        self.positions: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, member_id: int) -> None:
+        if member_id not in self.positions:
+            self.positions[member_id] = len(self.ids)
+            self.ids.append(member_id)
+
+    def remove(self, member_id: int) -> None:
+        position = self.positions.pop(member_id, None)
+        if position is None:
+            return
+        last = self.ids.pop()
+        if last != member_id:
+            self.ids[position] = last
+            self.positions[last] = position
+
+    def choice(self) -> int:
+        return random.choice(self.ids)
+
+
+class GenderPools:
+    """
+    Per-guild pools of members whose display name reads as female or male,
+    classified once when a guild is first asked for and then kept current
+    from member events instead of reclassifying the whole guild per command.
+    Events for a guild whose pools are being built are queued and replayed
+    onto them afterwards.
+    """
+
+    def __init__(self) -> None:
+        self.guilds: Dict[int, Dict[str, MemberPool]] = {}
+        self._builds: Dict[int, asyncio.Future] = {}
+        self._pending: Dict[int, List[Tuple[int, Optional[str]]]] = {}
+
+    async def get(self, guild: discord.Guild, gender: str) -> MemberPool:
+        pools = self.guilds.get(guild.id)
+        if pools is None:
+            build = self._builds.get(guild.id)
+            if build is None:
+                self._pending[guild.id] = []  # before the snapshot, so no event falls between the two
+                build = self._builds[guild.id] = asyncio.ensure_future(self._build(guild))
+            pools = await asyncio.shield(build)
+        return pools[gender]
+
+    async def _build(self, guild: discord.Guild) -> Dict[str, MemberPool]:
+        members = [(member.id, member.display_name) for member in guild.members]
+
+        def classify_all() -> Dict[str, MemberPool]:
+            pools = {"female": MemberPool(), "male": MemberPool()}
+            for member_id, display_name in members:
+                self._apply(pools, member_id, display_name)
+            return pools
+
+        try:
+            # The first call also loads the detector's dictionary, so keep it off the event loop
+            pools = await asyncio.to_thread(classify_all)
+            for member_id, display_name in self._pending[guild.id]:
+                self._apply(pools, member_id, display_name)
+            self.guilds[guild.id] = pools
+            return pools
+        finally:
+            del self._pending[guild.id]
+            del self._builds[guild.id]
+
+    @staticmethod
+    def _apply(pools: Dict[str, MemberPool], member_id: int, display_name: Optional[str]) -> None:
+        """(Re)classify a member under `display_name`, or drop them when it is None"""
+        for pool in pools.values():
+            pool.remove(member_id)
+        words = display_name.split() if display_name else None
+        gender = classify_name(words[0]) if words else None
+        if gender:
+            pools[gender].add(member_id)
+
+    def update(self, member: discord.Member, removed: bool = False) -> None:
+        display_name = None if removed else member.display_name
+        pools = self.guilds.get(member.guild.id)
+        if pools is not None:
+            self._apply(pools, member.id, display_name)
+        elif member.guild.id in self._pending:
+            self._pending[member.guild.id].append((member.id, display_name))
+
+
 class UngrpdCmds(commands.Cog):
     def __init__(self, bot: Morgana):
         self.bot = bot
+        self.gender_pools = GenderPools()
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        self.gender_pools.update(member)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        if before.display_name != after.display_name:
+            self.gender_pools.update(after)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        self.gender_pools.update(member, removed=True)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.gender_pools.guilds.pop(guild.id, None)
+
+    async def random_member(self, guild: discord.Guild, gender: str) -> discord.Member:
+        """A random member of the given gender pool, or anyone if the pool is empty"""
+        pool = await self.gender_pools.get(guild, gender)
+        while len(pool):
+            member_id = pool.choice()
+            member = guild.get_member(member_id)
+            if member is not None:
+                return member
+            pool.remove(member_id)
+        return random.choice(guild.members)
 
     @app_commands.checks.cooldown(1, 10)
     @commands.hybrid_command(name="ping", description="Check the bot's latency")
@@ -50,47 +190,28 @@ class UngrpdCmds(commands.Cog):
             user = [random.choice(ctx.guild.members)]
             
         elif user == "random girl":
-            d = Detector()
-            
-            possible_girls = []
-            for member in ctx.guild.members:
-                name_gender = d.get_gender(member.display_name.split()[0])
-                if name_gender in ['female', 'mostly_female']:
-                    possible_girls.append(member)
-            user = [random.choice(possible_girls)] if possible_girls else [random.choice(ctx.guild.members)]
+            user = [await self.random_member(ctx.guild, "female")]
         
         elif user == "random boy":
-            d = Detector()
-            
-            possible_dudes = []
-            for member in ctx.guild.members:
-                name_gender = d.get_gender(member.display_name.split()[0])
-                if name_gender in ['male', 'mostly_male']:
-                    possible_dudes.append(member)
-            user = [random.choice(possible_dudes)] if possible_dudes else [random.choice(ctx.guild.members)]
+            user = [await self.random_member(ctx.guild, "male")]
         
         else:
             user = user.replace(',', ' ').split()
             mem_list = []
-            print(user)
             
             for _ in user:
                 mem = await find_member(ctx.guild, _)
                 if mem:
                     mem_list.append(mem)
-                    print(mem)
             user = mem_list
             
         view = discord.ui.LayoutView()
         container = discord.ui.Container(id=1)
         
-        avatar_files = []
+        avatar_files = await asyncio.gather(*(_.display_avatar.to_file() for _ in user))
         gallery_items = []
         
-        for _ in user:
-            av_file = await _.display_avatar.to_file()
-            avatar_files.append(av_file)
-            
+        for _, av_file in zip(user, avatar_files):
             gallery_items.append(
                 discord.MediaGalleryItem(
                     media=f"attachment://{av_file.filename}",
@@ -109,7 +230,7 @@ class UngrpdCmds(commands.Cog):
         container.add_item(gallery)
         
         view.add_item(container)
-        await ctx.reply(view=view, files=avatar_files)
+        await ctx.reply(view=view, files=list(avatar_files))
 
            
 async def setup(bot: Morgana):
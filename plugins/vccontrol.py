@@ -1,6 +1,9 @@
 from discord.ext import commands
 import discord
+import asyncio
+import time
 from bot import Morgana
+from http_client import HostStats
 from discord import app_commands
 from typing import (
     Optional, 
@@ -8,8 +11,11 @@ from typing import (
     Any, 
     Union,
     List,
-    Tuple
+    Tuple,
+    Awaitable,
+    DefaultDict
 )
+from collections import defaultdict
 from discord.ui import (
     Button,
     View, 
@@ -18,6 +24,13 @@ from discord.ui import (
     Select
 )
 
+RECONCILE_CONCURRENCY = 8  # guilds whose temp VCs are checked at once on startup
+PANEL_VERSION = 1  # panels with the persistent tempvc:* custom_ids; older ones are re-attached once
+CREATION_STEPS = ("create", "move", "panel", "db", "total")  # timed in creation_stats
+
+# The owner is only an Object when they weren't cached at startup
+VCOwner = Union[discord.Member, discord.Object]
+
 EMOJIS: Dict[str, str] = {
     "edit": "✏️",
     "region": "🌍", 
@@ -281,29 +294,34 @@ class AccessControlView(View):
         self.add_item(self.deny_select)
 
 class VCControlView(View):
+    """
+    The control panel under every temp VC's embed.
+
+    Registered once as a persistent view, so every panel's buttons (including
+    ones sent before a restart) reach it by custom_id; the owner and control
+    message are looked up from the channel the button was pressed in.
+    """
+
     def __init__(
         self,
-        vc_owner: discord.Member,
-        control_message_id: int
+        visibility_state: str = "public"
     ) -> None:
         super().__init__(timeout=None)
-        self.vc_owner: discord.Member = vc_owner
-        self.control_message_id: int = control_message_id
-        self.visibility_state: str = "public"
+        self.visibility_state: str = visibility_state
         # Row 1 Buttons
-        self.edit_button: Button = Button(label="Edit", emoji=EMOJIS["edit"], style=discord.ButtonStyle.grey, row=0)
-        self.access_button: Button = Button(label="Access", emoji=EMOJIS["access"], style=discord.ButtonStyle.grey, row=0)
-        self.transfer_button: Button = Button(label="Transfer", emoji=EMOJIS["transfer"], style=discord.ButtonStyle.grey, row=0)
+        self.edit_button: Button = Button(label="Edit", emoji=EMOJIS["edit"], style=discord.ButtonStyle.grey, row=0, custom_id="tempvc:edit")
+        self.access_button: Button = Button(label="Access", emoji=EMOJIS["access"], style=discord.ButtonStyle.grey, row=0, custom_id="tempvc:access")
+        self.transfer_button: Button = Button(label="Transfer", emoji=EMOJIS["transfer"], style=discord.ButtonStyle.grey, row=0, custom_id="tempvc:transfer")
 
         # Row 2 Buttons
-        self.public_button: Button = Button(label="Public", emoji=EMOJIS["public"], style=discord.ButtonStyle.grey, row=1)
-        self.private_button: Button = Button(label="Private", emoji=EMOJIS["private"], style=discord.ButtonStyle.grey, row=1)
-        self.hidden_button: Button = Button(label="Hidden", emoji=EMOJIS["hidden"], style=discord.ButtonStyle.grey, row=1)
+        self.public_button: Button = Button(label="Public", emoji=EMOJIS["public"], style=discord.ButtonStyle.grey, row=1, custom_id="tempvc:public")
+        self.private_button: Button = Button(label="Private", emoji=EMOJIS["private"], style=discord.ButtonStyle.grey, row=1, custom_id="tempvc:private")
+        self.hidden_button: Button = Button(label="Hidden", emoji=EMOJIS["hidden"], style=discord.ButtonStyle.grey, row=1, custom_id="tempvc:hidden")
 
         # Row 3 Buttons
-        self.region_button: Button = Button(label="Region", emoji=EMOJIS["region"], style=discord.ButtonStyle.grey, row=2)
-        self.kick_button: Button = Button(label="Kick", emoji=EMOJIS["kick"], style=discord.ButtonStyle.grey, row=2)
-        self.movetop_button: Button = Button(label="Move Top", emoji=EMOJIS["movetop"], style=discord.ButtonStyle.grey, row=2)
+        self.region_button: Button = Button(label="Region", emoji=EMOJIS["region"], style=discord.ButtonStyle.grey, row=2, custom_id="tempvc:region")
+        self.kick_button: Button = Button(label="Kick", emoji=EMOJIS["kick"], style=discord.ButtonStyle.grey, row=2, custom_id="tempvc:kick")
+        self.movetop_button: Button = Button(label="Move Top", emoji=EMOJIS["movetop"], style=discord.ButtonStyle.grey, row=2, custom_id="tempvc:movetop")
 
         # Add button callbacks
         self.edit_button.callback = self.edit_button_callback
@@ -327,20 +345,38 @@ class VCControlView(View):
         self.add_item(self.kick_button)
         self.add_item(self.movetop_button)
 
-        # Disable public button by default
-        self.public_button.disabled = True
-        self.private_button.disabled = False
-        self.hidden_button.disabled = False
+        # The button for the current state is disabled
+        self.public_button.disabled = visibility_state == "public"
+        self.private_button.disabled = visibility_state == "private"
+        self.hidden_button.disabled = visibility_state == "hidden"
 
-    async def edit_button_callback(
-        self,
+    @staticmethod
+    def temp_channel(
         interaction: discord.Interaction
-    ) -> None:
-        if interaction.user.id != self.vc_owner.id:
+    ) -> Optional[Tuple[VCOwner, int]]:
+        """(owner, control message id) of the temp VC the interaction happened in"""
+        tempvc_cog = interaction.client.get_cog('tempvc')
+        return tempvc_cog.temp_channels.get(interaction.channel.id) if tempvc_cog else None
+
+    async def owner_check(
+        self,
+        interaction: discord.Interaction,
+        action: str
+    ) -> Optional[Tuple[VCOwner, int]]:
+        temp_channel = self.temp_channel(interaction)
+        if not temp_channel or interaction.user.id != temp_channel[0].id:
             await interaction.response.send_message(
-                "Only the VC owner can edit!",
+                f"Only the VC owner can {action}!",
                 ephemeral=True
             )
+            return None
+        return temp_channel
+
+    async def edit_button_callback(
+        self,
+        interaction: discord.Interaction
+    ) -> None:
+        if not await self.owner_check(interaction, "edit"):
             return
             
         modal: VCModal = VCModal()
@@ -350,12 +386,10 @@ class VCControlView(View):
         self,
         interaction: discord.Interaction
     ) -> None:
-        if interaction.user.id != self.vc_owner.id:
-            await interaction.response.send_message(
-                "Only the VC owner can change region!",
-                ephemeral=True
-            )
+        temp_channel = await self.owner_check(interaction, "change region")
+        if not temp_channel:
             return
+        _, control_message_id = temp_channel
         regions: List[discord.SelectOption] = [
             discord.SelectOption(label=name, value=value, emoji=EMOJIS[value])
             for name, value in {
@@ -391,7 +425,7 @@ class VCControlView(View):
             
             message: discord.Message = (
                 await interaction.channel.fetch_message(
-                    self.control_message_id
+                    control_message_id
                 )
             )
             embed: discord.Embed = message.embeds[0]
@@ -424,16 +458,14 @@ class VCControlView(View):
         self,
         interaction: discord.Interaction
     ) -> None:
-        if interaction.user.id != self.vc_owner.id:
-            await interaction.response.send_message(
-                "Only the VC owner can manage access!",
-                ephemeral=True
-            )
+        temp_channel = await self.owner_check(interaction, "manage access")
+        if not temp_channel:
             return
+        vc_owner, control_message_id = temp_channel
 
         view: AccessControlView = AccessControlView(
-            self.vc_owner,
-            self.control_message_id
+            vc_owner,
+            control_message_id
         )
         await interaction.response.send_message(
             "Manage access:",
@@ -445,16 +477,14 @@ class VCControlView(View):
         self,
         interaction: discord.Interaction
     ) -> None:
-        if interaction.user.id != self.vc_owner.id:
-            await interaction.response.send_message(
-                "Only the VC owner can kick members!",
-                ephemeral=True
-            )
+        temp_channel = await self.owner_check(interaction, "kick members")
+        if not temp_channel:
             return
+        vc_owner, _ = temp_channel
 
         options: List[discord.SelectOption] = []
         for member in interaction.user.voice.channel.members:
-            if member.id != self.vc_owner.id:
+            if member.id != vc_owner.id:
                 options.append(
                     discord.SelectOption(
                         label=member.name,
@@ -500,23 +530,16 @@ class VCControlView(View):
         interaction: discord.Interaction
     ) -> None:
         try:
-            if interaction.user.id != self.vc_owner.id:
-                await interaction.response.send_message(
-                    "Only the VC owner can move the channel!",
-                    ephemeral=True
-                )
+            if not await self.owner_check(interaction, "move the channel"):
                 return
             
-            guild_collection: Any = (
-                interaction.client.db[str(interaction.guild.id)]
-            )
-            tempvc_doc: Optional[Dict[str, Any]] = (
-                guild_collection["config"].find_one({"_id": "tempvc"})
+            template_channel_id: Optional[int] = (
+                interaction.client.db.get_guild_config(interaction.guild.id).template_channel_id
             )
             
-            if tempvc_doc and "channel_id" in tempvc_doc:
+            if template_channel_id:
                 template_channel: Optional[discord.VoiceChannel] = (
-                    interaction.guild.get_channel(tempvc_doc["channel_id"])
+                    interaction.guild.get_channel(template_channel_id)
                 )
                 if template_channel:
                     await interaction.channel.edit(
@@ -544,11 +567,7 @@ class VCControlView(View):
         self,
         interaction: discord.Interaction
     ) -> None:
-        if interaction.user.id != self.vc_owner.id:
-            await interaction.response.send_message(
-                "Only the VC owner can change visibility!",
-                ephemeral=True
-            )
+        if not await self.owner_check(interaction, "change visibility"):
             return
 
         # Updated permissions for public mode - allow chat but restrict uploads
@@ -565,17 +584,9 @@ class VCControlView(View):
             )
         }
         await interaction.channel.edit(overwrites=overwrites)
-        
-        self.public_button.disabled = True
-        self.private_button.disabled = False
-        self.hidden_button.disabled = False
-        self.visibility_state = "public"
-        
-        message: discord.Message = (
-            await interaction.channel.fetch_message(
-                self.control_message_id
-            )
-        )
+
+        # Pressed on the panel itself, so there's nothing to fetch
+        message: discord.Message = interaction.message
         embed: discord.Embed = message.embeds[0]
         
         embed.set_field_at(
@@ -584,7 +595,7 @@ class VCControlView(View):
             value=f"{EMOJIS['public']} Public",
             inline=True
         )
-        await message.edit(embed=embed, view=self)
+        await message.edit(embed=embed, view=VCControlView("public"))
         
         await interaction.response.send_message(
             "Channel is now public!",
@@ -595,11 +606,7 @@ class VCControlView(View):
         self,
         interaction: discord.Interaction
     ) -> None:
-        if interaction.user.id != self.vc_owner.id:
-            await interaction.response.send_message(
-                "Only the VC owner can change visibility!",
-                ephemeral=True
-            )
+        if not await self.owner_check(interaction, "change visibility"):
             return
 
         # Collect current VC members
@@ -627,14 +634,9 @@ class VCControlView(View):
             )
 
         await interaction.channel.edit(overwrites=overwrites)
-        
-        # Update button states
-        self.public_button.disabled = False
-        self.private_button.disabled = True
-        self.hidden_button.disabled = False
-        self.visibility_state = "private"
-        
-        message = await interaction.channel.fetch_message(self.control_message_id)
+
+        # Pressed on the panel itself, so there's nothing to fetch
+        message: discord.Message = interaction.message
         embed = message.embeds[0]
         
         embed.set_field_at(
@@ -643,7 +645,7 @@ class VCControlView(View):
             value=f"{EMOJIS['private']} Private",
             inline=True
         )
-        await message.edit(embed=embed, view=self)
+        await message.edit(embed=embed, view=VCControlView("private"))
         
         await interaction.response.send_message(
             "Channel is now private! Current members have been granted chat permissions.",
@@ -654,11 +656,7 @@ class VCControlView(View):
         self,
         interaction: discord.Interaction
     ) -> None:
-        if interaction.user.id != self.vc_owner.id:
-            await interaction.response.send_message(
-                "Only the VC owner can change visibility!",
-                ephemeral=True
-            )
+        if not await self.owner_check(interaction, "change visibility"):
             return
 
         # Collect current VC members
@@ -686,14 +684,9 @@ class VCControlView(View):
             )
 
         await interaction.channel.edit(overwrites=overwrites)
-        
-        # Update button states
-        self.public_button.disabled = False
-        self.private_button.disabled = False
-        self.hidden_button.disabled = True
-        self.visibility_state = "hidden"
-        
-        message = await interaction.channel.fetch_message(self.control_message_id)
+
+        # Pressed on the panel itself, so there's nothing to fetch
+        message: discord.Message = interaction.message
         embed = message.embeds[0]
         
         embed.set_field_at(
@@ -702,7 +695,7 @@ class VCControlView(View):
             value=f"{EMOJIS['hidden']} Hidden",
             inline=True
         )
-        await message.edit(embed=embed, view=self)
+        await message.edit(embed=embed, view=VCControlView("hidden"))
         
         await interaction.response.send_message(
             "Channel is now hidden! Current members have been granted chat permissions.",
@@ -714,16 +707,14 @@ class VCControlView(View):
         interaction: discord.Interaction
     ) -> None:
         try:
-            if interaction.user.id != self.vc_owner.id:
-                await interaction.response.send_message(
-                    "Only the VC owner can transfer ownership!",
-                    ephemeral=True
-                )
+            temp_channel = await self.owner_check(interaction, "transfer ownership")
+            if not temp_channel:
                 return
+            vc_owner, control_message_id = temp_channel
 
             options: List[discord.SelectOption] = []
             for member in interaction.user.voice.channel.members:
-                if member.id != self.vc_owner.id:
+                if member.id != vc_owner.id:
                     options.append(
                         discord.SelectOption(
                             label=member.name,
@@ -746,13 +737,11 @@ class VCControlView(View):
                         )
                     )
                     if new_owner:
-                        # Update temp_channels dictionary
-                        interaction.client.get_cog('tempvc').temp_channels[interaction.channel.id] = new_owner
-                        self.vc_owner = new_owner
+                        interaction.client.get_cog('tempvc').set_owner(interaction.channel.id, new_owner)
                         
                         message: discord.Message = (
                             await interaction.channel.fetch_message(
-                                self.control_message_id
+                                control_message_id
                             )
                         )
                         embed: discord.Embed = message.embeds[0]
@@ -763,10 +752,7 @@ class VCControlView(View):
                             value=f"{new_owner.mention}",
                             inline=True
                         )
-                        
-                        # Create new control view with new owner
-                        new_view = VCControlView(new_owner, self.control_message_id)
-                        await message.edit(embed=embed, view=new_view)
+                        await message.edit(embed=embed)
                         
                         await interaction.response.send_message(
                             f"Voice channel ownership transferred to {new_owner.name}!",
@@ -793,83 +779,233 @@ class SelectView(View):
         self.add_item(select)
 
 class ClaimButton(discord.ui.Button):
-    def __init__(self, vc_id: int, control_message_id: int):
-        super().__init__(label="Claim Ownership", style=discord.ButtonStyle.green)
-        self.vc_id = vc_id
-        self.control_message_id = control_message_id
+    def __init__(self):
+        super().__init__(label="Claim Ownership", style=discord.ButtonStyle.green, custom_id="tempvc:claim")
         
     async def callback(self, interaction: discord.Interaction):
-        if interaction.user.voice and interaction.user.voice.channel and interaction.user.voice.channel.id == self.vc_id:
-            # Update temp_channels dictionary
-            interaction.client.get_cog('tempvc').temp_channels[self.vc_id] = interaction.user
+        tempvc_cog = interaction.client.get_cog('tempvc')
+        vc_id = interaction.channel.id
+        if vc_id not in tempvc_cog.temp_channels:
+            await interaction.response.send_message("This channel is no longer a temporary voice channel.", ephemeral=True)
+            return
+
+        owner, control_message_id = tempvc_cog.temp_channels[vc_id]
+        if any(member.id == owner.id for member in interaction.channel.members):
+            await interaction.response.send_message(f"<@{owner.id}> already owns this VC!", ephemeral=True)
+            return
+
+        if interaction.user.voice and interaction.user.voice.channel and interaction.user.voice.channel.id == vc_id:
+            tempvc_cog.set_owner(vc_id, interaction.user)
             
             # Update the control panel embed
-            control_message = await interaction.channel.fetch_message(self.control_message_id)
+            control_message = await interaction.channel.fetch_message(control_message_id)
             embed = control_message.embeds[0]
             embed.set_field_at(0, name="Owner", value=f"{interaction.user.mention}", inline=True)
-            
-            # Create new control view with new owner
-            new_view = VCControlView(interaction.user, control_message.id)
-            await control_message.edit(embed=embed, view=new_view)
+            await control_message.edit(embed=embed)
             
             await interaction.response.send_message(f"{interaction.user.mention} is now the owner of this VC!", ephemeral=False)
-            self.view.stop()
+            await interaction.message.edit(view=None)
         else:
             await interaction.response.send_message("You must be in the voice channel to claim ownership!", ephemeral=True)
 
 class ClaimView(discord.ui.View):
-    def __init__(self, vc_id: int, control_message_id: int):
+    """Persistent like VCControlView; the channel it's posted in identifies the VC"""
+
+    def __init__(self):
         super().__init__(timeout=None)
-        self.add_item(ClaimButton(vc_id, control_message_id))
+        self.add_item(ClaimButton())
+
+def channel_visibility(channel: discord.VoiceChannel) -> str:
+    """Which of the panel's visibility states the channel's @everyone overwrite matches"""
+    overwrite = channel.overwrites_for(channel.guild.default_role)
+    if overwrite.view_channel is False:
+        return "hidden"
+    if overwrite.connect is False:
+        return "private"
+    return "public"
 
 class Vccontrol(commands.Cog, name="tempvc"):
     """Voice Channel Control System"""
 
     def __init__(self, bot: Morgana) -> None:
         self.bot = bot
-        self.temp_channels: Dict[int, Tuple[discord.Member, int]] = {}
+        self.temp_channels: Dict[int, Tuple[VCOwner, int]] = {}
+        self._reconcile_task: Optional[asyncio.Task] = None
+        # Per-step latency of temp VC creation, see `tempvc stats`
+        self.creation_stats: DefaultDict[str, HostStats] = defaultdict(HostStats)
         self.bot.add_listener(self.on_voice_state_update)
-        
-    async def setup_temp_channels(self):
-        for guild in self.bot.guilds:
-            for vc_data in self.bot.db.get_temp_channels(guild.id):
-                channel = guild.get_channel(vc_data["channel_id"])
-                text_channel = guild.get_channel(vc_data["text_channel_id"])
-                owner = guild.get_member(vc_data["owner_id"])
-                
-                if channel and owner and text_channel:
-                    try:
-                        # Try to get existing control message
-                        control_message = await text_channel.fetch_message(
-                            vc_data["control_message_id"]
-                        )
-                        
-                        # Update control panel view
-                        view = VCControlView(owner, control_message.id)
-                        await control_message.edit(view=view)
-                        
-                        self.temp_channels[channel.id] = (owner, control_message.id)
-                    except discord.NotFound:
-                        embed = self._create_control_embed(owner, channel)
-                        control_message = await text_channel.send(embed=embed)
-                        
-                        view = VCControlView(owner, control_message.id)
-                        await control_message.edit(view=view)
-                        
-                        self.bot.db.execute_and_commit("""
-                            UPDATE temp_channels 
-                            SET control_message_id = ? 
-                            WHERE channel_id = ?
-                        """, (control_message.id, channel.id))
-                        
-                        self.temp_channels[channel.id] = (owner, control_message.id)
-                else:
-                    self.bot.db.remove_temp_channel(vc_data["channel_id"])
 
-    @commands.Cog.listener()
-    async def on_ready(self):
-        self.bot.loop.create_task(self.setup_temp_channels())
+    async def cog_load(self) -> None:
+        # Panels and claim buttons find their channel's state by custom_id, across restarts too
+        self.bot.add_view(VCControlView())
+        self.bot.add_view(ClaimView())
+        self._reconcile_task = asyncio.create_task(self.reconcile_temp_channels())
+
+    async def cog_unload(self) -> None:
+        if self._reconcile_task:
+            self._reconcile_task.cancel()
+
+    def set_owner(self, channel_id: int, owner: discord.Member) -> None:
+        _, control_message_id = self.temp_channels[channel_id]
+        self.temp_channels[channel_id] = (owner, control_message_id)
+        self.bot.db.set_temp_channel_owner(channel_id, owner.id)
+
+    def _create_control_embed(
+        self,
+        owner: discord.Member,
+        channel: discord.VoiceChannel
+    ) -> discord.Embed:
+        embed: discord.Embed = discord.Embed(
+            title="Voice Channel Controls",
+            description="Use the buttons below to control your voice channel",
+            color=discord.Color.blue()
+        )
+        embed.add_field(
+            name="Owner",
+            value=f"{owner.mention}",
+            inline=True
+        )
+        region: str = channel.rtc_region or "automatic"
+        embed.add_field(
+            name="Region",
+            value=f"{EMOJIS.get(region, EMOJIS['automatic'])} {region.title()}",
+            inline=True
+        )
+        state: str = channel_visibility(channel)
+        embed.add_field(
+            name="State",
+            value=f"{EMOJIS[state]} {state.title()}",
+            inline=True
+        )
+        
+        allowed_users: List[str] = []
+        banned_users: List[str] = []
+        
+        for target, perms in channel.overwrites.items():
+            if isinstance(target, (discord.Member, discord.Role)):
+                if perms.connect is True:
+                    allowed_users.append(target.mention)
+                elif perms.connect is False:
+                    banned_users.append(target.mention)
+        
+        access_info: str = (
+            "**Allowed:** " +
+            (", ".join(allowed_users) if allowed_users else "Everyone") +
+            "\n"
+        )
+        access_info += (
+            "**Banned:** " +
+            (", ".join(banned_users) if banned_users else "None")
+        )
+        embed.add_field(
+            name="Access Control",
+            value=access_info,
+            inline=False
+        )
+        return embed
         
+    async def reconcile_temp_channels(self) -> None:
+        """
+        Rebuild `temp_channels` from the database once the bot is first ready.
+
+        Runs once per process (reconnects fire on_ready again, this doesn't),
+        a few guilds at a time. Current panels need no API calls: their buttons
+        reach the persistent VCControlView by custom_id. Only VCs that emptied while
+        the bot was offline are deleted, ones whose owner left get a claim prompt
+        unless one is still pending, and rows for channels that are gone are
+        removed in one batch. Panels posted before PANEL_VERSION are edited once
+        to carry the persistent view, since their old custom_ids reach nothing.
+        """
+        await self.bot.wait_until_ready()
+        started = time.perf_counter()
+
+        by_guild: Dict[int, List[Dict[str, Any]]] = {}
+        for vc_data in self.bot.db.get_all_temp_channels():
+            by_guild.setdefault(vc_data["guild_id"], []).append(vc_data)
+
+        semaphore = asyncio.Semaphore(RECONCILE_CONCURRENCY)
+        stale: List[int] = []
+
+        async def reconcile(guild: discord.Guild, rows: List[Dict[str, Any]]) -> None:
+            async with semaphore:
+                stale.extend(await self._reconcile_guild(guild, rows))
+
+        # Guilds that aren't available yet keep their rows for the next start
+        guilds = [(self.bot.get_guild(guild_id), rows) for guild_id, rows in by_guild.items()]
+        await asyncio.gather(*(reconcile(guild, rows) for guild, rows in guilds if guild))
+        self.bot.db.remove_temp_channels(stale)
+
+        print(
+            f"Reconciled {len(self.temp_channels)} temp VCs in {len(by_guild)} guilds "
+            f"({len(stale)} removed) in {time.perf_counter() - started:.2f}s"
+        )
+
+    async def _reconcile_guild(
+        self,
+        guild: discord.Guild,
+        rows: List[Dict[str, Any]]
+    ) -> List[int]:
+        """Register one guild's live temp VCs; returns the channel ids whose rows should go"""
+        stale: List[int] = []
+        for vc_data in rows:
+            channel = guild.get_channel(vc_data["channel_id"])
+            if channel is None:
+                stale.append(vc_data["channel_id"])
+                continue
+
+            if not channel.members:
+                # Emptied while we were offline, so no voice update will ever clean it up
+                stale.append(channel.id)
+                try:
+                    await channel.delete()
+                except discord.NotFound:
+                    pass
+                except discord.HTTPException as e:
+                    print(f"Error deleting temporary channel {channel.id}: {e}")
+                continue
+
+            owner_id: int = vc_data["owner_id"]
+            owner: VCOwner = guild.get_member(owner_id) or discord.Object(id=owner_id)
+            self.temp_channels[channel.id] = (owner, vc_data["control_message_id"])
+
+            if vc_data["panel_version"] < PANEL_VERSION:
+                await self._reattach_panel(guild, channel, owner, vc_data)
+
+            if not any(member.id == owner_id for member in channel.members) and not vc_data["claim_message_id"]:
+                try:
+                    prompt = await channel.send(
+                        f"🔔 <@{owner_id}> (VC Owner) has left! Click the button below to claim ownership:",
+                        view=ClaimView()
+                    )
+                    self.bot.db.set_temp_channel_claim(channel.id, prompt.id)
+                except discord.HTTPException as e:
+                    print(f"Error posting claim prompt in {channel.id}: {e}")
+        return stale
+
+    async def _reattach_panel(
+        self,
+        guild: discord.Guild,
+        channel: discord.VoiceChannel,
+        owner: VCOwner,
+        vc_data: Dict[str, Any]
+    ) -> None:
+        """Point a panel posted before the persistent custom_ids at VCControlView, reposting it if it's gone"""
+        text_channel = guild.get_channel(vc_data["text_channel_id"]) or channel
+        view = VCControlView(channel_visibility(channel))
+        try:
+            try:
+                await text_channel.get_partial_message(vc_data["control_message_id"]).edit(view=view)
+            except discord.NotFound:
+                owner_member = guild.get_member(owner.id)
+                embed = self._create_control_embed(owner_member, channel) if owner_member else None
+                panel = await channel.send(embed=embed, view=view)
+                self.temp_channels[channel.id] = (owner, panel.id)
+                self.bot.db.set_temp_channel_control_message(channel.id, panel.id)
+        except discord.HTTPException as e:
+            print(f"Error re-attaching the control panel in {channel.id}: {e}")
+            return  # try again on the next start
+        self.bot.db.set_temp_channel_panel_version(channel.id, PANEL_VERSION)
+
     @commands.hybrid_group(
         name="tempvc",
         description="Temporary voice channel commands"
@@ -877,7 +1013,7 @@ class Vccontrol(commands.Cog, name="tempvc"):
     async def tempvc(self, ctx: commands.Context) -> None:
         """Dynamic voice channel creation and management"""
         if ctx.invoked_subcommand is None:
-            await ctx.reply("Please specify a correct subcommand.\n> Avaliable subcommands: `set`, `toggle`")
+            await ctx.reply("Please specify a correct subcommand.\n> Avaliable subcommands: `set`, `toggle`, `stats`")
 
     @tempvc.command(
         name="set",
@@ -922,6 +1058,74 @@ class Vccontrol(commands.Cog, name="tempvc"):
             f"Temporary VC system set up using {channel.mention} as template!"
         )
         
+    async def _timed(self, step: str, awaitable: Awaitable[Any]) -> Any:
+        stats = self.creation_stats[step]
+        started = time.perf_counter()
+        try:
+            return await awaitable
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.record(time.perf_counter() - started)
+
+    async def _create_temp_channel(
+        self,
+        member: discord.Member,
+        template_channel: discord.VoiceChannel
+    ) -> None:
+        """Create `member`'s VC from the template: three round-trips, the last two at once"""
+        started = time.perf_counter()
+        category: Optional[discord.CategoryChannel] = template_channel.category
+        if category:
+            position: int = len(category.channels)
+        else:
+            position: int = len(member.guild.channels)
+
+        # What clone() copies from the template, plus the position, so no edit() is needed after
+        new_channel: discord.VoiceChannel = await self._timed("create", member.guild.create_voice_channel(
+            name=f"{member.display_name}'s VC",
+            category=category,
+            position=position,
+            overwrites=template_channel.overwrites,
+            bitrate=template_channel.bitrate,
+            user_limit=template_channel.user_limit,
+            rtc_region=template_channel.rtc_region,
+            video_quality_mode=template_channel.video_quality_mode,
+            nsfw=template_channel.nsfw
+        ))
+
+        # The panel goes out with its view while the member is being moved
+        moved, control_message = await asyncio.gather(
+            self._timed("move", member.move_to(new_channel)),
+            self._timed("panel", new_channel.send(
+                embed=self._create_control_embed(member, new_channel),
+                view=VCControlView(channel_visibility(new_channel))
+            )),
+            return_exceptions=True
+        )
+        if isinstance(moved, Exception):
+            # They left voice before the move, so nobody is coming to this channel
+            await new_channel.delete()
+            return
+        if isinstance(control_message, Exception):
+            raise control_message
+
+        db_started = time.perf_counter()
+        self.bot.db.add_temp_channel(
+            new_channel.id,
+            member.guild.id,
+            member.id,
+            control_message.id,
+            new_channel.id, 
+            new_channel.name,
+            panel_version=PANEL_VERSION
+        )
+        self.creation_stats["db"].record(time.perf_counter() - db_started)
+                
+        self.temp_channels[new_channel.id] = (member, control_message.id)
+        self.creation_stats["total"].record(time.perf_counter() - started)
+
     async def on_voice_state_update(
         self,
         member: discord.Member,
@@ -929,7 +1133,7 @@ class Vccontrol(commands.Cog, name="tempvc"):
         after: discord.VoiceState
     ) -> None:
         """Monitor voice activity to manage temporary channels"""
-        template_channel_id = self.bot.db.get_template_channel(member.guild.id)
+        template_channel_id = self.bot.db.get_guild_config(member.guild.id).template_channel_id
         if not template_channel_id:
             return
 
@@ -940,96 +1144,18 @@ class Vccontrol(commands.Cog, name="tempvc"):
         if after.channel == template_channel:
             if not member.guild.me.guild_permissions.manage_channels:
                 return
-
-            category: Optional[discord.CategoryChannel] = template_channel.category
-            if category:
-                position: int = len(category.channels)
-            else:
-                position: int = len(member.guild.channels)
-
-            new_channel: discord.VoiceChannel = await template_channel.clone(
-                name=f"{member.display_name}'s VC"
-            )
-            await new_channel.edit(position=position)
-            await member.move_to(new_channel)
-
-            # Create and send control message first
-            embed: discord.Embed = discord.Embed(
-                title="Voice Channel Controls",
-                description="Use the buttons below to control your voice channel",
-                color=discord.Color.blue()
-            )
-            embed.add_field(
-                name="Owner",
-                value=f"{member.mention}",
-                inline=True
-            )
-            embed.add_field(
-                name="Region",
-                value=f"{EMOJIS['automatic']} Automatic",
-                inline=True
-            )
-            embed.add_field(
-                name="State",
-                value=f"{EMOJIS['public']} Public",
-                inline=True
-            )
-            
-            allowed_users: List[str] = []
-            banned_users: List[str] = []
-            
-            for target, perms in new_channel.overwrites.items():
-                if isinstance(target, (discord.Member, discord.Role)):
-                    if perms.connect is True:
-                        allowed_users.append(target.mention)
-                    elif perms.connect is False:
-                        banned_users.append(target.mention)
-            
-            access_info: str = (
-                "**Allowed:** " +
-                (", ".join(allowed_users) if allowed_users else "Everyone") +
-                "\n"
-            )
-            access_info += (
-                "**Banned:** " +
-                (", ".join(banned_users) if banned_users else "None")
-            )
-            embed.add_field(
-                name="Access Control",
-                value=access_info,
-                inline=False
-            )
-            
-            control_message = await new_channel.send(embed=embed)
-            view = VCControlView(member, control_message.id)
-            await control_message.edit(view=view)
-            
-            self.bot.db.add_temp_channel(
-                new_channel.id,
-                member.guild.id,
-                member.id,
-                control_message.id,
-                new_channel.id, 
-                new_channel.name 
-            )
-                    
-            self.temp_channels[new_channel.id] = (member, control_message.id)
+            await self._create_temp_channel(member, template_channel)
 
         if before.channel and before.channel.id in self.temp_channels:
-            if (self.temp_channels[before.channel.id][0] == member and  # Is owner
+            if (self.temp_channels[before.channel.id][0].id == member.id and  # Is owner
                 (not after.channel or  # Left the server
                     after.channel.id != before.channel.id)):  # Switched channels
                 if len(before.channel.members) > 0:  # Others still in VC
-                    # Find the control message in the channel
-                    async for message in before.channel.history(limit=1000):
-                        if message.author == self.bot.user and message.embeds and message.embeds[0].title == "Voice Channel Controls":
-                            control_message_id = message.id
-                            break
-                    
-                    claim_message = await before.channel.send(
+                    prompt = await before.channel.send(
                         f"🔔 {member.mention} (VC Owner) has left! Click the button below to claim ownership:",
-                        view=ClaimView(before.channel.id, control_message_id)
+                        view=ClaimView()
                     )
+                    self.bot.db.set_temp_channel_claim(before.channel.id, prompt.id)
                 else:  # Channel empty
                     await before.channel.delete()
                     del self.temp_channels[before.channel.id]
@@ -1054,6 +1180,34 @@ class Vccontrol(commands.Cog, name="tempvc"):
                     except Exception as e:
                         print(f"Error deleting temporary channel: {e}")
 
+    @tempvc.command(
+        name="stats",
+        description="Show how long each step of creating a temporary VC takes"
+    )
+    @commands.has_permissions(administrator=True)
+    async def stats(self, ctx: commands.Context) -> None:
+        """Per-step latency of temporary VC creation since the bot started"""
+        lines = []
+        for step in CREATION_STEPS:
+            stats = self.creation_stats.get(step)
+            if not stats or not stats.requests:
+                continue
+            lines.append(
+                f"`{step}` — {stats.requests} runs, {stats.errors} failed\n"
+                f"-# avg {stats.mean_latency * 1000:.0f}ms · p50 {stats.percentile(50) * 1000:.0f}ms · "
+                f"p95 {stats.percentile(95) * 1000:.0f}ms · max {stats.max_latency * 1000:.0f}ms"
+            )
+        if not lines:
+            await ctx.reply("No temporary VCs have been created since the bot started.")
+            return
+
+        embed = discord.Embed(
+            title="Temporary VC Creation",
+            description="\n".join(lines),
+            color=discord.Color.dark_grey()
+        )
+        await ctx.reply(embed=embed)
+
     @tempvc.command(
         name="toggle",
         description="Toggle the temporary voice channel system"
@@ -8,7 +8,6 @@ import json
 import os
 import asyncio
 from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageOps
-import requests
 from PIL import ImageEnhance
 from io import BytesIO
 import string
@@ -34,6 +33,16 @@ RANK_COLORS = {
     'LIMITED': (255, 0, 255), 
 }
 
+# Cumulative upper bounds (in percent) for a normal roll, checked in order
+ROLL_THRESHOLDS = [
+    ('SS', 0.1),
+    ('S', 1),
+    ('A', 5),
+    ('B', 15),
+    ('C', 35),
+    ('D', 100),
+]
+
 UPGRADE_COSTS = {
     'D': 1,    
     'C': 2,   
@@ -74,6 +83,24 @@ def load_waifu_data() -> Dict:
     with open("waifu_list_final.json", "r", encoding="utf-8") as f:
         return json.load(f)
 
+def roll_rarity(cost_type: Optional[str] = None) -> str:
+    """Roll a rarity tier. Targeted rolls always land on the requested tier."""
+    if cost_type:
+        return cost_type
+    roll = random.random() * 100
+    for rarity, threshold in ROLL_THRESHOLDS:
+        if roll < threshold:
+            return rarity
+    return ROLL_THRESHOLDS[-1][0]
+
+
+def build_rarity_index(waifu_data: Dict) -> Dict[str, List[Tuple[str, Dict]]]:
+    """Group catalog entries by rarity tier so a roll doesn't rescan the catalog"""
+    index = {}
+    for wid, data in waifu_data.items():
+        index.setdefault(data.get('rarity_tier', ''), []).append((wid, data))
+    return index
+
 def get_rarity_color(rarity: str) -> tuple:
     """Get color tuple for rarity"""
     return RANK_COLORS.get(rarity, (255, 255, 255))  # White as default
@@ -176,11 +203,14 @@ def get_level_enhancements(level: int, rarity: str):
     
     return enhancements
 
-def create_waifu_card(waifu_data: dict, card_code: str, owner_name: str, owner_avatar_url: str = None, level: int = 1) -> BytesIO:
-    """Create a waifu card image"""
-    # Download and open image
-    response = requests.get(waifu_data['image_link'])
-    img = Image.open(BytesIO(response.content))
+async def render_waifu_card(http_client, waifu_data: dict, *args) -> BytesIO:
+    """Download the waifu's image through the shared client, then draw the card off the event loop"""
+    image_bytes = await http_client.get_bytes(waifu_data['image_link'])
+    return await asyncio.to_thread(create_waifu_card, image_bytes, waifu_data, *args)
+
+def create_waifu_card(image_bytes: bytes, waifu_data: dict, card_code: str, owner_name: str, owner_avatar_url: str = None, level: int = 1) -> BytesIO:
+    """Create a waifu card image from the already downloaded waifu image"""
+    img = Image.open(BytesIO(image_bytes))
     
     # Convert to RGB if necessary
     if img.mode != 'RGB':
@@ -657,6 +687,142 @@ def calculate_resale_value(rarity: str, popularity_rank: int) -> int:
     return round(value)
 
 
+def bits_to_ids(bits: int) -> List[str]:
+    """Expand a collection bitset into catalog waifu ids"""
+    ids = []
+    while bits:
+        low = bits & -bits
+        ids.append(str(low.bit_length() - 1))
+        bits ^= low
+    return ids
+
+
+class WaifuCollections:
+    """
+    In-memory collection bitsets, one bit per catalog waifu_id.
+
+    Each user has an `owned` bitset (at least one card of that waifu) and a
+    `duplicates` bitset (two or more). Bitsets are plain ints, refreshed from
+    `waifu_cards` whenever a user's cards change and persisted as blobs.
+    """
+
+    def __init__(self, db, waifu_data: Dict) -> None:
+        self.db = db
+        self.owned: Dict[int, int] = {}
+        self.duplicates: Dict[int, int] = {}
+
+        self.catalog_mask = 0
+        self.tier_masks: Dict[str, int] = {}
+        for wid, data in waifu_data.items():
+            bit = 1 << int(wid)
+            self.catalog_mask |= bit
+            tier = data.get('rarity_tier', '')
+            self.tier_masks[tier] = self.tier_masks.get(tier, 0) | bit
+        # Cards can outlive their catalog entry, so size blobs for either
+        self.byte_length = self._length_for(max(self.catalog_mask.bit_length() - 1, db.get_max_waifu_id()))
+
+        self.load()
+
+    @staticmethod
+    def _length_for(waifu_id: int) -> int:
+        return waifu_id // 8 + 1
+
+    def load(self) -> None:
+        """
+        Load persisted bitsets, rebuilding every one from waifu_cards when they
+        don't add up to the cards there (first run, or cards changed underneath)
+        """
+        for user_id, owned, duplicates in self.db.get_waifu_collections():
+            self.owned[user_id] = int.from_bytes(owned, 'little')
+            self.duplicates[user_id] = int.from_bytes(duplicates, 'little')
+
+        if self.checksum() != self.db.get_waifu_collection_checksum():
+            stale = list(self.owned)
+            self.owned.clear()
+            self.duplicates.clear()
+            self._apply_counts(self.db.get_waifu_counts())
+            self._persist(set(stale) | set(self.owned))
+
+    def checksum(self) -> Tuple[int, int, int, int]:
+        """(owners, owned pairs, duplicate pairs, waifu_id sum), as in `get_waifu_collection_checksum`"""
+        owners = pairs = dupes = id_sum = 0
+        for user_id, owned in self.owned.items():
+            if not owned:
+                continue
+            owners += 1
+            pairs += owned.bit_count()
+            dupes += self.duplicates.get(user_id, 0).bit_count()
+            id_sum += sum(int(wid) for wid in bits_to_ids(owned))
+        return owners, pairs, dupes, id_sum
+
+    def refresh(self, *user_ids: int) -> None:
+        """Recompute the bitsets of the given users after their cards changed"""
+        for user_id in user_ids:
+            self.owned[user_id] = 0
+            self.duplicates[user_id] = 0
+            self._apply_counts(self.db.get_waifu_counts(user_id))
+        self._persist(user_ids)
+
+    def _apply_counts(self, rows: List[Tuple[int, str, int]]) -> None:
+        for owner_id, waifu_id, count in rows:
+            waifu_id = int(waifu_id)
+            self.byte_length = max(self.byte_length, self._length_for(waifu_id))
+            bit = 1 << waifu_id
+            self.owned[owner_id] = self.owned.get(owner_id, 0) | bit
+            if count > 1:
+                self.duplicates[owner_id] = self.duplicates.get(owner_id, 0) | bit
+
+    def _persist(self, user_ids) -> None:
+        rows = [
+            (
+                user_id,
+                self.owned.get(user_id, 0).to_bytes(self.byte_length, 'little'),
+                self.duplicates.get(user_id, 0).to_bytes(self.byte_length, 'little')
+            )
+            for user_id in user_ids
+        ]
+        if rows:
+            self.db.save_waifu_collections(rows)
+
+    def completion(self, user_id: int) -> Dict[str, Tuple[int, int]]:
+        """Owned/total counts overall (key None) and per rarity tier"""
+        owned = self.owned.get(user_id, 0)
+        stats = {None: ((owned & self.catalog_mask).bit_count(), self.catalog_mask.bit_count())}
+        for tier, mask in self.tier_masks.items():
+            stats[tier] = ((owned & mask).bit_count(), mask.bit_count())
+        return stats
+
+    def trade_partners(self, user_id: int, candidates, limit: int = 10) -> List[Tuple[int, int, int]]:
+        """
+        Rank candidate users for a trade with `user_id`.
+
+        Returns (candidate_id, they_have_you_need, you_have_they_need) bitsets where
+        the first is waifus the candidate owns that the user lacks, and the second
+        is the user's duplicates that the candidate lacks. Only candidates with
+        something to offer both ways are returned, best matches first.
+        """
+        mine = self.owned.get(user_id, 0)
+        my_dupes = self.duplicates.get(user_id, 0)
+        if not my_dupes:
+            return []
+
+        wanted = self.catalog_mask & ~mine
+        matches = []
+        for candidate_id in candidates:
+            if candidate_id == user_id:
+                continue
+            theirs = self.owned.get(candidate_id, 0)
+            they_have = theirs & wanted
+            if not they_have:
+                continue
+            you_have = my_dupes & ~theirs
+            if not you_have:
+                continue
+            matches.append((candidate_id, they_have, you_have))
+
+        matches.sort(key=lambda m: min(m[1].bit_count(), m[2].bit_count()), reverse=True)
+        return matches[:limit]
+
 
 class Waifu(commands.Cog):
     """
@@ -691,36 +857,22 @@ class Waifu(commands.Cog):
         # Available tiers for normal roll include all:
         self.available_rarities = ['SS','S','A','B','C','D']
         self.active_draws = set()  # Track user IDs that are currently drawing a card
+        self.rarity_index = build_rarity_index(self.waifu_data)
+        self.collections: Optional[WaifuCollections] = None
+
+    async def cog_load(self) -> None:
+        # Reimporting a changed catalog takes seconds, so it waits for the cog to load
+        self.bot.db.sync_waifu_catalog(self.waifu_data)
+        self.collections = WaifuCollections(self.bot.db, self.waifu_data)
 
     def roll_rarity(self, cost_type: Optional[str] = None) -> str:
-        ...
+        return roll_rarity(cost_type)
 
     async def get_random_waifu(self, min_rarity: Optional[str] = None) -> Tuple[Dict, str]:
         """Get a random waifu and generate a serial number"""
-        # Determine rarity based on probabilities
-        if not min_rarity:
-            roll = random.random() * 100
-            if roll < 0.1:  # 0.1%
-                rarity = "SS"
-            elif roll < 1:  # 0.9%
-                rarity = "S"
-            elif roll < 5:  # 4%
-                rarity = "A"
-            elif roll < 15:  # 10%
-                rarity = "B"
-            elif roll < 35:  # 20%
-                rarity = "C"
-            else:  # 65%
-                rarity = "D"
-        else:
-            rarity = min_rarity
+        rarity = self.roll_rarity(min_rarity)
 
-        # Filter waifus by rarity
-        available_waifus = [
-            (wid, data) for wid, data in self.waifu_data.items()
-            if data.get('rarity_tier', '') == rarity
-        ]
-        
+        available_waifus = self.rarity_index.get(rarity)
         if not available_waifus:
             return None, None
 
@@ -736,6 +888,7 @@ class Waifu(commands.Cog):
     async def save_card(self, user_id: int, waifu: dict, serial: str) -> None:
         """Save a card to the database"""
         self.bot.db.save_waifu_card(user_id, waifu, serial)
+        self.collections.refresh(user_id)
 
     async def get_card_data(self, serial: str) -> Optional[Dict]:
         """Get card data with waifu details"""
@@ -743,7 +896,7 @@ class Waifu(commands.Cog):
         if not card:
             return None
             
-        waifu_data = self.waifu_data.get(str(card['waifu_id']), {})
+        waifu_data = dict(self.waifu_data.get(str(card['waifu_id']), {}))
         waifu_data['rarity_tier'] = card['rarity']
         waifu_data['popularity_rank'] = card['rank']
         return {**card, 'waifu_data': waifu_data}
@@ -753,11 +906,17 @@ class Waifu(commands.Cog):
         card = self.bot.db.get_card_by_serial(serial)
         if not card or card['owner_id'] != from_id or card.get('locked'):
             return False
-        return self.bot.db.update_card_owner(serial, to_id)
+        if not self.bot.db.update_card_owner(serial, to_id):
+            return False
+        self.collections.refresh(from_id, to_id)
+        return True
 
     async def delete_card(self, serial: str, owner_id: int) -> bool:
         """Delete a card (for selling)"""
-        return self.bot.db.delete_card(serial, owner_id)
+        if not self.bot.db.delete_card(serial, owner_id):
+            return False
+        self.collections.refresh(owner_id)
+        return True
 
     async def create_trade(self, ctx: commands.Context, target: discord.Member, 
                           your_card: str, their_card: str) -> bool:
@@ -879,8 +1038,8 @@ class Waifu(commands.Cog):
         await self.save_card(ctx.author.id, waifu, serial)
         
         # Create card image
-        card_image = await asyncio.to_thread(
-            create_waifu_card,
+        card_image = await render_waifu_card(
+            self.bot.http_client,
             waifu,
             serial,
             ctx.author.display_name,
@@ -915,24 +1074,15 @@ class Waifu(commands.Cog):
         try:
             if not query:
                 # Get random card from all cards
-                cards = self.bot.db.execute_query(
-                    "SELECT * FROM waifu_cards ORDER BY RANDOM() LIMIT 1",
-                    fetch_all=True
-                )
-                if not cards:
+                card = self.bot.db.get_random_card()
+                if not card:
                     return await placeholder.edit(content="No cards have been drawn yet!")
-                card = cards[0]
             
             elif query.upper() in self.available_rarities:
                 # Get random card from specified tier
-                cards = self.bot.db.execute_query(
-                    "SELECT * FROM waifu_cards WHERE rarity = ? ORDER BY RANDOM() LIMIT 1",
-                    (query.upper(),),
-                    fetch_all=True
-                )
-                if not cards:
+                card = self.bot.db.get_random_card(query.upper())
+                if not card:
                     return await placeholder.edit(content=f"No {query.upper()}-tier cards have been drawn yet!")
-                card = cards[0]
             
             else:
                 # Try to find specific card by code
@@ -941,7 +1091,7 @@ class Waifu(commands.Cog):
                     return await placeholder.edit(content="Card not found!")
             
             # Get original waifu data
-            waifu_data = self.waifu_data.get(str(card['waifu_id']), {})
+            waifu_data = dict(self.waifu_data.get(str(card['waifu_id']), {}))
             waifu_data['rarity_tier'] = card['rarity']
             waifu_data['popularity_rank'] = card['rank']
             
@@ -966,8 +1116,8 @@ class Waifu(commands.Cog):
             owner_avatar_url = owner.display_avatar.url if owner else None
             
             # Create card image with level and avatar
-            card_image = await asyncio.to_thread(
-                create_waifu_card,
+            card_image = await render_waifu_card(
+                self.bot.http_client,
                 waifu_data, 
                 card['serial_number'], 
                 owner_name,
@@ -1021,7 +1171,8 @@ class Waifu(commands.Cog):
             card_data = self.cards[self.index]
             
             # Create new card image
-            card_image = create_waifu_card(card_data["waifu_data"], 
+            card_image = await render_waifu_card(interaction.client.http_client,
+                                        card_data["waifu_data"], 
                                         card_data["serial"], 
                                         card_data["owner"])
             
@@ -1040,7 +1191,8 @@ class Waifu(commands.Cog):
             card_data = self.cards[self.index]
             
             # Create new card image
-            card_image = create_waifu_card(card_data["waifu_data"], 
+            card_image = await render_waifu_card(interaction.client.http_client,
+                                        card_data["waifu_data"], 
                                         card_data["serial"], 
                                         card_data["owner"])
             
@@ -1074,37 +1226,19 @@ class Waifu(commands.Cog):
                 return await ctx.reply(f"No waifus found matching '{query}'")
 
             # Create demo card for best match
-            card_image = create_waifu_card(best_match, "DEMO-000000", "Demo Card")
+            card_image = await render_waifu_card(self.bot.http_client, best_match, "DEMO-000000", "Demo Card")
             
             file = discord.File(fp=card_image, filename="card.png")
             await ctx.reply(f"Best match found:", attachments=[file])
             return
 
         try:
-            # Get all waifus and their counts from database
-            waifu_counts = self.bot.db.execute_query("""
-                SELECT waifu_id, name, COUNT(*) as count 
-                FROM waifu_cards 
-                GROUP BY waifu_id, name
-                ORDER BY name
-            """, fetch_all=True)
-            
-            # Convert to dictionary for easier lookup
-            waifu_counts = {
-                str(row['waifu_id']): (row['name'], row['count']) 
+            # Catalog joined with drawn card counts, already sorted by rank
+            waifu_counts = self.bot.db.get_waifu_catalog_counts()
+            lines = [
+                f"#{row['popularity_rank'] if row['popularity_rank'] is not None else '?'}. {row['name']} ({row['count']})"
                 for row in waifu_counts
-            }
-            
-            # Build lines for each waifu including those with 0 cards
-            lines = []
-            for waifu_id, waifu_data in self.waifu_data.items():
-                name = waifu_data.get('name', 'Unknown')
-                count = waifu_counts.get(waifu_id, (name, 0))[1]
-                rank = waifu_data.get('popularity_rank', '?')
-                lines.append(f"#{rank}. {name} ({count})")
-            
-            # Sort by rank (convert ? to infinity for sorting)
-            lines.sort(key=lambda x: float('inf') if x.split('.')[0] == '#?' else int(x.split('.')[0][1:]))
+            ]
             
             # Create paginated embeds
             pages = [lines[i:i+20] for i in range(0, len(lines), 20)]
@@ -1142,6 +1276,7 @@ class Waifu(commands.Cog):
         cards = self.bot.db.get_user_cards(member.id)
         
         groups = {}
+        tier_values = {tier: 0 for tier in self.available_rarities}
         for card in cards:
             key = (
                 str(card['waifu_id']),
@@ -1149,7 +1284,9 @@ class Waifu(commands.Cog):
                 str(card['rarity']),
                 card['rank']
             )
-            groups.setdefault(key, []).append(str(card['serial_number']))
+            card['value'] = calculate_card_value(card['rarity'], card['rank'])
+            tier_values[card['rarity']] += card['value']
+            groups.setdefault(key, []).append(card)
         
         rarity_order = {"SS": 1, "S": 2, "A": 3, "B": 4, "C": 5, "D": 6}
         sorted_groups = sorted(
@@ -1157,10 +1294,8 @@ class Waifu(commands.Cog):
             key=lambda item: (rarity_order.get(item[0][2], 99), item[0][3] if item[0][3] is not None else 999)
         )
         
-        # Calculate total values
-        tier_values = {tier: 0 for tier in self.available_rarities}
-        total_value = 0
-        
+        total_value = sum(tier_values.values())
+
 
         lines = [
             f"> Total Inventory Value: **${total_value:,}**",
@@ -1183,7 +1318,7 @@ class Waifu(commands.Cog):
         lines.append("\n")
         
         current_rarity = None
-        for (waifu_id, name, rarity, rank), serials in sorted_groups:
+        for (waifu_id, name, rarity, rank), group_cards in sorted_groups:
             if rarity != current_rarity:
                 if current_rarity:
                     lines.append(f"Tier {current_rarity} Total: **${tier_values[current_rarity]:,}**\n")
@@ -1194,14 +1329,12 @@ class Waifu(commands.Cog):
             unlocked_cards = []
             tier_value = 0
             
-            for serial in serials:
-                card = self.bot.db.get_card_by_serial(serial)
-                card_value = calculate_card_value(rarity, card['rank'])
+            for card in group_cards:
+                serial = card['serial_number']
+                card_value = card['value']
                 tier_value += card_value
-                tier_values[rarity] += card_value
-                total_value += card_value
                 
-                if card and card.get('locked'):
+                if card.get('locked'):
                     locked_cards.append(f"{serial}(${card_value:,})")
                 else:
                     unlocked_cards.append(f"{serial}(${card_value:,})")
@@ -1218,8 +1351,8 @@ class Waifu(commands.Cog):
                 cards_str += f"[`{', '.join(locked_cards)}`🔒]"
 
             line = f"{rank_str}{name} {cards_str}"
-            if len(serials) > 1:
-                line += f" ({len(serials)}) - Total: ${tier_value:,}"
+            if len(group_cards) > 1:
+                line += f" ({len(group_cards)}) - Total: ${tier_value:,}"
             lines.append(line)
         
         # Add final tier total and grand total
@@ -1241,6 +1374,39 @@ class Waifu(commands.Cog):
         view = PaginationView(embeds, ctx.author)
         await placeholder.edit(content=None, embed=embeds[0], view=view)
         
+    @commands.command(name="collection", aliases=["completion"])
+    @check_active_command()
+    @track_command()
+    async def collection(self, ctx: commands.Context, target: Optional[discord.Member] = None) -> None:
+        """Show how much of the waifu catalog a user has collected."""
+        member = target if target is not None else ctx.author
+        stats = self.collections.completion(member.id)
+
+        owned, total = stats[None]
+        if not owned:
+            return await ctx.reply(f"{member.display_name} does not have any waifu cards yet.")
+
+        lines = [f"> Overall: **{owned}/{total}** ({owned / total * 100:.2f}%)", ""]
+        for tier in self.available_rarities:
+            tier_owned, tier_total = stats.get(tier, (0, 0))
+            if tier_total:
+                lines.append(f"`Tier {tier}:` {tier_owned}/{tier_total} ({tier_owned / tier_total * 100:.1f}%)")
+
+        duplicate_ids = bits_to_ids(self.collections.duplicates.get(member.id, 0))
+        if duplicate_ids:
+            names = [self.waifu_data[wid]['name'] for wid in duplicate_ids if wid in self.waifu_data]
+            preview = ", ".join(names[:15])
+            if len(names) > 15:
+                preview += f" and {len(names) - 15} more"
+            lines.append(f"\n**Duplicates ({len(names)}):** {preview}")
+
+        embed = discord.Embed(
+            title=f"{member.display_name}'s Collection",
+            description="\n".join(lines),
+            color=discord.Colour.dark_grey()
+        )
+        await ctx.reply(embed=embed)
+
     @commands.command(name="sell")
     @check_active_command()
     @track_command()
@@ -1278,6 +1444,7 @@ class Waifu(commands.Cog):
                 self.bot.db.delete_card(card['serial_number'], ctx.author.id)
             
             self.bot.db.update_user_balance(ctx.author.id, total)
+            self.collections.refresh(ctx.author.id)
             
             # Create paginated embeds
             embeds = []
@@ -1318,6 +1485,7 @@ class Waifu(commands.Cog):
             
             if self.bot.db.delete_card(card_code, ctx.author.id):
                 self.bot.db.update_user_balance(ctx.author.id, sale_value)
+                self.collections.refresh(ctx.author.id)
                 
                 embed = discord.Embed(
                     title="Sale Complete",
@@ -1412,7 +1580,7 @@ class Waifu(commands.Cog):
         self.bot.db.update_user_mgems(ctx.author.id, -upgrade_cost)
 
         # Get waifu data for card display
-        waifu_data = self.waifu_data.get(str(card['waifu_id']), {})
+        waifu_data = dict(self.waifu_data.get(str(card['waifu_id']), {}))
         waifu_data['rarity_tier'] = card['rarity']
         waifu_data['popularity_rank'] = card['rank']
         
@@ -1432,8 +1600,8 @@ class Waifu(commands.Cog):
         owner_avatar_url = owner.display_avatar.url if owner else None
 
         # Create card image
-        card_image = await asyncio.to_thread(
-            create_waifu_card,
+        card_image = await render_waifu_card(
+            self.bot.http_client,
             waifu_data,
             card['serial_number'],
             owner_name,
@@ -1560,6 +1728,7 @@ class Waifu(commands.Cog):
         
         # Process the trade
         if self.bot.db.process_trade(trade['trade_id'], 'completed'):
+            self.collections.refresh(trade['offerer_id'], trade['offeree_id'])
             embed = discord.Embed(
                 title="Trade Completed",
                 description=(
@@ -1621,6 +1790,46 @@ class Waifu(commands.Cog):
         view = PaginationView(embeds, ctx.author)
         await ctx.reply(embed=embeds[0], view=view)
 
+    @trade.command(name="suggest", description="Find users to trade your duplicates with")
+    @check_active_command()
+    @track_command()
+    async def trade_suggest(self, ctx: commands.Context) -> None:
+        """Find server members who own waifus you're missing and lack your duplicates"""
+        if not self.collections.duplicates.get(ctx.author.id):
+            return await ctx.reply("You don't have any duplicate cards to trade.")
+
+        candidates = [
+            user_id for user_id in self.collections.owned
+            if ctx.guild.get_member(user_id) is not None
+        ]
+        matches = self.collections.trade_partners(ctx.author.id, candidates)
+        if not matches:
+            return await ctx.reply("No trade partners found in this server right now.")
+
+        def preview(bits: int) -> str:
+            ids = bits_to_ids(bits)
+            names = [self.waifu_data[wid]['name'] for wid in ids[:5] if wid in self.waifu_data]
+            text = ", ".join(names)
+            if len(ids) > 5:
+                text += f" (+{len(ids) - 5})"
+            return text
+
+        embed = discord.Embed(
+            title="Trade Suggestions",
+            color=discord.Colour.dark_grey()
+        )
+        for user_id, they_have, you_have in matches:
+            member = ctx.guild.get_member(user_id)
+            embed.add_field(
+                name=member.display_name,
+                value=(
+                    f"**They have ({they_have.bit_count()}):** {preview(they_have)}\n"
+                    f"**You can offer ({you_have.bit_count()}):** {preview(you_have)}"
+                ),
+                inline=False
+            )
+        await ctx.reply(embed=embed)
+
     @commands.command(name="gift")
     @check_active_command()
     @track_command()
@@ -1637,6 +1846,7 @@ class Waifu(commands.Cog):
             return await ctx.reply("You do not own that card.")
             
         if self.bot.db.update_card_owner(card_code, target.id):
+            self.collections.refresh(ctx.author.id, target.id)
             await ctx.reply(f"Card {card_code} has been gifted to {target.mention}.")
         else:
             await ctx.reply("Failed to gift the card.")
@@ -1,37 +1,17 @@
-from discord.ext import commands
+from discord.ext import commands, tasks
 import discord
+import asyncio
 import os
-import re
 from typing import Dict, List, Optional, Any
 from urllib.parse import urlparse
+from guild_config import DEFAULT_BURST_WINDOW, WelcomerSettings
+from welcome_burst import JoinBursts
+from welcome_template import WelcomeCard, render
+
+BURST_IDLE_TTL = 3600  # seconds before a quiet guild's join history is dropped
 
 def parse_welcomer_content(content: str, member: discord.Member) -> str:
-    if content is None:
-        return ''
-    
-    placeholders = {'{user.mention}': member.mention, '{user.name}': member.name, 
-                   '{user.display_name}': member.display_name, '{user.id}': str(member.id),
-                   '{user.avatar}': str(member.avatar.url if member.avatar else ''),
-                   '{guild.name}': member.guild.name, '{guild.id}': str(member.guild.id),
-                   '{guild.member_count}': str(member.guild.member_count),
-                   '{guild.owner}': str(member.guild.owner),
-                   '{guild.owner.name}': member.guild.owner.name,
-                   '{guild.owner.mention}': member.guild.owner.mention,
-                   '{guild.created_at}': str(member.guild.created_at),
-                   '{user.created_at}': str(member.created_at),
-                   '{user.joined_at}': str(member.joined_at),
-                   '{user.avatar_url}': str(member.avatar.url if member.avatar else ''),
-                   '{guild.icon}': str(member.guild.icon.url if member.guild.icon else ''),
-                   '{guild.banner}': str(member.guild.banner.url if member.guild.banner else ''),
-                   '{guild.description}': (member.guild.description or ''),
-                   '{guild.features}': ', '.join(member.guild.features),
-                   '{guild.premium_tier}': str(member.guild.premium_tier),
-                   '{guild.premium_subscribers}': str(len(member.guild.premium_subscribers)),
-                   '{guild.roles}': ', '.join([r.name for r in member.guild.roles]),
-                   '{user.top_role}': member.top_role.name,
-                   '{user.roles}': ', '.join([r.name for r in member.roles])}
-    return re.sub('|'.join(re.escape(k) for k in placeholders), 
-                 lambda m: placeholders.get(m.group(0), m.group(0)), content)
+    return render(content, member)
 
 class WelcomerSetupSelect(discord.ui.Select):
     def __init__(self, bot: commands.Bot, user_id: int, original_message: discord.Message, welcomer_data: Optional[Dict[str, Any]] = None) -> None:
@@ -348,6 +328,21 @@ class ColorModal(BaseModal):
 class Welcomer(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
+        self.cards: Dict[int, WelcomeCard] = {}
+        self.bursts = JoinBursts()
+        self._summaries: Dict[int, asyncio.Task] = {}
+
+    async def cog_load(self) -> None:
+        self.evict_bursts.start()
+
+    async def cog_unload(self) -> None:
+        self.evict_bursts.cancel()
+        for task in self._summaries.values():
+            task.cancel()
+
+    @tasks.loop(minutes=10)
+    async def evict_bursts(self) -> None:
+        self.bursts.evict_idle(BURST_IDLE_TTL)
  
     @commands.hybrid_group(name="welcomer", description="Manage welcome messages", invoke_without_command=True)
     async def welcomer_group(self, ctx: commands.Context) -> None:
@@ -367,7 +362,7 @@ class Welcomer(commands.Cog):
         """
         if ctx.invoked_subcommand is None:
             await ctx.reply(embed=discord.Embed(title="Welcomer Commands",
-                description="- `?welcomer edit`\n- `?welcomer toggle`\n- `?welcomer test`",
+                description="- `?welcomer edit`\n- `?welcomer toggle`\n- `?welcomer test`\n- `?welcomer burst`\n- `?welcomer stats`",
                 color=discord.Color.dark_grey()))
 
     @welcomer_group.command(name="edit", description="Edit the welcome message")
@@ -443,6 +438,50 @@ class Welcomer(commands.Cog):
         self.bot.db.update_welcomer_settings(ctx.guild.id, welcomer_data)
         await ctx.reply(f"Welcomer turned {state.lower()}")
 
+    @welcomer_group.command(name="burst", description="Set when welcomes are grouped into one summary")
+    @commands.has_permissions(manage_guild=True)
+    async def welcomer_burst(self, ctx: commands.Context, joins: int, seconds: int = 10) -> None:
+        """
+        Past `joins` joins within `seconds`, new members are welcomed with one
+        summary message per window instead of one message each. 0 joins turns this off.
+        """
+        if joins < 0 or not 1 <= seconds <= 300:
+            return await ctx.reply("Joins can't be negative and the window must be 1 to 300 seconds.")
+        if not self.bot.db.get_guild_config(ctx.guild.id).welcomer:
+            return await ctx.reply("Set up the welcomer first with `?welcomer edit`.")
+        self.bot.db.set_welcomer_burst(ctx.guild.id, joins, seconds)
+        if joins:
+            await ctx.reply(f"Above {joins} joins in {seconds}s, welcomes will be grouped into one summary per {seconds}s.")
+        else:
+            await ctx.reply("Every member will be welcomed individually.")
+
+    @welcomer_group.command(name="stats", description="Show join burst and welcome queue metrics")
+    @commands.has_permissions(manage_guild=True)
+    async def welcomer_stats(self, ctx: commands.Context) -> None:
+        """How many joins were welcomed individually or in summaries, and what is queued right now"""
+        welcomer = self.bot.db.get_guild_config(ctx.guild.id).welcomer
+        stats = self.bursts.stats
+        embed = discord.Embed(title="Welcomer Bursts", color=discord.Color.dark_grey())
+        embed.add_field(
+            name="This Server",
+            value=(
+                f"Limit: {welcomer.burst_joins if welcomer else '-'} joins / {welcomer.burst_window if welcomer else '-'}s\n"
+                f"Queued: {self.bursts.guild_depth(ctx.guild.id)}"
+                + (" (bursting)" if ctx.guild.id in self._summaries else "")
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="All Servers",
+            value=(
+                f"Individual: {stats.individual} · Coalesced: {stats.coalesced} · Summaries: {stats.summaries}\n"
+                f"Queue depth: {self.bursts.depth} in {self.bursts.bursting} bursting servers\n"
+                f"Only counted: {stats.unnamed} · Dropped: {stats.dropped} · Failed summaries: {stats.failed}"
+            ),
+            inline=False
+        )
+        await ctx.reply(embed=embed)
+
     @welcomer_group.command(name="test", description="Send a test welcome message")
     @commands.has_permissions(manage_guild=True)
     async def welcomer_test(self, ctx: commands.Context) -> None:
@@ -504,61 +543,79 @@ class Welcomer(commands.Cog):
         except discord.errors.HTTPException as e:
             await ctx.reply(f"An error occurred while sending the test message: {str(e)}")
 
+    def get_card(self, guild_id: int, welcomer: WelcomerSettings) -> WelcomeCard:
+        """The guild's compiled welcome card, rebuilt when its settings snapshot is replaced"""
+        card = self.cards.get(guild_id)
+        if card is None or card.settings is not welcomer:
+            card = self.cards[guild_id] = WelcomeCard(welcomer)
+        return card
+
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member) -> None:
-        welcomer_data = self.bot.db.get_welcomer_settings(member.guild.id)
-        if not welcomer_data or not welcomer_data.get('enabled') or not welcomer_data.get('channel_id'):
+        welcomer = self.bot.db.get_guild_config(member.guild.id).welcomer
+        if not welcomer or not welcomer.enabled or not welcomer.channel_id:
             return
         
-        channel = member.guild.get_channel(welcomer_data['channel_id'])
+        channel = member.guild.get_channel(welcomer.channel_id)
         if not channel: return
 
-        embed = discord.Embed()
-        
-        if welcomer_data.get('title'):
-            embed.title = parse_welcomer_content(welcomer_data['title'], member)
-        
-        if welcomer_data.get('description'):
-            embed.description = parse_welcomer_content(welcomer_data['description'], member)
-        
-        if welcomer_data.get('color'):
-            embed.color = discord.Color.from_str(welcomer_data['color'])
-        
-        if welcomer_data.get('footer'):
-            embed.set_footer(text=parse_welcomer_content(welcomer_data['footer'].get('text', ''), member),
-                             icon_url=welcomer_data['footer'].get('icon_url'))
-        
-        if welcomer_data.get('author'):
-            author_name = parse_welcomer_content(welcomer_data['author'].get('name', ''), member)
-            author_url = welcomer_data['author'].get('url')
-            author_icon_url = parse_welcomer_content(welcomer_data['author'].get('icon_url', ''), member)
-            
-            if author_icon_url and self.is_valid_url(author_icon_url):
-                embed.set_author(name=author_name, url=author_url, icon_url=author_icon_url)
-            else:
-                embed.set_author(name=author_name, url=author_url)
-        
-        if welcomer_data.get('image_url'):
-            image_url = parse_welcomer_content(welcomer_data['image_url'], member)
-            if image_url and self.is_valid_url(image_url):
-                embed.set_image(url=image_url)
-        
-        if welcomer_data.get('thumbnail_url'):
-            thumbnail_url = parse_welcomer_content(welcomer_data['thumbnail_url'], member)
-            if thumbnail_url and self.is_valid_url(thumbnail_url):
-                embed.set_thumbnail(url=thumbnail_url)
+        started = self.bursts.admit(member.guild.id, member.mention, welcomer.burst_joins, welcomer.burst_window)
+        if started is not None:
+            # Part of a join burst; the next summary covers this member
+            if started:
+                self._summaries[member.guild.id] = asyncio.create_task(self._summarize_burst(member.guild))
+            return
 
-        message_content = parse_welcomer_content(welcomer_data.get('message', ''), member)
-        view = discord.ui.View()
-        if 'buttons' in welcomer_data:
-            for button in welcomer_data['buttons']:
-                view.add_item(discord.ui.Button(label=button['label'], url=button['url'], style=discord.ButtonStyle.grey))
+        message_content, embed, view = self.get_card(member.guild.id, welcomer).render(member)
 
         try:
             await channel.send(content=message_content, embed=embed, view=view)
         except discord.errors.HTTPException as e:
             print(f"An error occurred while sending the welcome message: {str(e)}")
 
+    async def _summarize_burst(self, guild: discord.Guild) -> None:
+        """Welcome the members queued during a join burst, one summary per window, until a window passes with no joins"""
+        try:
+            while True:
+                welcomer = self.bot.db.get_guild_config(guild.id).welcomer
+                await asyncio.sleep(welcomer.burst_window if welcomer else DEFAULT_BURST_WINDOW)
+                names, overflow = self.bursts.take(guild.id)
+                if not names:
+                    return
+
+                welcomer = self.bot.db.get_guild_config(guild.id).welcomer
+                channel = None
+                if welcomer and welcomer.enabled and welcomer.channel_id:
+                    channel = guild.get_channel(welcomer.channel_id)
+                if not channel:
+                    self.bursts.discard(names, overflow)
+                    continue
+
+                joined = ", ".join(names) + (f" and {overflow} more" if overflow else "")
+                embed = discord.Embed(
+                    title=f"Welcome to {guild.name}!",
+                    description=f"{joined} just joined.",
+                    color=self.get_card(guild.id, welcomer).color
+                )
+                embed.set_footer(text=f"{len(names) + overflow} new members")
+                try:
+                    await channel.send(embed=embed)
+                    self.bursts.stats.summaries += 1
+                except discord.errors.HTTPException as e:
+                    self.bursts.discard(names, overflow, failed=True)
+                    print(f"An error occurred while sending the welcome summary: {str(e)}")
+        finally:
+            # However the task ended (cancelled, an unexpected error), don't leave the guild
+            # stuck in a burst where every join is queued and no summary is ever scheduled
+            self.bursts.end(guild.id)
+            if self._summaries.get(guild.id) is asyncio.current_task():
+                del self._summaries[guild.id]
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        self.cards.pop(guild.id, None)
+        self.bursts.forget(guild.id)
+
     def is_valid_url(self, url: str) -> bool:
         try:
             result = urlparse(url)
@@ -206,8 +206,28 @@ CREATE TABLE IF NOT EXISTS quiz_category_stats (
     PRIMARY KEY (user_id, category)
 );
 
+CREATE TABLE IF NOT EXISTS quiz_questions (
+    question_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    category TEXT NOT NULL,
+    question_hash TEXT NOT NULL UNIQUE,
+    question TEXT NOT NULL,
+    correct_answer TEXT NOT NULL,
+    incorrect_answers TEXT NOT NULL,
+    difficulty TEXT,
+    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS quiz_seen (
+    user_id INTEGER NOT NULL,
+    question_id INTEGER NOT NULL,
+    seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, question_id),
+    FOREIGN KEY (question_id) REFERENCES quiz_questions(question_id) ON DELETE CASCADE
+);
+
 CREATE INDEX IF NOT EXISTS idx_quiz_stats_user ON quiz_stats(user_id);
 CREATE INDEX IF NOT EXISTS idx_quiz_category_user ON quiz_category_stats(user_id);
+CREATE INDEX IF NOT EXISTS idx_quiz_questions_category ON quiz_questions(category, question_id);
 
 -- Welcomer system tables
 CREATE TABLE IF NOT EXISTS welcomer_settings (
@@ -272,9 +292,7 @@ CREATE TABLE IF NOT EXISTS waifu_cards (
     serial_number TEXT UNIQUE NOT NULL,
     owner_id INTEGER NOT NULL,
     waifu_id TEXT NOT NULL,
-    name TEXT NOT NULL,
     rarity TEXT NOT NULL CHECK(rarity IN ('SS', 'S', 'A', 'B', 'C', 'D')),
-    rank INTEGER,
     level INTEGER DEFAULT 1,
     locked BOOLEAN DEFAULT FALSE,
     obtained_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -301,11 +319,38 @@ CREATE TABLE IF NOT EXISTS waifu_trades (
     FOREIGN KEY (offeree_card) REFERENCES waifu_cards(serial_number)
 );
 
+CREATE TABLE IF NOT EXISTS waifu_catalog (
+    waifu_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    jp_name TEXT,
+    series TEXT,
+    image_link TEXT,
+    popularity_rank INTEGER,
+    total_likes INTEGER,
+    rarity_score TEXT,
+    rarity_tier TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS catalog_versions (
+    name TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    imported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS waifu_collections (
+    user_id INTEGER PRIMARY KEY,
+    owned BLOB NOT NULL,
+    duplicates BLOB NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Waifu System Indexes
 CREATE INDEX IF NOT EXISTS idx_waifu_cards_owner ON waifu_cards(owner_id);
 CREATE INDEX IF NOT EXISTS idx_waifu_cards_serial ON waifu_cards(serial_number);
 CREATE INDEX IF NOT EXISTS idx_waifu_cards_rarity ON waifu_cards(rarity);
-CREATE INDEX IF NOT EXISTS idx_waifu_cards_rank ON waifu_cards(rank);
+CREATE INDEX IF NOT EXISTS idx_waifu_cards_waifu ON waifu_cards(waifu_id);
+CREATE INDEX IF NOT EXISTS idx_waifu_catalog_tier ON waifu_catalog(rarity_tier);
+CREATE INDEX IF NOT EXISTS idx_waifu_catalog_rank ON waifu_catalog(popularity_rank);
 CREATE INDEX IF NOT EXISTS idx_waifu_trades_users ON waifu_trades(offerer_id, offeree_id);
 CREATE INDEX IF NOT EXISTS idx_waifu_trades_status ON waifu_trades(status);
 CREATE INDEX IF NOT EXISTS idx_waifu_trades_guild ON waifu_trades(guild_id);
@@ -430,6 +475,97 @@ BEGIN
     WHERE tag_id = NEW.tag_id;
 END;
 
+-- HTTP Response Cache
+CREATE TABLE IF NOT EXISTS http_cache (
+    cache_key TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    body TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    stale_until REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_http_cache_stale ON http_cache(stale_until);
+
+-- Interaction GIF Pools
+CREATE TABLE IF NOT EXISTS interaction_gifs (
+    action TEXT NOT NULL,
+    url TEXT NOT NULL,
+    anime_name TEXT,
+    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (action, url)
+);
+
+-- News Subscriptions
+CREATE TABLE IF NOT EXISTS news_subscriptions (
+    guild_id INTEGER NOT NULL,
+    channel_id INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (channel_id, category)
+);
+
+CREATE INDEX IF NOT EXISTS idx_news_subscriptions_guild ON news_subscriptions(guild_id);
+
+-- Tag Search
+CREATE VIRTUAL TABLE IF NOT EXISTS tags_fts USING fts5(
+    name,
+    aliases,
+    content,
+    guild,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS tags_fts_insert
+AFTER INSERT ON tags
+BEGIN
+    INSERT INTO tags_fts (rowid, name, aliases, content, guild)
+    VALUES (NEW.tag_id, NEW.name, '', NEW.content, 'g' || NEW.guild_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS tags_fts_update
+AFTER UPDATE OF name, content ON tags
+BEGIN
+    UPDATE tags_fts SET name = NEW.name, content = NEW.content WHERE rowid = NEW.tag_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS tags_fts_delete
+AFTER DELETE ON tags
+BEGIN
+    DELETE FROM tags_fts WHERE rowid = OLD.tag_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS tags_fts_alias_insert
+AFTER INSERT ON tag_aliases
+BEGIN
+    UPDATE tags_fts SET aliases = (
+        SELECT group_concat(alias_name, ' ') FROM tag_aliases
+        WHERE guild_id = NEW.guild_id AND original_tag_name = NEW.original_tag_name
+    )
+    WHERE rowid = (SELECT tag_id FROM tags WHERE guild_id = NEW.guild_id AND name = NEW.original_tag_name);
+END;
 
+CREATE TRIGGER IF NOT EXISTS tags_fts_alias_delete
+AFTER DELETE ON tag_aliases
+BEGIN
+    UPDATE tags_fts SET aliases = COALESCE((
+        SELECT group_concat(alias_name, ' ') FROM tag_aliases
+        WHERE guild_id = OLD.guild_id AND original_tag_name = OLD.original_tag_name
+    ), '')
+    WHERE rowid = (SELECT tag_id FROM tags WHERE guild_id = OLD.guild_id AND name = OLD.original_tag_name);
+END;
 
+-- Welcomer Burst
+CREATE TABLE IF NOT EXISTS welcomer_burst (
+    guild_id INTEGER PRIMARY KEY,
+    max_joins INTEGER NOT NULL DEFAULT 5,
+    window_seconds INTEGER NOT NULL DEFAULT 10
+);
 
+-- Temp Channel Panels
+CREATE TABLE IF NOT EXISTS temp_channel_panels (
+    channel_id INTEGER PRIMARY KEY,
+    panel_version INTEGER NOT NULL DEFAULT 0,
+    claim_message_id INTEGER DEFAULT NULL,
+    FOREIGN KEY (channel_id) REFERENCES temp_channels(channel_id) ON DELETE CASCADE
+);
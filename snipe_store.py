@@ -0,0 +1,219 @@
+"""
+Compact in-memory storage for sniped (deleted and edited) messages.
+
+Only what the snipe embeds show is kept: a few ids, a timestamp, the first
+1024 characters of content (zlib-compressed when that pays off) and attachment
+names and URLs. Each guild keeps its latest records in one bounded deque, with
+per-channel and per-user deques over the same records, so every query reads
+straight from a deque instead of scanning. Memory is accounted globally and,
+past the budget, the guilds that have gone longest without a deletion or edit
+are dropped first.
+"""
+import time
+import zlib
+from collections import OrderedDict, deque
+from itertools import islice
+from typing import Deque, Dict, List, Optional, Tuple, Union
+
+CONTENT_LIMIT = 1024  # the embeds never show more than this
+COMPRESS_THRESHOLD = 256
+GUILD_RECORDS = 64  # per guild and kind; the channel and user views are subsets of these
+VIEW_RECORDS = 8
+MEMORY_BUDGET = 32 * 1024 * 1024
+RECORD_OVERHEAD = 200  # slotted object, deque cells and ints, roughly
+
+Content = Union[str, bytes]
+
+
+def pack(text: Optional[str]) -> Content:
+    text = (text or "")[:CONTENT_LIMIT]
+    if len(text) >= COMPRESS_THRESHOLD:
+        raw = text.encode()
+        packed = zlib.compress(raw)
+        if len(packed) < len(raw):
+            return packed
+    return text
+
+
+def unpack(content: Content) -> str:
+    return zlib.decompress(content).decode() if isinstance(content, bytes) else content
+
+
+class SnipeRecord:
+    __slots__ = (
+        "message_id", "author_id", "channel_id", "timestamp",
+        "_content", "_after", "attachments", "reference_id", "size",
+    )
+
+    def __init__(
+        self,
+        message_id: int,
+        author_id: int,
+        channel_id: int,
+        timestamp: float,
+        content: Optional[str],
+        attachments: Tuple[Tuple[str, str], ...] = (),
+        reference_id: Optional[int] = None,
+        after: Optional[str] = None,
+    ) -> None:
+        self.message_id = message_id
+        self.author_id = author_id
+        self.channel_id = channel_id
+        self.timestamp = timestamp
+        self._content = pack(content)
+        self._after = None if after is None else pack(after)
+        self.attachments = attachments
+        self.reference_id = reference_id
+        self.size = (
+            RECORD_OVERHEAD + len(self._content) + len(self._after or "")
+            + sum(len(filename) + len(url) for filename, url in attachments)
+        )
+
+    @classmethod
+    def from_message(cls, message, timestamp: float, after: Optional[str] = None) -> "SnipeRecord":
+        """Copy what the embeds need out of a discord.Message; `after` is the edited content"""
+        return cls(
+            message.id,
+            message.author.id,
+            message.channel.id,
+            timestamp,
+            message.content,
+            tuple((attachment.filename, attachment.url) for attachment in message.attachments),
+            message.reference.message_id if message.reference else None,
+            after,
+        )
+
+    @property
+    def content(self) -> str:
+        return unpack(self._content)
+
+    @property
+    def after(self) -> Optional[str]:
+        return None if self._after is None else unpack(self._after)
+
+
+class SnipeLog:
+    """One guild's records of one kind, newest last, with channel and user views"""
+
+    __slots__ = ("records", "channels", "users", "size")
+
+    def __init__(self) -> None:
+        self.records: Deque[SnipeRecord] = deque()
+        self.channels: Dict[int, Deque[SnipeRecord]] = {}
+        self.users: Dict[int, Deque[SnipeRecord]] = {}
+        self.size = 0
+
+    def add(self, record: SnipeRecord) -> int:
+        """Store a record, dropping the oldest past the limit; returns the change in bytes"""
+        self.records.append(record)
+        self._view(self.channels, record.channel_id).append(record)
+        self._view(self.users, record.author_id).append(record)
+        delta = record.size
+        while len(self.records) > GUILD_RECORDS:
+            oldest = self.records.popleft()
+            # The guild's oldest record can only be the oldest of its channel and user views
+            self._unlink(self.channels, oldest.channel_id, oldest)
+            self._unlink(self.users, oldest.author_id, oldest)
+            delta -= oldest.size
+        self.size += delta
+        return delta
+
+    @staticmethod
+    def _view(views: Dict[int, Deque[SnipeRecord]], key: int) -> Deque[SnipeRecord]:
+        view = views.get(key)
+        if view is None:
+            view = views[key] = deque(maxlen=VIEW_RECORDS)
+        return view
+
+    @staticmethod
+    def _unlink(views: Dict[int, Deque[SnipeRecord]], key: int, record: SnipeRecord) -> None:
+        view = views.get(key)
+        if view is None:
+            return
+        if view and view[0] is record:
+            view.popleft()
+        if not view:
+            del views[key]
+
+    def latest(self, count: int, channel_id: Optional[int] = None, user_id: Optional[int] = None) -> List[SnipeRecord]:
+        """Up to `count` records, newest first"""
+        if channel_id is not None:
+            records = self.channels.get(channel_id, ())
+        elif user_id is not None:
+            records = self.users.get(user_id, ())
+        else:
+            records = self.records
+        return list(islice(reversed(records), max(count, 0)))
+
+
+class GuildSnipes:
+    __slots__ = ("deleted", "edited", "last_active")
+
+    def __init__(self) -> None:
+        self.deleted = SnipeLog()
+        self.edited = SnipeLog()
+        self.last_active = time.monotonic()
+
+    @property
+    def size(self) -> int:
+        return self.deleted.size + self.edited.size
+
+
+class SnipeStore:
+    """Deleted and edited message records for every guild, within a global memory budget"""
+
+    def __init__(self, budget: int = MEMORY_BUDGET) -> None:
+        self.budget = budget
+        self.guilds: "OrderedDict[int, GuildSnipes]" = OrderedDict()  # least recently active first
+        self.size = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self.guilds)
+
+    def add(self, guild_id: int, kind: str, record: SnipeRecord) -> None:
+        """Record a deleted or edited (`kind`) message"""
+        guild = self.guilds.get(guild_id)
+        if guild is None:
+            guild = self.guilds[guild_id] = GuildSnipes()
+        else:
+            self.guilds.move_to_end(guild_id)
+        guild.last_active = time.monotonic()
+        self.size += getattr(guild, kind).add(record)
+        while self.size > self.budget and len(self.guilds) > 1:
+            self._evict(next(iter(self.guilds)))
+
+    def latest(
+        self,
+        guild_id: int,
+        kind: str,
+        count: int,
+        *,
+        channel_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+    ) -> List[SnipeRecord]:
+        guild = self.guilds.get(guild_id)
+        if guild is None:
+            return []
+        return getattr(guild, kind).latest(count, channel_id, user_id)
+
+    def remove_guild(self, guild_id: int) -> None:
+        guild = self.guilds.pop(guild_id, None)
+        if guild is not None:
+            self.size -= guild.size
+
+    def evict_idle(self, max_idle: float) -> int:
+        """Drop guilds with no deletions or edits for `max_idle` seconds; returns how many"""
+        cutoff = time.monotonic() - max_idle
+        dropped = 0
+        while self.guilds:
+            guild_id, guild = next(iter(self.guilds.items()))
+            if guild.last_active > cutoff:
+                break
+            self._evict(guild_id)
+            dropped += 1
+        return dropped
+
+    def _evict(self, guild_id: int) -> None:
+        self.remove_guild(guild_id)
+        self.evicted += 1
@@ -2,7 +2,7 @@ import discord
 import typing 
 from discord import app_commands
 import re
-from difflib import SequenceMatcher
+from name_index import resolver
 
 def format_seconds(
     total_seconds: int
@@ -16,15 +16,16 @@ def format_seconds(
     return f"{days}d {hours % 24}h" if hours % 24 else f"{days}d"
 
 class PaginationView(discord.ui.View):
-    def __init__(self, embeds: list[discord.Embed], author: discord.Member, timeout: int = 300) -> None:
+    def __init__(self, embeds: typing.Sequence[discord.Embed], author: discord.Member, timeout: int = 300) -> None:
         super().__init__(timeout=timeout)
-        self.embeds: list[discord.Embed] = embeds
+        # Any sequence works, so pages can be built lazily on first view
+        self.embeds: typing.Sequence[discord.Embed] = embeds
         self.index: int = 0
         self.message: typing.Optional[discord.Message] = None
         self.author: discord.Member = author
 
-        for i, embed in enumerate(self.embeds):
-            embed.set_footer(text=f"Viewing page {i+1}/{len(embeds)}")
+        if embeds:
+            self.page(0)  # callers send embeds[0] themselves
 
         # Disable buttons if only one page
         if len(embeds) == 1:
@@ -32,6 +33,11 @@ class PaginationView(discord.ui.View):
             self.goto_button.disabled = True
             self.next_button.disabled = True
 
+    def page(self, index: int) -> discord.Embed:
+        embed = self.embeds[index]
+        embed.set_footer(text=f"Viewing page {index+1}/{len(self.embeds)}")
+        return embed
+
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         if interaction.user != self.author:
             await interaction.response.send_message("You cannot control this pagination!", ephemeral=True)
@@ -41,7 +47,7 @@ class PaginationView(discord.ui.View):
     @discord.ui.button(label="<", style=discord.ButtonStyle.secondary)
     async def prev_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         self.index = (self.index - 1) % len(self.embeds)
-        await interaction.response.edit_message(embed=self.embeds[self.index], view=self)
+        await interaction.response.edit_message(embed=self.page(self.index), view=self)
 
     class PageSelectModal(discord.ui.Modal, title="Go to Page"):
         page = discord.ui.TextInput(label="Page Number", placeholder="Enter page number...")
@@ -59,7 +65,7 @@ class PaginationView(discord.ui.View):
                 page = int(modal.page.value)
                 if 1 <= page <= len(self.embeds):
                     self.index = page - 1
-                    await interaction.response.edit_message(embed=self.embeds[self.index], view=self)
+                    await interaction.response.edit_message(embed=self.page(self.index), view=self)
                 else:
                     await interaction.response.send_message(
                         f"Please enter a number between 1 and {len(self.embeds)}",
@@ -74,7 +80,7 @@ class PaginationView(discord.ui.View):
     @discord.ui.button(label=">", style=discord.ButtonStyle.secondary)
     async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         self.index = (self.index + 1) % len(self.embeds)
-        await interaction.response.edit_message(embed=self.embeds[self.index], view=self)
+        await interaction.response.edit_message(embed=self.page(self.index), view=self)
 
     async def on_timeout(self) -> None:
         for child in self.children: child.disabled = True
@@ -179,47 +185,14 @@ async def find_member(
     guild: discord.Guild,
     query: str
 ) -> typing.Optional[discord.Member]:
-
-    best_match: typing.Optional[discord.Member] = None
-    best_score: float = 0
-    count: int = 0
-
-    for member in guild.members:
-        if query.isdigit() and str(member.id).startswith(query):
-            return member
-
-        username_score = SequenceMatcher(None, query.lower(), member.name.lower()).ratio()
-        if username_score > best_score:
-            best_match = member
-            best_score = username_score
-
-        if member.display_name != member.name:
-            display_name_score = SequenceMatcher(None, query.lower(), member.display_name.lower()).ratio()
-            if display_name_score > best_score:
-                best_match = member
-                best_score = display_name_score
-        count += 1
-        print(f"{count} {best_score} {best_match.name}")
-    return best_match
+    """Best member for an ID, mention or (possibly misspelt) name, via the guild's name index"""
+    members = await resolver.rank_members(guild, query, limit=1)
+    return members[0] if members else None
 
 async def find_role(
     guild: discord.Guild, 
     query: str
 ) -> typing.Optional[discord.Role]:
-
-    def calculate_similarity(a: str, b: str) -> float:
-        return SequenceMatcher(None, a.lower(), b.lower()).ratio()
-
-    best_match: typing.Optional[discord.Role] = None
-    best_score: float = 0
-
-    for role in guild.roles:
-        if query in str(role.id):
-            return role
-
-        role_name_score = calculate_similarity(query, role.name)
-        if role_name_score > best_score:
-            best_match = role
-            best_score = role_name_score
-
-    return best_match
+    """Best role for an ID, mention or (possibly misspelt) name, via the guild's name index"""
+    roles = await resolver.rank_roles(guild, query, limit=1)
+    return roles[0] if roles else None
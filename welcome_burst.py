@@ -0,0 +1,141 @@
+"""
+Per-guild join queues that coalesce welcomes during join bursts.
+
+While a guild's join rate stays at or below its limit (`burst_joins` joins
+within `burst_window` seconds), every join is welcomed on its own. Past it the
+guild enters a burst: joins are queued, and once per window the Welcomer cog
+takes the queue and posts one summary message for it. The burst ends after a
+window in which nobody joined. A summary names at most SUMMARY_NAMES members
+and only counts the rest.
+"""
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+
+SUMMARY_NAMES = 50  # members named in one summary; keeps it well under the embed limit
+
+
+@dataclass
+class BurstStats:
+    individual: int = 0  # joins welcomed on their own
+    coalesced: int = 0  # joins queued for a summary
+    summaries: int = 0
+    unnamed: int = 0  # joins only counted in their summary, past SUMMARY_NAMES
+    dropped: int = 0  # queued joins whose summary was never sent
+    failed: int = 0  # summaries that couldn't be sent
+
+
+class GuildBurst:
+    __slots__ = ("joins", "pending", "overflow", "active")
+
+    def __init__(self) -> None:
+        self.joins: Deque[float] = deque()  # join times within the current window
+        self.pending: List[str] = []  # names for the next summary
+        self.overflow = 0  # joins past SUMMARY_NAMES in the next summary
+        self.active = False  # a summary is scheduled
+
+
+class JoinBursts:
+    """Join rates and queued welcomes for every guild"""
+
+    def __init__(self) -> None:
+        self.guilds: Dict[int, GuildBurst] = {}
+        self.stats = BurstStats()
+
+    @property
+    def depth(self) -> int:
+        """Joins queued for a summary, across all guilds"""
+        return sum(len(guild.pending) + guild.overflow for guild in self.guilds.values())
+
+    @property
+    def bursting(self) -> int:
+        return sum(1 for guild in self.guilds.values() if guild.active)
+
+    def guild_depth(self, guild_id: int) -> int:
+        guild = self.guilds.get(guild_id)
+        return len(guild.pending) + guild.overflow if guild else 0
+
+    def admit(
+        self,
+        guild_id: int,
+        name: str,
+        max_joins: int,
+        window: float,
+        now: Optional[float] = None,
+    ) -> Optional[bool]:
+        """
+        Record a join. None means welcome it on its own; otherwise it was queued,
+        and True means it started a burst, so the caller should schedule the summary.
+        """
+        now = time.monotonic() if now is None else now
+        guild = self.guilds.get(guild_id)
+        if guild is None:
+            guild = self.guilds[guild_id] = GuildBurst()
+
+        joins = guild.joins
+        joins.append(now)
+        while joins and joins[0] <= now - window:
+            joins.popleft()
+
+        if not guild.active and (max_joins <= 0 or len(joins) <= max_joins):
+            self.stats.individual += 1
+            return None
+
+        self.stats.coalesced += 1
+        if len(guild.pending) < SUMMARY_NAMES:
+            guild.pending.append(name)
+        else:
+            guild.overflow += 1
+        started = not guild.active
+        guild.active = True
+        return started
+
+    def take(self, guild_id: int) -> Tuple[List[str], int]:
+        """
+        The names and overflow count for the summary that is due, clearing them.
+        An empty result means the window was quiet and the burst is over.
+        """
+        guild = self.guilds.get(guild_id)
+        if guild is None:
+            return [], 0
+        names, overflow = guild.pending, guild.overflow
+        guild.pending, guild.overflow = [], 0
+        if not names:
+            guild.active = False
+        self.stats.unnamed += overflow
+        return names, overflow
+
+    def discard(self, names: List[str], overflow: int, failed: bool = False) -> None:
+        """Count a summary that was taken but couldn't be sent"""
+        self.stats.dropped += len(names) + overflow
+        if failed:
+            self.stats.failed += 1
+
+    def end(self, guild_id: int) -> None:
+        """
+        End the guild's burst whether or not its summaries went out, counting
+        anything still queued as dropped, so the next join starts afresh.
+        """
+        guild = self.guilds.get(guild_id)
+        if guild is None:
+            return
+        self.stats.dropped += len(guild.pending) + guild.overflow
+        guild.pending, guild.overflow = [], 0
+        guild.active = False
+
+    def forget(self, guild_id: int) -> None:
+        guild = self.guilds.pop(guild_id, None)
+        if guild is not None:
+            self.stats.dropped += len(guild.pending) + guild.overflow
+
+    def evict_idle(self, max_idle: float, now: Optional[float] = None) -> int:
+        """Drop quiet guilds' join history; returns how many were dropped"""
+        now = time.monotonic() if now is None else now
+        idle = [
+            guild_id for guild_id, guild in self.guilds.items()
+            if not guild.active and (not guild.joins or guild.joins[-1] <= now - max_idle)
+        ]
+        for guild_id in idle:
+            del self.guilds[guild_id]
+        return len(idle)
@@ -0,0 +1,164 @@
+"""
+Welcome message templates compiled once instead of parsed on every join.
+
+A template is split into literal text and placeholder getters, so rendering
+it for a member only evaluates the placeholders it uses (a welcome message
+with `{user.mention}` never joins every role name in the guild). A
+`WelcomeCard` compiles all of a guild's welcomer fields plus the parts of the
+embed that don't depend on the member; the Welcomer cog keeps one per guild
+and rebuilds it when the guild's `WelcomerSettings` snapshot is replaced.
+"""
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import discord
+
+from guild_config import WelcomerSettings
+
+Getter = Callable[[discord.Member], str]
+
+
+def _asset_url(asset: Optional[discord.Asset]) -> str:
+    return str(asset.url if asset else '')
+
+
+PLACEHOLDERS: Dict[str, Getter] = {
+    '{user.mention}': lambda member: member.mention,
+    '{user.name}': lambda member: member.name,
+    '{user.display_name}': lambda member: member.display_name,
+    '{user.id}': lambda member: str(member.id),
+    '{user.avatar}': lambda member: _asset_url(member.avatar),
+    '{guild.name}': lambda member: member.guild.name,
+    '{guild.id}': lambda member: str(member.guild.id),
+    '{guild.member_count}': lambda member: str(member.guild.member_count),
+    '{guild.owner}': lambda member: str(member.guild.owner),
+    '{guild.owner.name}': lambda member: member.guild.owner.name if member.guild.owner else '',
+    '{guild.owner.mention}': lambda member: member.guild.owner.mention if member.guild.owner else '',
+    '{guild.created_at}': lambda member: str(member.guild.created_at),
+    '{user.created_at}': lambda member: str(member.created_at),
+    '{user.joined_at}': lambda member: str(member.joined_at),
+    '{user.avatar_url}': lambda member: _asset_url(member.avatar),
+    '{guild.icon}': lambda member: _asset_url(member.guild.icon),
+    '{guild.banner}': lambda member: _asset_url(member.guild.banner),
+    '{guild.description}': lambda member: member.guild.description or '',
+    '{guild.features}': lambda member: ', '.join(member.guild.features),
+    '{guild.premium_tier}': lambda member: str(member.guild.premium_tier),
+    '{guild.premium_subscribers}': lambda member: str(len(member.guild.premium_subscribers)),
+    '{guild.roles}': lambda member: ', '.join([r.name for r in member.guild.roles]),
+    '{user.top_role}': lambda member: member.top_role.name,
+    '{user.roles}': lambda member: ', '.join([r.name for r in member.roles]),
+}
+
+PLACEHOLDER_RE = re.compile('|'.join(re.escape(key) for key in PLACEHOLDERS))
+
+
+def is_valid_url(url: str) -> bool:
+    try:
+        result = urlparse(url)
+        return all([result.scheme, result.netloc])
+    except ValueError:
+        return False
+
+
+class Template:
+    """A template as a tuple of literal strings and placeholder getters"""
+
+    __slots__ = ("source", "tokens")
+
+    def __init__(self, source: Optional[str]) -> None:
+        self.source = source or ''
+        tokens = []
+        position = 0
+        for match in PLACEHOLDER_RE.finditer(self.source):
+            if match.start() > position:
+                tokens.append(self.source[position:match.start()])
+            tokens.append(PLACEHOLDERS[match.group(0)])
+            position = match.end()
+        if position < len(self.source):
+            tokens.append(self.source[position:])
+        self.tokens: Tuple[Union[str, Getter], ...] = tuple(tokens)
+
+    def __bool__(self) -> bool:
+        return bool(self.source)
+
+    def render(self, member: discord.Member) -> str:
+        if len(self.tokens) == 1 and isinstance(self.tokens[0], str):
+            return self.tokens[0]
+        return ''.join(token if isinstance(token, str) else token(member) for token in self.tokens)
+
+
+@lru_cache(maxsize=512)
+def compile_template(content: Optional[str]) -> Template:
+    return Template(content)
+
+
+def render(content: Optional[str], member: discord.Member) -> str:
+    """Fill in `content`'s placeholders for `member`, compiling it on first use"""
+    if content is None:
+        return ''
+    return compile_template(content).render(member)
+
+
+class WelcomeCard:
+    """A guild's welcome message with its templates compiled and static embed parts resolved"""
+
+    def __init__(self, settings: WelcomerSettings) -> None:
+        self.settings = settings
+        self.message = Template(settings.message)
+        self.title = Template(settings.title)
+        self.description = Template(settings.description)
+        self.footer_text = Template(settings.footer_text)
+        self.author_name = Template(settings.author_name)
+        self.author_icon_url = Template(settings.author_icon_url)
+        self.thumbnail_url = Template(settings.thumbnail_url)
+        self.image_url = Template(settings.image_url)
+        self.color: Optional[discord.Color] = None
+        if settings.color:
+            try:
+                self.color = discord.Color.from_str(settings.color)
+            except ValueError:
+                pass
+
+    def render(self, member: discord.Member) -> Tuple[str, discord.Embed, discord.ui.View]:
+        """The message content, embed and button view to greet `member` with"""
+        settings = self.settings
+        embed = discord.Embed()
+
+        if self.title:
+            embed.title = self.title.render(member)
+
+        if self.description:
+            embed.description = self.description.render(member)
+
+        if self.color is not None:
+            embed.color = self.color
+
+        if settings.footer_text or settings.footer_icon_url:
+            embed.set_footer(text=self.footer_text.render(member), icon_url=settings.footer_icon_url)
+
+        if self.author_name:
+            author_name = self.author_name.render(member)
+            author_icon_url = self.author_icon_url.render(member)
+
+            if author_icon_url and is_valid_url(author_icon_url):
+                embed.set_author(name=author_name, url=settings.author_url, icon_url=author_icon_url)
+            else:
+                embed.set_author(name=author_name, url=settings.author_url)
+
+        if self.image_url:
+            image_url = self.image_url.render(member)
+            if image_url and is_valid_url(image_url):
+                embed.set_image(url=image_url)
+
+        if self.thumbnail_url:
+            thumbnail_url = self.thumbnail_url.render(member)
+            if thumbnail_url and is_valid_url(thumbnail_url):
+                embed.set_thumbnail(url=thumbnail_url)
+
+        view = discord.ui.View()
+        for label, url in settings.buttons:
+            view.add_item(discord.ui.Button(label=label, url=url, style=discord.ButtonStyle.grey))
+
+        return self.message.render(member), embed, view